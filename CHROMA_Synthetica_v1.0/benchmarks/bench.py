@@ -0,0 +1,293 @@
+"""
+Benchmark runner and regression gate for the Synthetica pipeline.
+
+    python benchmarks/bench.py run --scales 1 10 100 --output baseline.json
+    python benchmarks/bench.py compare baseline.json current.json --threshold 0.2
+
+``run`` measures broker lookups, flattening, fuzzy matching, full
+``run_workflow`` passes and the playground ``/generate`` path (stub LLM)
+against synthetic KBs of the requested scales and writes a JSON report.
+``compare`` exits with status 1 when any metric shared by both reports got
+slower than the baseline by more than ``threshold`` (0.2 = 20%).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+if str(ROOT_DIR) not in sys.path:
+    sys.path.insert(0, str(ROOT_DIR))
+
+from benchmarks.synthetic import (  # noqa: E402
+    SYNTHETIC_TERMS_PATH,
+    misspell,
+    synthetic_acos,
+    synthetic_kb,
+)
+from synthetica.core.compiled_kb import compile_kb, open_compiled_kb  # noqa: E402
+from synthetica.core.knowledge_broker import KnowledgeBroker  # noqa: E402
+from synthetica.core.registry import KBRegistry  # noqa: E402
+from synthetica.core.snapshot import KBSnapshot  # noqa: E402
+from synthetica.orchestrator import ChromaSyntheticaOrchestrator  # noqa: E402
+
+DEFAULT_SCALES = (1, 10, 100)
+DEFAULT_THRESHOLD = 0.2
+TARGET_MODELS = [
+    "DALL-E_3",
+    "Midjourney_V6",
+    "Stable_Diffusion_3",
+    "Seedream_4_0",
+    "Nano_Banana",
+    "Flux_1",
+]
+
+Metric = Dict[str, Any]
+
+
+# ---------------------------------------------------------------------------
+# Measurement helpers
+# ---------------------------------------------------------------------------
+
+
+def _per_op_us(operation: Callable[[Any], Any], items: Sequence[Any], repeat: int) -> float:
+    """Median over ``repeat`` rounds of the mean microseconds per item."""
+    rounds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for item in items:
+            operation(item)
+        rounds.append((time.perf_counter() - started) * 1e6 / len(items))
+    return statistics.median(rounds)
+
+
+def _once_ms(operation: Callable[[], Any], repeat: int) -> float:
+    rounds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        operation()
+        rounds.append((time.perf_counter() - started) * 1e3)
+    return statistics.median(rounds)
+
+
+def _metric(value: float, unit: str) -> Metric:
+    return {"value": round(value, 4), "unit": unit}
+
+
+# ---------------------------------------------------------------------------
+# Benchmarks
+# ---------------------------------------------------------------------------
+
+
+def bench_scale(scale: int, depth: int, repeat: int, workdir: Path) -> Dict[str, Metric]:
+    rng = random.Random(scale)
+    kb = synthetic_kb(scale, depth=depth)
+    kb_file = workdir / f"synthetic_x{scale}.json"
+    kb_file.write_text(json.dumps(kb), encoding="utf-8")
+    results: Dict[str, Metric] = {}
+
+    snapshot = KBSnapshot.build(kb)
+    results["kb_build"] = _metric(_once_ms(lambda: KBSnapshot.build(kb), min(repeat, 3)), "ms")
+
+    artifact = workdir / f"synthetic_x{scale}.skb"
+    compile_kb(kb_file, artifact)
+    results["compiled_open"] = _metric(
+        _once_ms(lambda: open_compiled_kb(kb_file, artifact).snapshot(), repeat), "ms"
+    )
+
+    known = list(snapshot.index)
+    paths = rng.sample(known, min(2000, len(known)))
+    paths += [f"{path}.Missing_Leaf" for path in paths[:200]]
+    broker = KnowledgeBroker(snapshot)
+    results["get_entry"] = _metric(_per_op_us(broker.get_entry, paths, repeat), "us/op")
+
+    def flatten_cold(path: str) -> Any:
+        return fresh.get_flat_list(path)
+
+    cold_rounds = []
+    for _ in range(repeat):
+        fresh = KnowledgeBroker(snapshot)
+        cold_rounds.append(_per_op_us(flatten_cold, paths, 1))
+    results["get_flat_list_cold"] = _metric(statistics.median(cold_rounds), "us/op")
+    for path in paths:  # warm the memo layer so the timed rounds measure hits
+        broker.get_flat_list(path)
+    results["get_flat_list_warm"] = _metric(
+        _per_op_us(broker.get_flat_list, paths, repeat), "us/op"
+    )
+
+    terms = broker.get_flat_list(SYNTHETIC_TERMS_PATH)
+    queries = [misspell(term, rng) for term in rng.sample(terms, 100)]
+    broker.find_closest_match(SYNTHETIC_TERMS_PATH, queries[0])
+    results["find_closest_match"] = _metric(
+        _per_op_us(
+            lambda query: broker.find_closest_match(SYNTHETIC_TERMS_PATH, query),
+            queries,
+            repeat,
+        ),
+        "us/op",
+    )
+
+    orchestrator = ChromaSyntheticaOrchestrator(kb_path=str(kb_file), registry=KBRegistry())
+    workload = synthetic_acos(100, seed=scale)
+    results["run_workflow"] = _metric(
+        _per_op_us(
+            lambda item: orchestrator.run_workflow(item[0], TARGET_MODELS, item[1]),
+            workload,
+            repeat,
+        ),
+        "us/op",
+    )
+    return results
+
+
+def bench_playground(repeat: int) -> Dict[str, Metric]:
+    """``generate_prompt_session`` (the /generate handler body) with the stub LLM."""
+    os.environ["SYNTHETICA_LLM_PROVIDER"] = "stub"
+    previous_cwd = Path.cwd()
+    os.chdir(ROOT_DIR)  # the playbook path is relative to the project root
+    try:
+        from playground_backend.generator import generate_prompt_session
+
+        briefs = [f"Brief {index}: a lighthouse keeper facing a storm." for index in range(50)]
+        generate_prompt_session(briefs[0], "stub", "cinematografico")
+        value = _per_op_us(
+            lambda brief: generate_prompt_session(brief, "stub", "cinematografico"),
+            briefs,
+            repeat,
+        )
+    finally:
+        os.chdir(previous_cwd)
+    return {"playground_generate": _metric(value, "us/op")}
+
+
+def run_suite(
+    scales: Iterable[int] = DEFAULT_SCALES,
+    depth: int = 0,
+    repeat: int = 5,
+    playground: bool = True,
+) -> Dict[str, Any]:
+    scales = list(scales)
+    metrics: Dict[str, Metric] = {}
+    with tempfile.TemporaryDirectory(prefix="synthetica-bench-") as tmp:
+        for scale in scales:
+            print(f"[bench] scale x{scale} (depth {depth})...", flush=True)
+            for name, metric in bench_scale(scale, depth, repeat, Path(tmp)).items():
+                metrics[f"{name}@x{scale}"] = metric
+    if playground:
+        print("[bench] playground /generate (stub LLM)...", flush=True)
+        metrics.update(bench_playground(repeat))
+    return {
+        "meta": {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "scales": scales,
+            "depth": depth,
+            "repeat": repeat,
+        },
+        "metrics": metrics,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Regression gate
+# ---------------------------------------------------------------------------
+
+
+def compare_reports(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Compare shared metrics (all are lower-is-better timings).
+    Returns one row per metric and the names that regressed past ``threshold``.
+    """
+    rows: List[Dict[str, Any]] = []
+    regressions: List[str] = []
+    for name, base_metric in sorted(baseline["metrics"].items()):
+        current_metric = current["metrics"].get(name)
+        if current_metric is None:
+            continue
+        base_value = base_metric["value"]
+        value = current_metric["value"]
+        change = (value - base_value) / base_value if base_value else 0.0
+        regressed = change > threshold
+        rows.append(
+            {
+                "metric": name,
+                "unit": current_metric["unit"],
+                "baseline": base_value,
+                "current": value,
+                "change": change,
+                "regressed": regressed,
+            }
+        )
+        if regressed:
+            regressions.append(name)
+    return rows, regressions
+
+
+def _print_rows(rows: List[Dict[str, Any]], threshold: float) -> None:
+    print(f"{'metric':34} {'baseline':>12} {'current':>12} {'change':>9}")
+    for row in rows:
+        flag = "  REGRESSION" if row["regressed"] else ""
+        print(
+            f"{row['metric']:34} {row['baseline']:>12.3f} {row['current']:>12.3f} "
+            f"{row['change']:>+8.1%}{flag}"
+        )
+    print(f"(threshold: +{threshold:.0%}; units per metric are in the JSON reports)")
+
+
+def _load_report(path: str) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="CHROMA Synthetica benchmark suite.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the benchmarks and write a JSON report.")
+    run_parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES))
+    run_parser.add_argument("--depth", type=int, default=0, help="Extra nesting per copy.")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--no-playground", action="store_true")
+    run_parser.add_argument("--output", default="benchmark_results.json")
+
+    compare_parser = commands.add_parser("compare", help="Fail on regressions vs a baseline.")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        report = run_suite(args.scales, args.depth, args.repeat, not args.no_playground)
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        for name, metric in report["metrics"].items():
+            print(f"  {name:34} {metric['value']:>12.3f} {metric['unit']}")
+        print(f"[bench] Report written to {args.output}")
+        return 0
+
+    rows, regressions = compare_reports(
+        _load_report(args.baseline), _load_report(args.current), args.threshold
+    )
+    _print_rows(rows, args.threshold)
+    if regressions:
+        print(f"\nFAILED: {len(regressions)} metric(s) regressed: {', '.join(regressions)}")
+        return 1
+    print("\nOK: no regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
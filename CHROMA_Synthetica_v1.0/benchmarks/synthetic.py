@@ -0,0 +1,129 @@
+"""Synthetic KBs and ACO workloads for the benchmark suite."""
+
+from __future__ import annotations
+
+import json
+import random
+import string
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from synthetica.core.models import (
+    AbstractCreativeObject,
+    ACOElements,
+    ACOIntent,
+    ACOSubject,
+)
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+BASE_KB_PATH = ROOT_DIR / "kb" / "synthetica_kb_v1.1.json"
+SYNTHETIC_LEXICON = "99.0_Synthetic_Lexicon"
+SYNTHETIC_TERMS_PATH = f"{SYNTHETIC_LEXICON}.Terms"
+
+_THERIOCEPHALIC = "2.0_Semiotics_and_Psychology_Database.2.7_Theriocephalic_Iconography"
+_HYBRIDS = [("Kinnari", "Pal_Subversive"), ("Centaur", "Thessalian_Horde")]
+_SHADOW_STATES = ["Repressed", "Projected", "Assimilating", "Integrated"]
+_SETTINGS = [
+    "a terraformed Venus",
+    "a decaying neo-noir metropolis",
+    "a flooded cathedral",
+    "an orbital greenhouse",
+    "a desert film set at dusk",
+]
+
+
+def load_base_kb(path: Path = BASE_KB_PATH) -> Dict[str, Any]:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def synthetic_kb(
+    scale: int,
+    depth: int = 0,
+    seed: int = 0,
+    base: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """
+    KB roughly ``scale`` times the size of the base KB.
+
+    The base KB is kept as-is (so real pipeline paths resolve) and each
+    top-level section is repeated ``scale - 1`` times under suffixed keys,
+    with leaf strings varied per copy and ``depth`` extra nesting levels
+    wrapped around every copy. A flat lexicon of ``200 * scale`` generated
+    terms is added for fuzzy-matching workloads.
+    """
+    if scale < 1:
+        raise ValueError(f"scale must be >= 1: {scale!r}")
+    base = base if base is not None else load_base_kb()
+    kb: Dict[str, Any] = json.loads(json.dumps(base))
+    sections = [(key, value) for key, value in base.items() if isinstance(value, Mapping)]
+
+    for copy in range(1, scale):
+        for key, value in sections:
+            node: Any = _vary(value, copy)
+            for level in range(depth, 0, -1):
+                node = {f"Level_{level}": node}
+            kb[f"{key}_x{copy}"] = node
+
+    rng = random.Random(seed)
+    kb[SYNTHETIC_LEXICON] = {"Terms": [_term(rng) for _ in range(200 * scale)]}
+    return kb
+
+
+def synthetic_acos(
+    count: int, seed: int = 0
+) -> List[Tuple[AbstractCreativeObject, List[Dict[str, Any]]]]:
+    """``count`` (ACO, operator pipeline) pairs built from the demo prototypes."""
+    rng = random.Random(seed)
+    workload = []
+    for index in range(count):
+        hybrid, variant = rng.choice(_HYBRIDS)
+        subject_id = f"{hybrid}_{index}"
+        aco = AbstractCreativeObject()
+        aco.intent = ACOIntent(
+            narrative_moment=f"A {hybrid.lower()} figure {index} in {rng.choice(_SETTINGS)}."
+        )
+        aco.elements = ACOElements(
+            subjects=[ACOSubject(id=subject_id, description=f"{hybrid} hybrid subject.")]
+        )
+        pipeline = [
+            {
+                "name": "Operator_DefineHybridism",
+                "params": {
+                    "subject_id": subject_id,
+                    "ontology_ref": f"{_THERIOCEPHALIC}.{hybrid}",
+                    "variant": variant,
+                },
+            },
+            {
+                "name": "Operator_SetArchetypalDynamics",
+                "params": {"shadow_state": rng.choice(_SHADOW_STATES)},
+            },
+        ]
+        workload.append((aco, pipeline))
+    return workload
+
+
+def misspell(term: str, rng: random.Random) -> str:
+    """Drop or swap one character, like a user typo."""
+    if len(term) < 3:
+        return term
+    position = rng.randrange(1, len(term) - 1)
+    if rng.random() < 0.5:
+        return term[:position] + term[position + 1 :]
+    return term[: position - 1] + term[position] + term[position - 1] + term[position + 1 :]
+
+
+def _vary(value: Any, copy: int) -> Any:
+    if isinstance(value, Mapping):
+        return {key: _vary(item, copy) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_vary(item, copy) for item in value]
+    if isinstance(value, str):
+        return f"{value} {copy}"
+    return value
+
+
+def _term(rng: random.Random) -> str:
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9))) for _ in range(2)]
+    return "_".join(word.capitalize() for word in words)
@@ -3,12 +3,12 @@
 from __future__ import annotations
 
 import argparse
-import json
 import sys
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generator, Iterable, List, Optional, Tuple
 
-from synthetica.services.llm_client import BaseLLMClient, create_llm_client
+if TYPE_CHECKING:  # the LLM client module is imported on first request
+    from synthetica.services.llm_client import BaseLLMClient
 
 SEA_PLAYBOOK_PATH = Path("kb/synthetica_kb_v1.1.json")
 SEA_PLAYBOOK_KEY = "16.0_Creative_Suites_Playbooks"
@@ -56,9 +56,20 @@ EXPECTED_STRUCTURE = {
 # ---------------------------------------------------------------------------
 
 
-def _load_playbook() -> Dict[str, Any]:
-    data = json.loads(SEA_PLAYBOOK_PATH.read_text(encoding="utf-8"))
-    playbook = data.get(SEA_PLAYBOOK_KEY, {}).get(SEA_PLAYBOOK_ENTRY)
+def _playbook_broker() -> Any:
+    # Deferred to the first request. The shared registry keeps the KB loaded
+    # and hands out a new broker once the file changes on disk.
+    from synthetica.core.registry import shared_registry
+
+    return shared_registry().broker_for(SEA_PLAYBOOK_PATH)
+
+
+def _load_playbook(broker: Any = None) -> Dict[str, Any]:
+    # Only the playbook subtree is decoded from the compiled artifact.
+    from synthetica.core.snapshot import thaw
+
+    broker = broker if broker is not None else _playbook_broker()
+    playbook = thaw(broker.get_entry(f"{SEA_PLAYBOOK_KEY}.{SEA_PLAYBOOK_ENTRY}"))
     if playbook is None:
         raise SystemExit("SeaDream playbook not found in KB. Please migrate the KB first.")
     return playbook
@@ -84,29 +95,59 @@ def _payload_is_english(payload: Dict[str, Any]) -> bool:
     return True
 
 
-def _request_payload(llm: BaseLLMClient, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+PAYLOAD_ATTEMPTS = 3
+
+
+def _payload_attempts(
+    user_prompt: str, report: Optional[Callable[[str, Dict[str, Any]], None]] = None
+) -> Generator[str, Dict[str, Any], Dict[str, Any]]:
+    """
+    Retry policy for the blueprint request, shared by the sync and async
+    callers: yields the prompt of each attempt, receives the LLM payload
+    (``send``) and returns the first English one.
+    """
     prompt = user_prompt
-    last_payload: Dict[str, Any] | None = None
-    for _ in range(3):
-        last_payload = llm.generate_json(system_prompt, prompt)
-        if _payload_is_english(last_payload):
-            return last_payload
+    for attempt in range(1, PAYLOAD_ATTEMPTS + 1):
+        if report is not None:
+            report("payload_requested", {"attempt": attempt})
+        payload = yield prompt
+        if _payload_is_english(payload):
+            return payload
+        if report is not None and attempt < PAYLOAD_ATTEMPTS:
+            report("payload_retry", {"attempt": attempt, "reason": "non-ASCII response"})
         prompt += "\nRewrite the entire response strictly in English (ASCII only)."
     raise RuntimeError("Gemini did not return an English response after retries.")
 
 
-def _ensure_ascii(text: str, llm: BaseLLMClient) -> str:
-    if not text or all(ord(ch) < 128 for ch in text):
-        return text
-    translation_prompt = (
+def _request_payload(llm: BaseLLMClient, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+    attempts = _payload_attempts(user_prompt)
+    prompt = next(attempts)
+    while True:
+        try:
+            prompt = attempts.send(llm.generate_json(system_prompt, prompt))
+        except StopIteration as done:
+            return done.value
+
+
+TRANSLATION_SYSTEM_PROMPT = 'Return the translation as a JSON object {"translation": "..."}.'
+
+
+def _needs_translation(text: str) -> bool:
+    return bool(text) and any(ord(ch) >= 128 for ch in text)
+
+
+def _translation_prompt(text: str) -> str:
+    return (
         "Translate the following text into natural English (ASCII only). "
         "Return only the translated sentence without explanations:\n"
         f"{text}"
     )
-    translated = llm.generate_json(
-        'Return the translation as a JSON object {"translation": "..."}.',
-        translation_prompt,
-    )
+
+
+def _ensure_ascii(text: str, llm: BaseLLMClient) -> str:
+    if not _needs_translation(text):
+        return text
+    translated = llm.generate_json(TRANSLATION_SYSTEM_PROMPT, _translation_prompt(text))
     return translated.get("translation", text)
 
 
@@ -162,6 +203,12 @@ def _set_field(payload: Dict[str, Any], component: str, field: str | None, value
 
 
 def _enforce_defaults(payload: Dict[str, Any], theme_defaults: Dict[str, Any], llm: BaseLLMClient) -> None:
+    _apply_theme_defaults(payload, theme_defaults)
+    for container, key in _text_slots(payload):
+        container[key] = _ensure_ascii(container[key], llm)
+
+
+def _apply_theme_defaults(payload: Dict[str, Any], theme_defaults: Dict[str, Any]) -> None:
     defaults = theme_defaults.get("defaults", {})
     camera_block = payload["camera_lens_film"]
 
@@ -187,14 +234,23 @@ def _enforce_defaults(payload: Dict[str, Any], theme_defaults: Dict[str, Any], l
             f"{reference} | in the style of {dp_name}" if reference else dp_name
         )
 
+
+def _text_slots(payload: Dict[str, Any]) -> List[Tuple[Any, Any]]:
+    """(container, key) of every text field that must end up ASCII-only."""
+    slots: List[Tuple[Any, Any]] = []
     for comp, field in EXPECTED_STRUCTURE.items():
         if isinstance(field, dict):
             for sub in field:
-                text = payload[comp].get(sub)
-                if text:
-                    payload[comp][sub] = _ensure_ascii(text, llm)
+                if payload[comp].get(sub):
+                    slots.append((payload[comp], sub))
         elif comp in payload and payload[comp]:
-            payload[comp] = _ensure_ascii(payload[comp], llm)
+            value = payload[comp]
+            if isinstance(value, list):
+                payload[comp] = value = list(value)
+                slots.extend((value, index) for index in range(len(value)))
+            else:
+                slots.append((payload, comp))
+    return slots
 
 
 def _format_blueprint(payload: Dict[str, Any], theme_key: str, theme_desc: str) -> str:
@@ -286,6 +342,8 @@ def run_interaction(user_brief: str, model_name: str, theme_key: str) -> None:
     theme_data = themes[theme_key]
     theme_desc = theme_data.get("description", theme_key)
 
+    from synthetica.services.llm_client import create_llm_client
+
     llm = create_llm_client(model_name=model_name)
     system_prompt = build_system_prompt(playbook, theme_key, theme_data)
     user_prompt = build_user_prompt(user_brief, theme_key)
@@ -50,8 +50,19 @@ def main() -> None:
         choices=THEME_LIST,
         help="Tema inicial do blueprint.",
     )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Mostra o tempo de import por modulo e o cold start ate o primeiro prompt, e sai.",
+    )
     args = parser.parse_args()
 
+    if args.profile_startup:
+        from synthetica.startup_profile import main as profile_startup
+
+        profile_startup(["interactive_chat", "--first-prompt"])
+        return
+
     current_model = args.model
     current_theme = args.theme
     case_library = _load_case_library()
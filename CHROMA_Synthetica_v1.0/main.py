@@ -8,6 +8,7 @@ from synthetica.core.models import (
     ACOIntent,
     ACOSubject,
 )
+from synthetica.logging_config import configure_logging
 from synthetica.orchestrator import ChromaSyntheticaOrchestrator
 
 # Path for the unified knowledge base (v1.1)
@@ -50,6 +51,8 @@ def create_prototype_c_centaur_chiaroscuro() -> AbstractCreativeObject:
 # ==============================================================================
 
 def main():
+    # The demo shows the full trace, intermediate ITI/PSO states included.
+    configure_logging(verbosity=2)
     try:
         synthetica = ChromaSyntheticaOrchestrator(kb_path=KB_PATH)
 
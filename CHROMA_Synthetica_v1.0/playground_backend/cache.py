@@ -0,0 +1,151 @@
+"""
+On-disk cache of generated sessions.
+
+Entries are content-addressed: the key hashes the normalized brief (Unicode
+NFC, case-folded, whitespace collapsed), theme, model, LLM provider and a
+hash of the SeaDream playbook, so editing the playbook invalidates every
+entry. Entries expire after ``TTL_SECONDS`` and the least recently used are
+evicted beyond ``MAX_ENTRIES``. The cache is its own SQLite file (WAL), shared
+by every worker process and kept across restarts.
+
+Kept free of FastAPI imports, like ``generator``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+CACHE_PATH = Path(
+    os.getenv("SYNTHETICA_GENERATION_CACHE", str(DATA_DIR / "generation_cache.sqlite3"))
+)
+TTL_SECONDS = float(os.getenv("SYNTHETICA_GENERATION_CACHE_TTL", str(7 * 24 * 3600)))
+MAX_ENTRIES = int(os.getenv("SYNTHETICA_GENERATION_CACHE_SIZE", "1000"))
+BUSY_TIMEOUT_SECONDS = 30.0
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS generations (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL,
+        stored_at REAL NOT NULL,
+        accessed_at REAL NOT NULL,
+        hits INTEGER NOT NULL DEFAULT 0
+    )""",
+    "CREATE INDEX IF NOT EXISTS generations_accessed ON generations (accessed_at)",
+)
+
+
+def normalize_brief(brief: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", brief).casefold().split())
+
+
+def cache_key(brief: str, theme_key: str, model_name: str, provider: str, playbook_hash: str) -> str:
+    material = json.dumps(
+        [normalize_brief(brief), theme_key, model_name, provider, playbook_hash],
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def content_hash(value: Any) -> str:
+    """Stable hash of a JSON-like value (used for the playbook version)."""
+    canonical = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class GenerationCache:
+    """TTL + LRU bounded key/value store for generated sessions."""
+
+    def __init__(
+        self,
+        path: Path = CACHE_PATH,
+        ttl: float = TTL_SECONDS,
+        max_entries: int = MAX_ENTRIES,
+    ):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._local = threading.local()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl > 0
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        """(value, stored_at) for a live entry, else None."""
+        if not self.enabled:
+            return None
+        now = time.time()
+        connection = self._connection()
+        # Read and touch under one write lock (no RETURNING: SQLite < 3.35).
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                "SELECT value, stored_at FROM generations WHERE key = ? AND stored_at > ?",
+                (key, now - self.ttl),
+            ).fetchone()
+            if row is not None:
+                connection.execute(
+                    "UPDATE generations SET accessed_at = ?, hits = hits + 1 WHERE key = ?",
+                    (now, key),
+                )
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        now = time.time()
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO generations (key, value, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, now),
+            )
+            connection.execute(
+                "DELETE FROM generations WHERE stored_at <= ?", (now - self.ttl,)
+            )
+            connection.execute(
+                "DELETE FROM generations WHERE key IN (SELECT key FROM generations "
+                "ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM generations")
+
+    def __len__(self) -> int:
+        return self._connection().execute("SELECT COUNT(*) FROM generations").fetchone()[0]
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(
+                self.path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            for statement in _SCHEMA:
+                connection.execute(statement)
+            self._local.connection = connection
+        return connection
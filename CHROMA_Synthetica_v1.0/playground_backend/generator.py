@@ -4,69 +4,261 @@ Utilities to produce SeaDream prompts in a programmatic (non-interactive) flow.
 
 from __future__ import annotations
 
-from functools import lru_cache
-from typing import Any, Dict, List, Tuple
-
-from fastapi import HTTPException
+import asyncio
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from interactive_assistant import (
     THEMES,
     MODEL_TARGETS,
+    TRANSLATION_SYSTEM_PROMPT,
     _load_playbook,
+    _playbook_broker,
     _normalize_payload,
     _missing_fields,
+    _apply_theme_defaults,
     _enforce_defaults,
     _format_blueprint,
     _build_model_prompts,
+    _needs_translation,
+    _text_slots,
+    _translation_prompt,
     build_system_prompt,
     build_user_prompt,
+    _payload_attempts,
     _request_payload,
 )
-from synthetica.services.llm_client import create_llm_client
+from playground_backend.cache import GenerationCache, cache_key, content_hash
+from synthetica.services.llm_client import LLM_PROVIDER_ENV, BaseLLMClient, create_llm_client
+
+# Per-session cap on concurrent ASCII translation calls.
+TRANSLATION_CONCURRENCY = int(os.getenv("SYNTHETICA_TRANSLATION_CONCURRENCY", "4"))
+
+# progress(stage, detail): stages are cache_hit, payload_requested,
+# payload_retry, defaults_applied, ascii_translation and prompts_built.
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
+
+
+def _http_error(status_code: int, detail: Any) -> Exception:
+    # FastAPI is imported on the error path only, so the generator can be
+    # used (and benchmarked) without pulling in the web stack.
+    from fastapi import HTTPException
+
+    return HTTPException(status_code=status_code, detail=detail)
+
+
+_playbook_lock = threading.Lock()
+# (broker the playbook was read from, playbook, playbook content hash)
+_playbook: Tuple[Any, Dict[str, Any], str] = (None, {}, "")
+
+
+def _playbook_state() -> Tuple[Dict[str, Any], str]:
+    """
+    The SeaDream playbook and its content hash, derived once per KB broker.
+    Asking the registry costs one ``stat``; an edited KB file yields a new
+    broker and both are derived again.
+    """
+    global _playbook
+    broker = _playbook_broker()
+    loaded = _playbook
+    if loaded[0] is not broker:
+        with _playbook_lock:
+            loaded = _playbook
+            if loaded[0] is not broker:
+                playbook = _load_playbook(broker)
+                loaded = _playbook = (broker, playbook, content_hash(playbook))
+    return loaded[1], loaded[2]
 
 
-@lru_cache(maxsize=1)
 def _get_playbook() -> Dict[str, Any]:
-    """Load and cache the SeaDream playbook."""
-    return _load_playbook()
+    return _playbook_state()[0]
+
+
+def _playbook_hash() -> str:
+    return _playbook_state()[1]
 
 
 def _ensure_theme(theme_key: str) -> None:
     if theme_key not in THEMES:
-        raise HTTPException(status_code=400, detail=f"Unsupported theme '{theme_key}'.")
+        raise _http_error(400, f"Unsupported theme '{theme_key}'.")
 
 
 def generate_prompt_session(
     brief: str,
     model_name: str,
     theme_key: str,
+    cache: Optional[GenerationCache] = None,
+    bypass_cache: bool = False,
 ) -> Dict[str, Any]:
     """
     Generate prompts and blueprint for a single session.
 
     Returns a dictionary with blueprint text, normalized payload,
     prompts per downstream model, and any checklist/notes produced by the LLM.
+    With a ``cache``, a repeated request is answered from it (``bypass_cache``
+    forces a fresh generation, which then replaces the entry) and the result
+    carries ``cache`` metadata.
     """
+    key = _cache_key(cache, brief, model_name, theme_key)
+    if key is not None and not bypass_cache:
+        cached = _cache_lookup(cache, key)
+        if cached is not None:
+            return cached
+    llm, theme_data, system_prompt, user_prompt = _prepare(brief, model_name, theme_key)
+    payload = _checked_payload(_request_payload(llm, system_prompt, user_prompt))
+    _enforce_defaults(payload, theme_data, llm)
+    session = _session(payload, theme_data, model_name, theme_key)
+    if key is not None:
+        _cache_store(cache, key, session, bypass_cache)
+    return session
+
+
+async def generate_prompt_session_async(
+    brief: str,
+    model_name: str,
+    theme_key: str,
+    progress: Optional[ProgressCallback] = None,
+    cache: Optional[GenerationCache] = None,
+    bypass_cache: bool = False,
+    lookup: bool = True,
+) -> Dict[str, Any]:
+    """
+    ``generate_prompt_session`` over ``BaseLLMClient.agenerate_json``.
+
+    Never blocks the event loop on the LLM, and the per-field ASCII
+    translations are requested concurrently (``TRANSLATION_CONCURRENCY`` at a
+    time) instead of one after another.
+    Cancelling the task abandons the in-flight LLM calls. ``progress`` is
+    called at each stage (see ``ProgressCallback``). Pass ``lookup=False``
+    when the caller already checked ``cached_session_async``; the result is
+    still stored in ``cache``.
+    """
+    report = progress or _no_progress
+    if lookup and not bypass_cache:
+        cached = await cached_session_async(cache, brief, model_name, theme_key, report)
+        if cached is not None:
+            return cached
+    # Playbook loading/hashing and client creation touch the disk: keep them
+    # off the event loop.
+    key = await asyncio.to_thread(_cache_key, cache, brief, model_name, theme_key)
+    llm, theme_data, system_prompt, user_prompt = await asyncio.to_thread(
+        _prepare, brief, model_name, theme_key
+    )
+    payload = _checked_payload(
+        await _request_payload_async(llm, system_prompt, user_prompt, report)
+    )
+    _apply_theme_defaults(payload, theme_data)
+    report("defaults_applied", {})
+    await _ensure_ascii_async(payload, llm, report)
+    session = _session(payload, theme_data, model_name, theme_key)
+    report("prompts_built", {"models": sorted(session["prompts"])})
+    if key is not None:
+        await asyncio.to_thread(_cache_store, cache, key, session, bypass_cache)
+    return session
+
+
+async def cached_session_async(
+    cache: Optional[GenerationCache],
+    brief: str,
+    model_name: str,
+    theme_key: str,
+    progress: Optional[ProgressCallback] = None,
+) -> Optional[Dict[str, Any]]:
+    """The cached session for this request, or None; never generates."""
+    key = await asyncio.to_thread(_cache_key, cache, brief, model_name, theme_key)
+    if key is None:
+        return None
+    cached = await asyncio.to_thread(_cache_lookup, cache, key)
+    if cached is not None and progress is not None:
+        progress("cache_hit", {"age_seconds": cached["cache"]["age_seconds"]})
+    return cached
+
+
+def check_request(brief: str, theme_key: str) -> None:
+    """Raise the 400 ``generate_prompt_session`` would for an unusable request."""
     if not brief:
-        raise HTTPException(status_code=400, detail="Briefing text cannot be empty.")
+        raise _http_error(400, "Briefing text cannot be empty.")
 
     _ensure_theme(theme_key)
 
+
+def session_record(
+    generated: Dict[str, Any], brief: str, tags: List[str], case_id: Optional[str]
+) -> Dict[str, Any]:
+    """The history entry (minus id/created_at/liked) for a generated session."""
+    return {
+        "brief": brief,
+        "theme": generated["theme"],
+        "model_name": generated["model_name"],
+        "blueprint": generated["blueprint"],
+        "prompts": generated["prompts"],
+        "payload": generated["payload"],
+        "checklist_questions": generated.get("checklist_questions", []),
+        "notes": generated.get("notes", []),
+        "tags": tags or [],
+        "case_id": case_id,
+    }
+
+
+def _no_progress(stage: str, detail: Dict[str, Any]) -> None:
+    pass
+
+
+def _cache_key(
+    cache: Optional[GenerationCache], brief: str, model_name: str, theme_key: str
+) -> Optional[str]:
+    if cache is None or not cache.enabled:
+        return None
+    # Bad requests fail the same way whether or not the answer is cached.
+    check_request(brief, theme_key)
+    provider = (os.getenv(LLM_PROVIDER_ENV) or "gemini").lower()
+    return cache_key(brief, theme_key, model_name, provider, _playbook_hash())
+
+
+def _cache_lookup(cache: GenerationCache, key: str) -> Optional[Dict[str, Any]]:
+    found = cache.get(key)
+    if found is None:
+        return None
+    session, stored_at = found
+    session["cache"] = {
+        "hit": True,
+        "key": key,
+        "stored_at": datetime.fromtimestamp(stored_at, timezone.utc).isoformat(),
+        "age_seconds": round(time.time() - stored_at, 3),
+        "bypassed": False,
+    }
+    return session
+
+
+def _cache_store(
+    cache: GenerationCache, key: str, session: Dict[str, Any], bypassed: bool
+) -> None:
+    cache.put(key, session)
+    session["cache"] = {"hit": False, "key": key, "bypassed": bypassed}
+
+
+def _prepare(
+    brief: str, model_name: str, theme_key: str
+) -> Tuple[BaseLLMClient, Dict[str, Any], str, str]:
+    check_request(brief, theme_key)
+
     playbook = _get_playbook()
     themes = playbook.get("themes", {})
     theme_data = themes.get(theme_key)
     if theme_data is None:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Theme '{theme_key}' is not configured in the playbook.",
-        )
+        raise _http_error(400, f"Theme '{theme_key}' is not configured in the playbook.")
 
     llm = create_llm_client(model_name=model_name)
 
     system_prompt = build_system_prompt(playbook, theme_key, theme_data)
     user_prompt = build_user_prompt(brief, theme_key)
+    return llm, theme_data, system_prompt, user_prompt
 
-    payload_raw = _request_payload(llm, system_prompt, user_prompt)
+
+def _checked_payload(payload_raw: Dict[str, Any]) -> Dict[str, Any]:
     payload = _normalize_payload(payload_raw)
 
     missing = _missing_fields(payload)
@@ -77,16 +269,52 @@ def generate_prompt_session(
             if field:
                 entry["field"] = field
             formatted_missing.append(entry)
-        raise HTTPException(
-            status_code=422,
-            detail={
+        raise _http_error(
+            422,
+            {
                 "message": "LLM response missing required fields.",
                 "missing_fields": formatted_missing,
             },
         )
+    return payload
 
-    _enforce_defaults(payload, theme_data, llm)
 
+async def _request_payload_async(
+    llm: BaseLLMClient, system_prompt: str, user_prompt: str, report: ProgressCallback
+) -> Dict[str, Any]:
+    attempts = _payload_attempts(user_prompt, report)
+    prompt = next(attempts)
+    while True:
+        try:
+            prompt = attempts.send(await llm.agenerate_json(system_prompt, prompt))
+        except StopIteration as done:
+            return done.value
+
+
+async def _ensure_ascii_async(
+    payload: Dict[str, Any], llm: BaseLLMClient, report: ProgressCallback
+) -> None:
+    slots = [
+        (container, key)
+        for container, key in _text_slots(payload)
+        if _needs_translation(container[key])
+    ]
+    if slots:
+        report("ascii_translation", {"fields": len(slots)})
+    semaphore = asyncio.Semaphore(TRANSLATION_CONCURRENCY)
+
+    async def translate(text: str) -> Dict[str, Any]:
+        async with semaphore:
+            return await llm.agenerate_json(TRANSLATION_SYSTEM_PROMPT, _translation_prompt(text))
+
+    translations = await asyncio.gather(*(translate(container[key]) for container, key in slots))
+    for (container, key), translated in zip(slots, translations):
+        container[key] = translated.get("translation", container[key])
+
+
+def _session(
+    payload: Dict[str, Any], theme_data: Dict[str, Any], model_name: str, theme_key: str
+) -> Dict[str, Any]:
     theme_desc = theme_data.get("description", theme_key)
     blueprint_text = _format_blueprint(payload, theme_key, theme_desc)
     prompts = _build_model_prompts(payload, theme_desc)
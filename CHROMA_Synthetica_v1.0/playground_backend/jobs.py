@@ -0,0 +1,346 @@
+"""
+Background generation jobs.
+
+``POST /generate`` with ``background: true`` stores the request in the
+``jobs`` table of the session database and returns at once. ``JobWorkers``
+(started with the app) claim queued jobs, run the async generation and
+write the session to the history in the same transaction that marks the job
+``succeeded``. Every stage reported by the generator is appended to
+``job_events``, which ``GET /jobs/{id}/events`` streams as server-sent
+events.
+
+The queue is the SQLite database itself: claims are atomic across uvicorn
+workers. A running job's worker refreshes its heartbeat at least every
+``HEARTBEAT_SECONDS``; a job whose worker died (no heartbeat for
+``STALE_AFTER_SECONDS``) is requeued, up to ``MAX_ATTEMPTS`` times. A
+worker only finishes a job while its claim (the attempt number) is current.
+Progress events are written in order by a per-job task, off the event loop.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from fastapi import HTTPException
+
+from playground_backend.pool import TIMEOUT_SECONDS
+from playground_backend.storage import SessionStore, get_store
+
+LOGGER = logging.getLogger(__name__)
+
+JOB_WORKERS = int(os.getenv("SYNTHETICA_JOB_WORKERS", "2"))
+POLL_SECONDS = 0.5
+CLAIM_BACKOFF_MAX_SECONDS = 30.0
+HEARTBEAT_SECONDS = 15.0
+MAX_ATTEMPTS = 3
+STALE_AFTER_SECONDS = 4 * HEARTBEAT_SECONDS
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+TERMINAL_STATUSES = frozenset({SUCCEEDED, FAILED})
+
+_JOB_SELECT = (
+    "id, status, request, created_at, started_at, finished_at, attempts, session_id, error, "
+    "(SELECT stage FROM job_events e WHERE e.job_id = jobs.id ORDER BY e.seq DESC LIMIT 1)"
+)
+
+
+class JobQueue:
+    """SQLite-backed queue of generation requests and their progress events."""
+
+    def __init__(self, store: Optional[SessionStore] = None):
+        self._store = store
+
+    @property
+    def store(self) -> SessionStore:
+        return self._store or get_store()
+
+    def enqueue(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        job_id = str(uuid.uuid4())
+        now = _now()
+        with self.store.transaction() as connection:
+            connection.execute(
+                "INSERT INTO jobs (id, status, request, created_at) VALUES (?, ?, ?, ?)",
+                (job_id, QUEUED, json.dumps(request, ensure_ascii=False), now),
+            )
+            _add_event(connection, job_id, QUEUED, {})
+        return self.get(job_id)  # type: ignore[return-value]
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = (
+            self.store.connection()
+            .execute(f"SELECT {_JOB_SELECT} FROM jobs WHERE id = ?", (job_id,))
+            .fetchone()
+        )
+        return _job(row) if row is not None else None
+
+    def events(self, job_id: str, after: int = 0) -> List[Dict[str, Any]]:
+        rows = self.store.connection().execute(
+            "SELECT seq, stage, detail, at FROM job_events WHERE job_id = ? AND seq > ? "
+            "ORDER BY seq",
+            (job_id, after),
+        )
+        return [
+            {"seq": seq, "stage": stage, "detail": json.loads(detail), "at": at}
+            for seq, stage, detail, at in rows
+        ]
+
+    def claim(self) -> Optional[Dict[str, Any]]:
+        """Mark the oldest queued job as running and return it (None if idle)."""
+        with self.store.transaction() as connection:
+            self._requeue_stale(connection)
+            # BEGIN IMMEDIATE holds the write lock, so select-then-update is
+            # atomic (and works on SQLite builds without RETURNING).
+            row = connection.execute(
+                "SELECT id, attempts FROM jobs WHERE status = ? ORDER BY seq LIMIT 1", (QUEUED,)
+            ).fetchone()
+            if row is None:
+                return None
+            job_id, attempt = row[0], row[1] + 1
+            connection.execute(
+                "UPDATE jobs SET status = ?, started_at = ?, heartbeat = ?, attempts = ? "
+                "WHERE id = ?",
+                (RUNNING, _now(), time.time(), attempt, job_id),
+            )
+            _add_event(connection, job_id, "started", {"attempt": attempt})
+        return self.get(job_id)
+
+    def record(self, job_id: str, stage: str, detail: Dict[str, Any]) -> None:
+        """Append a progress event; doubles as the worker heartbeat."""
+        with self.store.transaction() as connection:
+            connection.execute(
+                "UPDATE jobs SET heartbeat = ? WHERE id = ?", (time.time(), job_id)
+            )
+            _add_event(connection, job_id, stage, detail)
+
+    def heartbeat(self, job_id: str) -> None:
+        self.store.connection().execute(
+            "UPDATE jobs SET heartbeat = ? WHERE id = ? AND status = ?",
+            (time.time(), job_id, RUNNING),
+        )
+
+    # complete/fail/release take the ``attempts`` value returned by ``claim``
+    # as a claim token: once a stale job is requeued (and maybe claimed
+    # again), the worker that lost it can no longer finish it.
+
+    def complete(
+        self, job_id: str, attempt: int, session: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Store the session and mark the job succeeded, atomically.
+
+        Returns None, storing nothing, if the claim was lost.
+        """
+        with self.store.transaction() as connection:
+            if not _finish(connection, job_id, attempt, SUCCEEDED):
+                return None
+            entry = self.store.add_session(session, connection=connection)
+            connection.execute(
+                "UPDATE jobs SET session_id = ? WHERE id = ?", (entry["id"], job_id)
+            )
+            _add_event(connection, job_id, SUCCEEDED, {"session_id": entry["id"]})
+        return entry
+
+    def fail(self, job_id: str, attempt: int, error: Any) -> bool:
+        with self.store.transaction() as connection:
+            if not _finish(connection, job_id, attempt, FAILED, error=error):
+                return False
+            _add_event(connection, job_id, FAILED, {"error": error})
+        return True
+
+    def release(self, job_id: str, attempt: int) -> None:
+        """Put a running job back in the queue (worker shutting down)."""
+        with self.store.transaction() as connection:
+            released = connection.execute(
+                "UPDATE jobs SET status = ?, heartbeat = NULL "
+                "WHERE id = ? AND status = ? AND attempts = ?",
+                (QUEUED, job_id, RUNNING, attempt),
+            ).rowcount
+            if released:
+                _add_event(connection, job_id, QUEUED, {"reason": "worker stopped"})
+
+    @staticmethod
+    def _requeue_stale(connection: Any) -> None:
+        cutoff = time.time() - STALE_AFTER_SECONDS
+        stale = connection.execute(
+            "SELECT id, attempts FROM jobs WHERE status = ? AND heartbeat < ?",
+            (RUNNING, cutoff),
+        ).fetchall()
+        for job_id, attempts in stale:
+            if attempts >= MAX_ATTEMPTS:
+                error = f"Worker lost {attempts} times; giving up."
+                connection.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ?, error = ? WHERE id = ?",
+                    (FAILED, _now(), json.dumps(error), job_id),
+                )
+                _add_event(connection, job_id, FAILED, {"error": error})
+            else:
+                connection.execute(
+                    "UPDATE jobs SET status = ?, heartbeat = NULL WHERE id = ?", (QUEUED, job_id)
+                )
+                _add_event(connection, job_id, QUEUED, {"reason": "worker lost"})
+
+
+ProgressCallback = Callable[[str, Dict[str, Any]], None]
+Generate = Callable[[Dict[str, Any], ProgressCallback], Awaitable[Dict[str, Any]]]
+Record = Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]]
+
+
+class JobWorkers:
+    """``count`` asyncio tasks that drain a ``JobQueue``."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        generate: Generate,
+        session_record: Record,
+        count: int = JOB_WORKERS,
+        timeout: Optional[float] = TIMEOUT_SECONDS,
+    ):
+        self.queue = queue
+        self.generate = generate  # (request, progress) -> generated session
+        self.session_record = session_record  # (request, generated) -> history entry
+        self.count = count
+        self.timeout = timeout
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def start(self) -> None:
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(self.count)]
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Wake an idle worker now instead of at its next poll."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _work(self) -> None:
+        failures = 0
+        while True:
+            try:
+                job = await asyncio.to_thread(self.queue.claim)
+            except Exception:  # e.g. database locked past busy_timeout
+                failures += 1
+                delay = min(POLL_SECONDS * 2**failures, CLAIM_BACKOFF_MAX_SECONDS)
+                LOGGER.exception("Could not claim a job; retrying in %.1fs", delay)
+                await asyncio.sleep(delay)
+                continue
+            failures = 0
+            if job is None:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(job)
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        job_id, attempt, request = job["id"], job["attempts"], job["request"]
+        events: asyncio.Queue = asyncio.Queue()
+        reporter = asyncio.create_task(self._report(job_id, events))
+        try:
+            generated = await asyncio.wait_for(
+                self.generate(request, lambda stage, detail: events.put_nowait((stage, detail))),
+                self.timeout,
+            )
+            session = self.session_record(request, generated)
+            await self._flush(events, reporter)
+            await asyncio.to_thread(self.queue.complete, job_id, attempt, session)
+        except asyncio.CancelledError:
+            reporter.cancel()
+            await asyncio.shield(asyncio.to_thread(self.queue.release, job_id, attempt))
+            raise
+        except asyncio.TimeoutError:
+            error: Any = f"Generation timed out after {self.timeout:g}s."
+        except HTTPException as exc:
+            error = exc.detail
+        except Exception as exc:  # a failing job must not kill the worker
+            LOGGER.exception("Job %s failed", job_id)
+            error = f"{type(exc).__name__}: {exc}"
+        else:
+            return
+        await self._flush(events, reporter)
+        await asyncio.to_thread(self.queue.fail, job_id, attempt, error)
+
+    async def _report(self, job_id: str, events: asyncio.Queue) -> None:
+        """Write queued progress events in order; heartbeat while none arrive."""
+        while True:
+            try:
+                event = await asyncio.wait_for(events.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                event = ()
+            if event is None:
+                return
+            try:
+                if event:
+                    await asyncio.to_thread(self.queue.record, job_id, *event)
+                else:
+                    await asyncio.to_thread(self.queue.heartbeat, job_id)
+            except Exception:  # progress is best effort; the job goes on
+                LOGGER.exception("Could not record progress of job %s", job_id)
+
+    @staticmethod
+    async def _flush(events: asyncio.Queue, reporter: asyncio.Task) -> None:
+        """Let ``reporter`` write what is queued, so it precedes the final state."""
+        events.put_nowait(None)
+        await reporter
+
+
+def _finish(connection: Any, job_id: str, attempt: int, status: str, error: Any = None) -> bool:
+    """Move a job this worker still holds to ``status``; False if the claim was lost."""
+    finished = connection.execute(
+        "UPDATE jobs SET status = ?, finished_at = ?, error = ? "
+        "WHERE id = ? AND status = ? AND attempts = ?",
+        (
+            status,
+            _now(),
+            json.dumps(error, ensure_ascii=False) if error is not None else None,
+            job_id,
+            RUNNING,
+            attempt,
+        ),
+    ).rowcount
+    if not finished:
+        LOGGER.warning(
+            "Job %s attempt %d was requeued; dropping its %s result", job_id, attempt, status
+        )
+    return bool(finished)
+
+
+def _add_event(connection: Any, job_id: str, stage: str, detail: Dict[str, Any]) -> None:
+    connection.execute(
+        "INSERT INTO job_events (job_id, stage, detail, at) VALUES (?, ?, ?, ?)",
+        (job_id, stage, json.dumps(detail, ensure_ascii=False), _now()),
+    )
+
+
+def _job(row: Any) -> Dict[str, Any]:
+    job_id, status, request, created, started, finished, attempts, session_id, error, stage = row
+    return {
+        "id": job_id,
+        "status": status,
+        "request": json.loads(request),
+        "created_at": created,
+        "started_at": started,
+        "finished_at": finished,
+        "attempts": attempts,
+        "session_id": session_id,
+        "error": json.loads(error) if error is not None else None,
+        "stage": stage,
+    }
+
+
+def _now() -> str:
+    return datetime.utcnow().isoformat()
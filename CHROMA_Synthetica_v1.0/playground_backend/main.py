@@ -1,23 +1,96 @@
 from __future__ import annotations
 
-from fastapi import FastAPI, HTTPException
-from fastapi.middleware.cors import CORSMiddleware
+import asyncio
+import json
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
 
-from playground_backend.generator import generate_prompt_session
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+
+from playground_backend.cache import GenerationCache
+from playground_backend.generator import (
+    ProgressCallback,
+    cached_session_async,
+    check_request,
+    generate_prompt_session_async,
+    session_record,
+)
 from playground_backend import storage
+from playground_backend.jobs import TERMINAL_STATUSES, JobQueue, JobWorkers
+from playground_backend.pool import GenerationPool, run_until_disconnected
 from playground_backend.models import (
     GenerateRequest,
     GenerateResponse,
     HistoryResponse,
+    JobAccepted,
+    JobStatus,
     LikeRequest,
     ReferenceResponse,
     PromptSession,
+    SessionSummary,
 )
 
+SSE_POLL_SECONDS = 0.25
+SSE_KEEPALIVE_SECONDS = 15.0
+
+
+generation_cache = GenerationCache()
+
+
+async def _cached(
+    request: Dict[str, Any], progress: Optional[ProgressCallback] = None
+) -> Optional[Dict[str, Any]]:
+    """Cache hit for ``request``; checked before a generation slot is taken."""
+    if request.get("cache") == "bypass":
+        return None
+    return await cached_session_async(
+        generation_cache, request["brief"], request["model"], request["theme"], progress
+    )
+
+
+async def _generate(
+    request: Dict[str, Any], progress: Optional[ProgressCallback] = None
+) -> Dict[str, Any]:
+    """Fresh generation (the caller checked ``_cached``); stored in the cache."""
+    return await generate_prompt_session_async(
+        brief=request["brief"],
+        model_name=request["model"],
+        theme_key=request["theme"],
+        progress=progress,
+        cache=generation_cache,
+        bypass_cache=request.get("cache") == "bypass",
+        lookup=False,
+    )
+
+
+async def _run_job(request: Dict[str, Any], progress: ProgressCallback) -> Dict[str, Any]:
+    cached = await _cached(request, progress)
+    return cached if cached is not None else await _generate(request, progress)
+
+
+def _record(request: Dict[str, Any], generated: Dict[str, Any]) -> Dict[str, Any]:
+    return session_record(generated, request["brief"], request["tags"], request["case_id"])
+
+
+job_queue = JobQueue()
+job_workers = JobWorkers(job_queue, _run_job, _record)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    if job_workers.count > 0:
+        job_workers.start()
+    yield
+    await job_workers.stop()
+
+
 app = FastAPI(
     title="SeaDream Prompt Playground",
     description="Web playground backend for generating SeaDream prompts.",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -28,54 +101,152 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+generation_pool = GenerationPool()
+
 
 @app.get("/")
 async def root() -> dict[str, str]:
     return {"status": "ok"}
 
 
-@app.post("/generate", response_model=GenerateResponse)
-async def generate_prompt(request: GenerateRequest) -> GenerateResponse:
-    try:
-        generated = generate_prompt_session(
-            brief=request.brief,
-            model_name=request.model,
-            theme_key=request.theme,
+@app.post(
+    "/generate",
+    response_model=Union[GenerateResponse, JobAccepted],
+    responses={
+        202: {"model": JobAccepted, "description": "Queued as a background job."},
+        429: {"description": "Generation queue full; see Retry-After."},
+    },
+)
+async def generate_prompt(
+    request: GenerateRequest, http_request: Request, response: Response
+) -> Union[GenerateResponse, JobAccepted]:
+    if request.background:
+        check_request(request.brief, request.theme)
+        job = await asyncio.to_thread(
+            job_queue.enqueue, request.model_dump(exclude={"background"})
+        )
+        job_workers.notify()
+        response.status_code = 202
+        return JobAccepted(
+            job_id=job["id"],
+            status=job["status"],
+            status_url=f"/jobs/{job['id']}",
+            events_url=f"/jobs/{job['id']}/events",
+        )
+
+    payload = request.model_dump()
+    generated = await _cached(payload)
+    if generated is None:
+        # Only misses (and bypasses) wait for, and occupy, a generation slot.
+        generated = await run_until_disconnected(
+            http_request, generation_pool.run(lambda: _generate(payload))
         )
-    except HTTPException:
-        raise
-
-    session_payload = {
-        "brief": request.brief,
-        "theme": generated["theme"],
-        "model_name": generated["model_name"],
-        "blueprint": generated["blueprint"],
-        "prompts": generated["prompts"],
-        "payload": generated["payload"],
-        "checklist_questions": generated.get("checklist_questions", []),
-        "notes": generated.get("notes", []),
-        "tags": request.tags or [],
-        "case_id": request.case_id,
-    }
-
-    stored = storage.add_session(session_payload)
-    return GenerateResponse(session=PromptSession(**stored))
+
+    session_payload = session_record(generated, request.brief, request.tags, request.case_id)
+    stored = await asyncio.to_thread(storage.add_session, session_payload)
+    return GenerateResponse(session=PromptSession(**stored), cache=generated.get("cache"))
+
+
+def _page(
+    limit: int,
+    before: Optional[str],
+    theme: Optional[str],
+    tags: List[str],
+    case_id: Optional[str],
+    liked: Optional[bool],
+    full: bool,
+) -> HistoryResponse:
+    page = storage.query_sessions(
+        limit=limit, before=before, theme=theme, tags=tags, case_id=case_id, liked=liked, full=full
+    )
+    model = PromptSession if full else SessionSummary
+    return HistoryResponse(
+        items=[model(**entry) for entry in page.items], next_cursor=page.next_cursor
+    )
 
 
 @app.get("/history", response_model=HistoryResponse)
-async def get_history() -> HistoryResponse:
-    entries = [PromptSession(**entry) for entry in storage.list_history()]
-    return HistoryResponse(items=entries)
+async def get_history(
+    limit: int = Query(storage.DEFAULT_PAGE_SIZE, ge=1, le=storage.MAX_PAGE_SIZE),
+    before: Optional[str] = Query(None, description="Cursor from a previous page."),
+    theme: Optional[str] = None,
+    tag: List[str] = Query(default_factory=list, description="Sessions carrying all tags."),
+    case_id: Optional[str] = None,
+    liked: Optional[bool] = None,
+    full: bool = Query(False, description="Include blueprint, prompts and payload."),
+) -> HistoryResponse:
+    return await asyncio.to_thread(_page, limit, before, theme, tag, case_id, liked, full)
 
 
 @app.post("/history/{session_id}/like", response_model=GenerateResponse)
 async def like_session(session_id: str, request: LikeRequest) -> GenerateResponse:
-    updated = storage.set_like(session_id, request.liked)
+    updated = await asyncio.to_thread(storage.set_like, session_id, request.liked)
     return GenerateResponse(session=PromptSession(**updated))
 
 
 @app.get("/references", response_model=ReferenceResponse)
-async def get_references() -> ReferenceResponse:
-    entries = [PromptSession(**entry) for entry in storage.list_references()]
-    return ReferenceResponse(items=entries)
-
+async def get_references(
+    limit: int = Query(storage.DEFAULT_PAGE_SIZE, ge=1, le=storage.MAX_PAGE_SIZE),
+    before: Optional[str] = Query(None, description="Cursor from a previous page."),
+    theme: Optional[str] = None,
+    tag: List[str] = Query(default_factory=list, description="Sessions carrying all tags."),
+    case_id: Optional[str] = None,
+    full: bool = Query(False, description="Include blueprint, prompts and payload."),
+) -> ReferenceResponse:
+    page = await asyncio.to_thread(_page, limit, before, theme, tag, case_id, True, full)
+    return ReferenceResponse(items=page.items, next_cursor=page.next_cursor)
+
+
+def _job_or_404(job_id: str) -> Dict[str, Any]:
+    job = job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job
+
+
+@app.get("/jobs/{job_id}", response_model=JobStatus)
+async def get_job(job_id: str) -> JobStatus:
+    job = await asyncio.to_thread(_job_or_404, job_id)
+    session = None
+    if job["session_id"] is not None:
+        entry = await asyncio.to_thread(storage.get_store().get, job["session_id"])
+        session = PromptSession(**entry) if entry is not None else None
+    job.pop("request")
+    return JobStatus(**job, session=session)
+
+
+@app.get("/jobs/{job_id}/events")
+async def stream_job_events(
+    job_id: str, request: Request, last_event_id: Optional[str] = Header(None)
+) -> StreamingResponse:
+    """Server-sent events, one per stage; the stream ends once the job finishes."""
+    await asyncio.to_thread(_job_or_404, job_id)
+    after = int(last_event_id) if last_event_id and last_event_id.isdigit() else 0
+
+    async def stream() -> AsyncIterator[str]:
+        nonlocal after
+        idle = 0.0
+        while True:
+            events = await asyncio.to_thread(job_queue.events, job_id, after)
+            for event in events:
+                after = event["seq"]
+                yield f"id: {after}\nevent: {event['stage']}\ndata: {json.dumps(event)}\n\n"
+            if events and events[-1]["stage"] in TERMINAL_STATUSES:
+                return
+            if not events:
+                job = await asyncio.to_thread(job_queue.get, job_id)
+                if job is None or job["status"] in TERMINAL_STATUSES:
+                    return
+            if await request.is_disconnected():
+                return
+            idle = 0.0 if events else idle + SSE_POLL_SECONDS
+            if idle >= SSE_KEEPALIVE_SECONDS:
+                idle = 0.0
+                yield ": keep-alive\n\n"
+            await asyncio.sleep(SSE_POLL_SECONDS)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -4,7 +4,7 @@ Pydantic models shared across the playground backend.
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Literal, Optional, Union
 
 from pydantic import BaseModel, Field
 
@@ -24,36 +24,83 @@ class GenerateRequest(BaseModel):
         default_factory=list,
         description="Optional tags for organizing sessions.",
     )
+    background: bool = Field(
+        default=False,
+        description="Queue the generation as a job and return its id immediately.",
+    )
+    cache: Literal["use", "bypass"] = Field(
+        default="use",
+        description="'bypass' forces a fresh generation (which then refreshes the cache).",
+    )
+
 
+class SessionSummary(BaseModel):
+    """Lightweight projection of a session (no blueprint/prompts/payload)."""
 
-class PromptSession(BaseModel):
     id: str
     created_at: str
     liked: bool
     brief: str
     theme: str
     model_name: str
+    tags: List[str] = Field(default_factory=list)
+    case_id: Optional[str] = None
+
+
+class PromptSession(SessionSummary):
     blueprint: str
     prompts: Dict[str, str]
     payload: Dict[str, Any]
     checklist_questions: List[str] = Field(default_factory=list)
     notes: List[str] = Field(default_factory=list)
-    tags: List[str] = Field(default_factory=list)
-    case_id: Optional[str] = None
+
+
+class CacheInfo(BaseModel):
+    hit: bool
+    key: str = Field(..., description="Content hash of brief, theme, model and playbook.")
+    bypassed: bool = False
+    stored_at: Optional[str] = None
+    age_seconds: Optional[float] = None
 
 
 class GenerateResponse(BaseModel):
     session: PromptSession
+    cache: Optional[CacheInfo] = Field(
+        default=None, description="Generation cache metadata (absent when caching is off)."
+    )
 
 
 class HistoryResponse(BaseModel):
-    items: List[PromptSession]
+    items: List[Union[PromptSession, SessionSummary]]
+    next_cursor: Optional[str] = Field(
+        default=None,
+        description="Pass as `before` to fetch the next page; null on the last page.",
+    )
 
 
 class LikeRequest(BaseModel):
     liked: bool = Field(..., description="Whether the session should be marked as reference.")
 
 
-class ReferenceResponse(BaseModel):
-    items: List[PromptSession]
+class ReferenceResponse(HistoryResponse):
+    pass
+
 
+class JobAccepted(BaseModel):
+    job_id: str
+    status: str
+    status_url: str
+    events_url: str = Field(..., description="Server-sent events with stage progress.")
+
+
+class JobStatus(BaseModel):
+    id: str
+    status: str = Field(..., description="queued, running, succeeded or failed.")
+    stage: Optional[str] = Field(default=None, description="Last reported stage.")
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    attempts: int = 0
+    error: Optional[Any] = None
+    session_id: Optional[str] = None
+    session: Optional[PromptSession] = None
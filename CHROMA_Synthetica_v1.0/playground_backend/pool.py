@@ -0,0 +1,102 @@
+"""
+Bounded concurrency for LLM-backed generations.
+
+``GenerationPool`` lets at most ``max_concurrency`` generations run at once
+per worker process and queues up to ``max_queue`` more; beyond that requests
+are rejected with 429 and a ``Retry-After`` estimated from recent
+generation times. Each request (queue wait included) is bounded by
+``timeout`` (504 when exceeded), and ``run_until_disconnected`` cancels a
+generation whose client went away.
+
+Cancellation abandons the awaiting coroutine. Clients without a native
+async API run ``generate_json`` in a thread (see
+``BaseLLMClient.agenerate_json``), which finishes in the background.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from fastapi import HTTPException, Request
+
+T = TypeVar("T")
+
+MAX_CONCURRENCY = int(os.getenv("SYNTHETICA_GENERATE_CONCURRENCY", "4"))
+MAX_QUEUE = int(os.getenv("SYNTHETICA_GENERATE_QUEUE", "16"))
+TIMEOUT_SECONDS = float(os.getenv("SYNTHETICA_GENERATE_TIMEOUT", "120"))
+DISCONNECT_POLL_SECONDS = 0.5
+
+
+class GenerationPool:
+    """Semaphore-bounded runner with a bounded wait queue and timeouts."""
+
+    def __init__(
+        self,
+        max_concurrency: int = MAX_CONCURRENCY,
+        max_queue: int = MAX_QUEUE,
+        timeout: Optional[float] = TIMEOUT_SECONDS,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.timeout = timeout
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._pending = 0  # running + queued
+        self._average_seconds: Optional[float] = None
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely free, from the moving average duration."""
+        average = self._average_seconds or 10.0
+        waves = (self._pending - self.max_concurrency) / self.max_concurrency + 1
+        return max(1, math.ceil(average * waves))
+
+    async def run(self, work: Callable[[], Awaitable[T]]) -> T:
+        if self._pending >= self.max_concurrency + self.max_queue:
+            raise HTTPException(
+                status_code=429,
+                detail="Generation queue is full; retry later.",
+                headers={"Retry-After": str(self.retry_after())},
+            )
+        self._pending += 1
+        try:
+            return await asyncio.wait_for(self._run(work), self.timeout)
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=504, detail=f"Generation timed out after {self.timeout:g}s."
+            )
+        finally:
+            self._pending -= 1
+
+    async def _run(self, work: Callable[[], Awaitable[T]]) -> T:
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            result = await work()
+            elapsed = loop.time() - started
+            average = self._average_seconds
+            self._average_seconds = elapsed if average is None else 0.8 * average + 0.2 * elapsed
+            return result
+
+
+async def run_until_disconnected(request: Request, work: Awaitable[T]) -> T:
+    """Await ``work``, cancelling it if the client disconnects first."""
+    task = asyncio.ensure_future(work)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                task.cancel()
+                # 499 (client closed request) is never seen by the client; it
+                # only ends the handler and shows up in access logs.
+                raise HTTPException(status_code=499, detail="Client disconnected.")
+    finally:
+        if not task.done():
+            task.cancel()
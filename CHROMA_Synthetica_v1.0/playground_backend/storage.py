@@ -1,75 +1,445 @@
 """
-Lightweight persistence layer for the playground backend.
+Persistence layer for the playground backend.
+
+Sessions live in a SQLite database in WAL mode: inserts and likes are
+single-row writes, history queries walk the ``created_at`` / ``liked``
+indexes, and several uvicorn workers can write concurrently (SQLite
+serialises writers; readers never block). Each thread keeps its own
+connection.
+
+History queries are paginated with an opaque keyset cursor (``before``),
+filterable by theme, tags, case_id and liked, and by default return a
+summary projection read from indexed columns only; the large
+``blueprint``/``prompts``/``payload`` body is decoded only when ``full``.
+
+The legacy ``prompt_history.json`` is imported once, the first time the
+store is opened, and renamed to ``prompt_history.json.imported``. Run
+``python -m playground_backend.storage --import FILE`` to import another
+export by hand.
 """
 
 from __future__ import annotations
 
+import argparse
+import base64
+import binascii
 import json
+import os
+import sqlite3
+import threading
 import uuid
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from fastapi import HTTPException
 
 DATA_DIR = Path(__file__).resolve().parent / "data"
 HISTORY_PATH = DATA_DIR / "prompt_history.json"
+DB_PATH = Path(os.getenv("SYNTHETICA_PLAYGROUND_DB", str(DATA_DIR / "prompt_history.sqlite3")))
+BUSY_TIMEOUT_SECONDS = 30.0
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
 
+# Statements applied to reach each schema version (tracked in PRAGMA user_version).
+_MIGRATIONS: Dict[int, Sequence[str]] = {
+    1: (
+        """CREATE TABLE IF NOT EXISTS sessions (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            id TEXT NOT NULL UNIQUE,
+            created_at TEXT NOT NULL,
+            liked INTEGER NOT NULL DEFAULT 0,
+            body TEXT NOT NULL
+        )""",
+        "CREATE INDEX IF NOT EXISTS sessions_created ON sessions (created_at DESC, seq DESC)",
+        "CREATE INDEX IF NOT EXISTS sessions_liked ON sessions (liked, created_at DESC, seq DESC)",
+    ),
+    2: (
+        "ALTER TABLE sessions ADD COLUMN brief TEXT NOT NULL DEFAULT ''",
+        "ALTER TABLE sessions ADD COLUMN theme TEXT NOT NULL DEFAULT ''",
+        "ALTER TABLE sessions ADD COLUMN model_name TEXT NOT NULL DEFAULT ''",
+        "ALTER TABLE sessions ADD COLUMN case_id TEXT",
+        "ALTER TABLE sessions ADD COLUMN tags TEXT NOT NULL DEFAULT '[]'",
+        """CREATE TABLE IF NOT EXISTS session_tags (
+            tag TEXT NOT NULL,
+            seq INTEGER NOT NULL REFERENCES sessions (seq),
+            PRIMARY KEY (tag, seq)
+        ) WITHOUT ROWID""",
+        "CREATE INDEX IF NOT EXISTS sessions_theme ON sessions (theme, created_at DESC, seq DESC)",
+        "CREATE INDEX IF NOT EXISTS sessions_case ON sessions (case_id, created_at DESC, seq DESC)",
+    ),
+    # Background generation jobs (see playground_backend.jobs).
+    3: (
+        """CREATE TABLE IF NOT EXISTS jobs (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            id TEXT NOT NULL UNIQUE,
+            status TEXT NOT NULL,
+            request TEXT NOT NULL,
+            created_at TEXT NOT NULL,
+            started_at TEXT,
+            finished_at TEXT,
+            heartbeat REAL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            session_id TEXT,
+            error TEXT
+        )""",
+        "CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, seq)",
+        """CREATE TABLE IF NOT EXISTS job_events (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            job_id TEXT NOT NULL,
+            stage TEXT NOT NULL,
+            detail TEXT NOT NULL,
+            at TEXT NOT NULL
+        )""",
+        "CREATE INDEX IF NOT EXISTS job_events_job ON job_events (job_id, seq)",
+    ),
+}
+SCHEMA_VERSION = max(_MIGRATIONS)
+
+# Summary fields, stored in their own columns; ``body`` holds the rest as JSON.
+_SUMMARY_COLUMNS = ("id", "created_at", "liked", "brief", "theme", "model_name", "case_id", "tags")
+_SUMMARY_SELECT = "seq, " + ", ".join(_SUMMARY_COLUMNS)
+_FULL_SELECT = _SUMMARY_SELECT + ", body"
+
+
+@dataclass
+class SessionPage:
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None  # pass as ``before`` to fetch the next page
+
+
+class SessionStore:
+    """SQLite-backed session history; safe to share across threads and processes."""
+
+    def __init__(self, path: Path = DB_PATH, legacy_path: Optional[Path] = HISTORY_PATH):
+        self.path = Path(path)
+        self.legacy_path = legacy_path
+        self._local = threading.local()
+        self._init_lock = threading.Lock()
+        self._initialised = False
+
+    # ------------------------------------------------------------------ #
+    # Queries
+    # ------------------------------------------------------------------ #
+    def list_history(self, liked_only: bool = False) -> List[Dict[str, Any]]:
+        """All sessions with their full body, newest first."""
+        where = "WHERE liked = 1 " if liked_only else ""
+        rows = self.connection().execute(
+            f"SELECT {_FULL_SELECT} FROM sessions {where}ORDER BY created_at DESC, seq DESC"
+        )
+        return [_entry(row) for row in rows]
+
+    def query(
+        self,
+        limit: int = DEFAULT_PAGE_SIZE,
+        before: Optional[str] = None,
+        theme: Optional[str] = None,
+        tags: Sequence[str] = (),
+        case_id: Optional[str] = None,
+        liked: Optional[bool] = None,
+        full: bool = False,
+    ) -> SessionPage:
+        """
+        One page of sessions, newest first (insertion order breaks
+        created_at ties). ``tags`` matches sessions carrying all of them.
+        Every filter is served by an index on (filter, created_at, seq).
+        """
+        clauses: List[str] = []
+        params: List[Any] = []
+        if before:
+            clauses.append("(created_at, seq) < (?, ?)")
+            params.extend(_decode_cursor(before))
+        if theme is not None:
+            clauses.append("theme = ?")
+            params.append(theme)
+        if case_id is not None:
+            clauses.append("case_id = ?")
+            params.append(case_id)
+        if liked is not None:
+            clauses.append("liked = ?")
+            params.append(int(liked))
+        for tag in dict.fromkeys(tags):
+            clauses.append("seq IN (SELECT seq FROM session_tags WHERE tag = ?)")
+            params.append(tag)
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        rows = self.connection().execute(
+            f"SELECT {_FULL_SELECT if full else _SUMMARY_SELECT} FROM sessions "
+            f"{where}ORDER BY created_at DESC, seq DESC LIMIT ?",
+            (*params, limit + 1),
+        ).fetchall()
+        next_cursor = _encode_cursor(rows[limit - 1]) if len(rows) > limit else None
+        return SessionPage([_entry(row) for row in rows[:limit]], next_cursor)
+
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        row = (
+            self.connection()
+            .execute(f"SELECT {_FULL_SELECT} FROM sessions WHERE id = ?", (session_id,))
+            .fetchone()
+        )
+        return _entry(row) if row is not None else None
+
+    # ------------------------------------------------------------------ #
+    # Writes
+    # ------------------------------------------------------------------ #
+    def add_session(
+        self, session: Dict[str, Any], connection: Optional[sqlite3.Connection] = None
+    ) -> Dict[str, Any]:
+        """Store a new session; pass ``connection`` to join an open ``transaction``."""
+        entry = {
+            "id": str(uuid.uuid4()),
+            "created_at": datetime.utcnow().isoformat(),
+            "liked": False,
+            **session,
+        }
+        if connection is not None:
+            self._insert(connection, [entry])
+            return entry
+        with self.transaction() as connection:
+            self._insert(connection, [entry])
+        return entry
+
+    def set_like(self, session_id: str, liked: bool) -> Dict[str, Any]:
+        with self.transaction() as connection:
+            updated = connection.execute(
+                "UPDATE sessions SET liked = ? WHERE id = ?", (int(liked), session_id)
+            ).rowcount
+        if not updated:
+            raise HTTPException(status_code=404, detail="Session not found.")
+        entry = self.get(session_id)
+        if entry is None:  # deleted by another writer in between
+            raise HTTPException(status_code=404, detail="Session not found.")
+        return entry
+
+    def import_entries(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """
+        Insert exported entries, skipping ids already stored; returns how many
+        were new. Entries without an id get one derived from their content, so
+        importing the same export twice (or concurrently) stores them once.
+        """
+        prepared = [
+            {"id": _content_id(entry), "created_at": "", "liked": False, **entry}
+            for entry in entries
+            if isinstance(entry, dict)
+        ]
+        with self.transaction() as connection:
+            return self._insert(connection, prepared, ignore_existing=True)
+
+    def import_json_file(self, path: Path) -> int:
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except json.JSONDecodeError as exc:
+            raise HTTPException(status_code=500, detail=f"Invalid history file: {exc}")
+        return self.import_entries(data if isinstance(data, list) else [])
+
+    # ------------------------------------------------------------------ #
+    # Connections
+    # ------------------------------------------------------------------ #
+    def connection(self) -> sqlite3.Connection:
+        """This thread's connection (autocommit; see ``transaction`` for writes)."""
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Autocommit mode: transactions are opened explicitly in transaction().
+            connection = sqlite3.connect(
+                self.path, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+            self._initialise(connection)
+        return connection
+
+    def transaction(self) -> "_WriteTransaction":
+        """``with store.transaction() as connection:`` runs one atomic write."""
+        return _WriteTransaction(self.connection())
+
+    def _initialise(self, connection: sqlite3.Connection) -> None:
+        with self._init_lock:
+            if self._initialised:
+                return
+            with _WriteTransaction(connection):
+                version = connection.execute("PRAGMA user_version").fetchone()[0]
+                for target in range(version + 1, SCHEMA_VERSION + 1):
+                    for statement in _MIGRATIONS[target]:
+                        connection.execute(statement)
+                    if target == 2 and version >= 1:
+                        _split_summary_columns(connection)
+                if version < SCHEMA_VERSION:
+                    connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._initialised = True
+        self._import_legacy()
+
+    def _import_legacy(self) -> None:
+        legacy = self.legacy_path
+        if legacy is None or not legacy.exists():
+            return
+        self.import_json_file(legacy)
+        try:
+            legacy.rename(legacy.with_name(legacy.name + ".imported"))
+        except FileNotFoundError:
+            pass  # another worker imported and renamed it first
+
+    @staticmethod
+    def _insert(
+        connection: sqlite3.Connection,
+        entries: Sequence[Dict[str, Any]],
+        ignore_existing: bool = False,
+    ) -> int:
+        inserted = 0
+        verb = "INSERT OR IGNORE" if ignore_existing else "INSERT"
+        columns = ", ".join(_SUMMARY_COLUMNS)
+        placeholders = ", ".join("?" * (len(_SUMMARY_COLUMNS) + 1))
+        for entry in entries:
+            cursor = connection.execute(
+                f"{verb} INTO sessions ({columns}, body) VALUES ({placeholders})",
+                _row_values(entry),
+            )
+            if cursor.rowcount:
+                inserted += 1
+                _index_tags(connection, cursor.lastrowid, entry.get("tags"))
+        return inserted
+
+
+class _WriteTransaction:
+    """``BEGIN IMMEDIATE`` ... ``COMMIT``: takes the write lock up front so
+    concurrent writers queue on ``busy_timeout`` instead of failing mid-way."""
+
+    def __init__(self, connection: sqlite3.Connection):
+        self.connection = connection
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.connection.execute("BEGIN IMMEDIATE")
+        return self.connection
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.connection.execute("COMMIT" if exc_type is None else "ROLLBACK")
 
-def _load_entries() -> List[Dict[str, Any]]:
-    if not HISTORY_PATH.exists():
-        return []
-    try:
-        data = json.loads(HISTORY_PATH.read_text(encoding="utf-8"))
-    except json.JSONDecodeError as exc:
-        raise HTTPException(status_code=500, detail=f"Invalid history file: {exc}")
-    return data if isinstance(data, list) else []
+
+def _row_values(entry: Dict[str, Any]) -> Tuple[Any, ...]:
+    tags = entry.get("tags") or []
+    body = {key: value for key, value in entry.items() if key not in _SUMMARY_COLUMNS}
+    return (
+        str(entry["id"]),
+        str(entry.get("created_at") or ""),
+        int(bool(entry.get("liked"))),
+        str(entry.get("brief") or ""),
+        str(entry.get("theme") or ""),
+        str(entry.get("model_name") or ""),
+        entry.get("case_id"),
+        json.dumps(list(tags), ensure_ascii=False),
+        json.dumps(body, ensure_ascii=False),
+    )
+
+
+def _content_id(entry: Dict[str, Any]) -> str:
+    canonical = json.dumps(entry, sort_keys=True, ensure_ascii=False, default=str)
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, "synthetica-session:" + canonical))
 
 
-def _save_entries(entries: List[Dict[str, Any]]) -> None:
-    DATA_DIR.mkdir(parents=True, exist_ok=True)
-    HISTORY_PATH.write_text(
-        json.dumps(entries, indent=2, ensure_ascii=False),
-        encoding="utf-8",
+def _index_tags(connection: sqlite3.Connection, seq: int, tags: Any) -> None:
+    connection.executemany(
+        "INSERT OR IGNORE INTO session_tags (tag, seq) VALUES (?, ?)",
+        [(str(tag), seq) for tag in tags or ()],
     )
 
 
+def _split_summary_columns(connection: sqlite3.Connection) -> None:
+    """v1 -> v2: move summary fields out of ``body`` into their columns."""
+    rows = connection.execute("SELECT seq, id, created_at, liked, body FROM sessions").fetchall()
+    for seq, session_id, created_at, liked, body in rows:
+        entry = {**json.loads(body), "id": session_id, "created_at": created_at, "liked": liked}
+        values = _row_values(entry)
+        connection.execute(
+            "UPDATE sessions SET brief = ?, theme = ?, model_name = ?, case_id = ?, tags = ?, "
+            "body = ? WHERE seq = ?",
+            (*values[3:], seq),
+        )
+        _index_tags(connection, seq, entry.get("tags"))
+
+
+def _entry(row: Sequence[Any]) -> Dict[str, Any]:
+    """Session dict from a ``_SUMMARY_SELECT`` or ``_FULL_SELECT`` row."""
+    _, session_id, created_at, liked, brief, theme, model_name, case_id, tags = row[:9]
+    entry = {
+        "id": session_id,
+        "created_at": created_at,
+        "liked": bool(liked),
+        "brief": brief,
+        "theme": theme,
+        "model_name": model_name,
+        "case_id": case_id,
+        "tags": json.loads(tags),
+    }
+    if len(row) > 9:
+        entry.update(json.loads(row[9]))
+    return entry
+
+
+def _encode_cursor(row: Sequence[Any]) -> str:
+    seq, _, created_at = row[:3]
+    raw = json.dumps([created_at, seq]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, seq = json.loads(raw)
+        if not isinstance(created_at, str) or not isinstance(seq, int):
+            raise ValueError(cursor)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor.")
+    return created_at, seq
+
+
+_store: Optional[SessionStore] = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> SessionStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SessionStore()
+    return _store
+
+
 def list_history() -> List[Dict[str, Any]]:
     """Return history sorted by creation date (descending)."""
-    entries = _load_entries()
-    return sorted(entries, key=lambda item: item.get("created_at", ""), reverse=True)
+    return get_store().list_history()
 
 
 def list_references() -> List[Dict[str, Any]]:
-    return [entry for entry in list_history() if entry.get("liked")]
+    return get_store().list_history(liked_only=True)
+
+
+def query_sessions(**filters: Any) -> SessionPage:
+    """Paginated, filtered history; see ``SessionStore.query``."""
+    return get_store().query(**filters)
 
 
 def add_session(session: Dict[str, Any]) -> Dict[str, Any]:
-    entries = _load_entries()
-    now_iso = datetime.utcnow().isoformat()
-    entry = {
-        "id": str(uuid.uuid4()),
-        "created_at": now_iso,
-        "liked": False,
-        **session,
-    }
-    entries.append(entry)
-    _save_entries(entries)
-    return entry
+    return get_store().add_session(session)
 
 
 def set_like(session_id: str, liked: bool) -> Dict[str, Any]:
-    entries = _load_entries()
-    updated: Optional[Dict[str, Any]] = None
-    for entry in entries:
-        if entry.get("id") == session_id:
-            entry["liked"] = liked
-            updated = entry
-            break
+    return get_store().set_like(session_id, liked)
+
 
-    if updated is None:
-        raise HTTPException(status_code=404, detail="Session not found.")
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Playground session store maintenance.")
+    parser.add_argument(
+        "--import", dest="import_path", type=Path, required=True,
+        help="JSON history export (a list of sessions) to import.",
+    )
+    args = parser.parse_args(argv)
+    imported = SessionStore(legacy_path=None).import_json_file(args.import_path)
+    print(f"Imported {imported} session(s) into {DB_PATH}.")
+    return 0
 
-    _save_entries(entries)
-    return updated
 
+if __name__ == "__main__":
+    raise SystemExit(main())
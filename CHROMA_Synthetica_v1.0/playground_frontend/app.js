@@ -117,12 +117,25 @@ function showStatus(message, type = "info") {
   elements.status.dataset.statusType = type;
 }
 
+async function fetchAllPages(path) {
+  // Segue o next_cursor ate a ultima pagina (a API pagina /history e /references).
+  const items = [];
+  let cursor = null;
+  do {
+    const params = new URLSearchParams({ limit: "200" });
+    if (cursor) params.set("before", cursor);
+    const res = await fetch(`${API_BASE}${path}?${params}`);
+    if (!res.ok) throw new Error(`Falha ao obter ${path}.`);
+    const data = await res.json();
+    items.push(...(data.items || []));
+    cursor = data.next_cursor;
+  } while (cursor);
+  return items;
+}
+
 async function fetchHistory() {
   try {
-    const res = await fetch(`${API_BASE}/history`);
-    if (!res.ok) throw new Error("Falha ao obter historico.");
-    const data = await res.json();
-    state.history = data.items || [];
+    state.history = await fetchAllPages("/history");
   } catch (error) {
     console.warn(error.message);
     state.history = [];
@@ -131,10 +144,7 @@ async function fetchHistory() {
 
 async function fetchReferences() {
   try {
-    const res = await fetch(`${API_BASE}/references`);
-    if (!res.ok) throw new Error("Falha ao obter referencias.");
-    const data = await res.json();
-    state.references = data.items || [];
+    state.references = await fetchAllPages("/references");
   } catch (error) {
     console.warn(error.message);
     state.references = [];
@@ -144,10 +154,9 @@ async function fetchReferences() {
 function renderHistory() {
   const template = document.getElementById("prompt-card-template");
   elements.historyList.innerHTML = "";
-  let items = state.history;
-  if (state.activeHistoryTab === "liked") {
-    items = items.filter((item) => item.liked);
-  }
+  // A aba de curtidas usa /references (liked=true no servidor).
+  const items =
+    state.activeHistoryTab === "liked" ? state.references : state.history;
 
   if (!items.length) {
     elements.historyList.innerHTML =
@@ -9,6 +9,7 @@ ROOT_DIR = Path(__file__).resolve().parent.parent
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
+from synthetica.logging_config import configure_logging
 from synthetica.services.git_service import GitService
 
 
@@ -52,7 +53,18 @@ class AutonomousCurator:
             (
                 "7.0_Model_Translation_Layer_Profiles."
                 "Model_Capability_Profiles.Stable_Diffusion_4"
-            ): {"Rhetoric": "Direct Visual Instruction"}
+            ): {
+                "Rhetoric": "Direct Visual Instruction",
+                "Prompt_Template": {
+                    "joiner": ". ",
+                    "segments": [
+                        "Show {core_concept}",
+                        {"text": "Style: {style}", "when": ["style"]},
+                        {"text": "Framing: {composition}", "when": ["composition"]},
+                        {"text": "Capture: {technical}", "when": ["technical"]},
+                    ],
+                },
+            }
         }
         summary = (
             "Identificado novo modelo SD4. Retorica predominante: "
@@ -134,5 +146,6 @@ class AutonomousCurator:
 
 
 if __name__ == "__main__":
+    configure_logging()
     curator = AutonomousCurator()
     curator.run_cycle()
@@ -6,15 +6,18 @@ import argparse
 from typing import Dict, Any
 import os
 
-# Tenta importar jsonschema, lida graciosamente se nao estiver disponivel
-try:
-    from jsonschema import validate, ValidationError
-    JSONSCHEMA_AVAILABLE = True
-except ImportError:
-    print("WARNING: 'jsonschema' nao encontrado. A validacao estrutural sera ignorada.")
-    print("Instale com 'pip install jsonschema' para validacao completa.\n")
-    JSONSCHEMA_AVAILABLE = False
-    ValidationError = Exception  # Define dummy exception
+def _load_jsonschema():
+    """
+    Importa jsonschema sob demanda (so a validacao estrutural precisa dele).
+    Retorna None, com aviso, se nao estiver disponivel.
+    """
+    try:
+        import jsonschema
+    except ImportError:
+        print("WARNING: 'jsonschema' nao encontrado. A validacao estrutural sera ignorada.")
+        print("Instale com 'pip install jsonschema' para validacao completa.\n")
+        return None
+    return jsonschema
 
 # Define o caminho para o arquivo de esquema (relativo a raiz do projeto)
 # Assumimos que o script e executado a partir da raiz do projeto.
@@ -28,7 +31,8 @@ class ValidationPipeline:
         self.kb_path = kb_path
         # Carrega os dados da KB e do Schema (Sai se falhar - critico para CI/CD)
         self.kb_data = self._load_json(kb_path)
-        self.schema_data = self._load_json(SCHEMA_PATH) if JSONSCHEMA_AVAILABLE else None
+        self.jsonschema = _load_jsonschema()
+        self.schema_data = self._load_json(SCHEMA_PATH) if self.jsonschema else None
         
         self.tests_passed = 0
         self.tests_failed = 0
@@ -81,14 +85,14 @@ class ValidationPipeline:
 
     def test_schema_validation(self):
         """Camada 1: Verifica se o JSON esta em conformidade com o esquema formal."""
-        if not JSONSCHEMA_AVAILABLE:
+        if self.jsonschema is None:
             print("SKIP: Validacao de Esquema JSON (jsonschema nao instalado)")
             return
 
         try:
-            validate(instance=self.kb_data, schema=self.schema_data)
+            self.jsonschema.validate(instance=self.kb_data, schema=self.schema_data)
             self._report_test("Validacao de Esquema JSON (Estrutural)", True)
-        except ValidationError as e:
+        except self.jsonschema.ValidationError as e:
             # Fornece detalhes uteis sobre onde a validacao falhou
             path = ".".join(map(str, e.path)) or "Root"
             self._report_test("Validacao de Esquema JSON (Estrutural)", False, f"Violacao no caminho '{path}': {e.message}")
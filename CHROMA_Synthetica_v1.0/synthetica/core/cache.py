@@ -0,0 +1,120 @@
+"""Bounded memo layer shared by the KnowledgeBroker caches."""
+
+from __future__ import annotations
+
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+MISSING = object()
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """Limits applied to the broker memo layer (``None`` disables a limit)."""
+
+    max_entries: Optional[int] = 2048
+    max_bytes: Optional[int] = 16 * 1024 * 1024
+    ttl_seconds: Optional[float] = None
+    negative_max_entries: int = 512
+    derived_max_entries: int = 128
+
+
+def approximate_size(value: Any) -> int:
+    """Shallow size estimate: the container plus its direct items."""
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(sys.getsizeof(item) for item in value)
+    elif isinstance(value, dict):
+        size += sum(sys.getsizeof(k) + sys.getsizeof(v) for k, v in value.items())
+    return size
+
+
+class LRUCache:
+    """Least-recently-used cache with optional byte budget and TTL."""
+
+    def __init__(
+        self,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        # key -> (value, size, stored_at)
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not MISSING
+
+    @property
+    def bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value or ``MISSING``; refreshes recency on hit."""
+        record = self._entries.get(key)
+        if record is None:
+            return MISSING
+        value, _, stored_at = record
+        if self.ttl_seconds is not None and self._clock() - stored_at > self.ttl_seconds:
+            self._discard(key)
+            self.expirations += 1
+            return MISSING
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: Any, size: Optional[int] = None) -> None:
+        if size is None:
+            size = approximate_size(value) + sys.getsizeof(key)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._discard(key)
+        self._entries[key] = (value, size, self._clock())
+        self._bytes += size
+        self._enforce_limits()
+
+    def evict_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every entry whose key satisfies ``predicate``."""
+        stale = [key for key in self._entries if predicate(key)]
+        for key in stale:
+            self._discard(key)
+        self.evictions += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "bytes": self._bytes,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _discard(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _enforce_limits(self) -> None:
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+            self.evictions += 1
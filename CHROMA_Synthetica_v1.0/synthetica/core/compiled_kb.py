@@ -0,0 +1,386 @@
+"""
+Compiled, memory-mapped KB artifacts.
+
+The JSON knowledge base stays the source of truth. ``open_compiled_kb``
+compiles it once into a binary artifact next to the source
+(``kb/.compiled/<name>.skb``) and memory-maps it; mappings are decoded only
+when first accessed, so startup cost and resident memory follow what a
+process actually reads instead of the total KB size. The artifact is rebuilt
+automatically when the source's mtime/size change and its SHA-256 differs.
+
+Layout (little endian)::
+
+    header   magic, source sha256, source mtime_ns, source size,
+             string table offset, path table offset, root reference
+    nodes    mapping: u32 count, count x (u32 key id, ref)
+             list:    u32 count, count x ref
+    strings  u32 count, count x (u32 offset, u32 length), UTF-8 blob
+    paths    u32 count, count x (u32 path string id, ref), sorted by path bytes
+
+A ``ref`` is a one-byte tag plus an eight-byte payload (int, float, string
+id or node offset), so every child can be located without parsing siblings.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from synthetica.core.cache import MISSING
+from synthetica.core.snapshot import (
+    FrozenList,
+    FrozenNode,
+    KBSnapshot,
+    _classify,
+    _index_subtree,
+)
+
+MAGIC = b"SKB1"
+COMPILED_DIRNAME = ".compiled"
+
+_HEADER = struct.Struct("<4s32sqqQQB8s")
+_COUNT = struct.Struct("<I")
+_REF = struct.Struct("<B8s")
+_MAP_ITEM = struct.Struct("<I B8s")
+_SPAN = struct.Struct("<II")
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+_OFFSET = struct.Struct("<Q")
+
+_NULL, _FALSE, _TRUE, _INT_TAG, _FLOAT_TAG, _STR, _MAP, _LIST, _JSON = range(9)
+_ZERO = bytes(8)
+
+
+class CompiledKB:
+    """Read-only view over a memory-mapped KB artifact."""
+
+    def __init__(self, artifact_path: Union[str, Path]) -> None:
+        self.path = Path(artifact_path)
+        with self.path.open("rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (
+                magic,
+                self.source_sha256,
+                self.source_mtime_ns,
+                self.source_size,
+                strings_offset,
+                self._paths_offset,
+                root_tag,
+                root_payload,
+            ) = _HEADER.unpack_from(self._mmap, 0)
+            if magic != MAGIC:
+                raise ValueError(f"{self.path} is not a compiled KB artifact.")
+        except BaseException:
+            self._mmap.close()
+            raise
+        self._root_ref = (root_tag, root_payload)
+        (self._string_count,) = _COUNT.unpack_from(self._mmap, strings_offset)
+        self._spans_offset = strings_offset + _COUNT.size
+        self._blob_offset = self._spans_offset + self._string_count * _SPAN.size
+        (self._path_count,) = _COUNT.unpack_from(self._mmap, self._paths_offset)
+        # Decoded values are memoised per offset/id, so memory tracks usage.
+        self._strings: Dict[int, str] = {}
+        self._nodes: Dict[int, Any] = {}
+
+    @property
+    def content_hash(self) -> str:
+        return self.source_sha256.hex()
+
+    @property
+    def closed(self) -> bool:
+        return self._mmap.closed
+
+    def close(self) -> None:
+        """
+        Unmap the artifact. Values already decoded stay usable; lazy nodes
+        and paths not read yet can no longer be resolved.
+        """
+        self._mmap.close()
+
+    def __enter__(self) -> "CompiledKB":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def root(self) -> Any:
+        return self._decode(*self._root_ref)
+
+    def snapshot(self) -> KBSnapshot:
+        """Lazy snapshot whose index falls back to the artifact's path table."""
+        return KBSnapshot.lazy(self.root(), self.lookup)
+
+    def lookup(self, path: str) -> Any:
+        """Binary-search the path table; returns ``MISSING`` when absent."""
+        target = path.encode("utf-8")
+        entry_size = _MAP_ITEM.size
+        base = self._paths_offset + _COUNT.size
+        low, high = 0, self._path_count
+        while low < high:
+            mid = (low + high) // 2
+            path_id, tag, payload = _MAP_ITEM.unpack_from(self._mmap, base + mid * entry_size)
+            candidate = self._string_bytes(path_id)
+            if candidate < target:
+                low = mid + 1
+            elif candidate > target:
+                high = mid
+            else:
+                return self._decode(tag, payload)
+        return MISSING
+
+    # ------------------------------------------------------------------ #
+    # Decoding
+    # ------------------------------------------------------------------ #
+    def _string_bytes(self, string_id: int) -> bytes:
+        offset, length = _SPAN.unpack_from(self._mmap, self._spans_offset + string_id * _SPAN.size)
+        start = self._blob_offset + offset
+        return self._mmap[start : start + length]
+
+    def _string(self, string_id: int) -> str:
+        value = self._strings.get(string_id)
+        if value is None:
+            value = self._strings[string_id] = self._string_bytes(string_id).decode("utf-8")
+        return value
+
+    def _decode(self, tag: int, payload: bytes) -> Any:
+        if tag == _STR:
+            return self._string(_OFFSET.unpack(payload)[0])
+        if tag == _MAP or tag == _LIST:
+            offset = _OFFSET.unpack(payload)[0]
+            node = self._nodes.get(offset)
+            if node is None:
+                node = LazyNode(self, offset) if tag == _MAP else self._decode_list(offset)
+                self._nodes[offset] = node
+            return node
+        if tag == _NULL:
+            return None
+        if tag == _FALSE:
+            return False
+        if tag == _TRUE:
+            return True
+        if tag == _INT_TAG:
+            return _INT.unpack(payload)[0]
+        if tag == _FLOAT_TAG:
+            return _FLOAT.unpack(payload)[0]
+        if tag == _JSON:
+            return json.loads(self._string(_OFFSET.unpack(payload)[0]))
+        raise ValueError(f"Corrupt KB artifact {self.path}: unknown tag {tag}.")
+
+    def _decode_list(self, offset: int) -> FrozenList:
+        (count,) = _COUNT.unpack_from(self._mmap, offset)
+        start = offset + _COUNT.size
+        return FrozenList(
+            self._decode(*_REF.unpack_from(self._mmap, start + i * _REF.size))
+            for i in range(count)
+        )
+
+    def _decode_mapping(self, offset: int) -> Dict[str, Any]:
+        (count,) = _COUNT.unpack_from(self._mmap, offset)
+        start = offset + _COUNT.size
+        data: Dict[str, Any] = {}
+        for i in range(count):
+            key_id, tag, payload = _MAP_ITEM.unpack_from(self._mmap, start + i * _MAP_ITEM.size)
+            data[self._string(key_id)] = self._decode(tag, payload)
+        return data
+
+
+class LazyNode(FrozenNode):
+    """FrozenNode whose children are decoded from the artifact on first access."""
+
+    __slots__ = ("_store", "_offset")
+
+    def __init__(self, store: CompiledKB, offset: int) -> None:
+        self._store = store
+        self._offset = offset
+
+    def __getattr__(self, name: str) -> Any:
+        # Only reached while the inherited slots are still unset.
+        if name == "_data":
+            data = self._store._decode_mapping(self._offset)
+            self._data = data
+            return data
+        if name == "is_entity_lexicon":
+            flag = _classify(self._data)
+            self.is_entity_lexicon = flag
+            return flag
+        raise AttributeError(name)
+
+    def __repr__(self) -> str:
+        return f"LazyNode(offset={self._offset})"
+
+
+# ---------------------------------------------------------------------- #
+# Compilation
+# ---------------------------------------------------------------------- #
+
+
+class _Writer:
+    def __init__(self) -> None:
+        self.body = bytearray()
+        self.string_ids: Dict[str, int] = {}
+        # id(container) -> ref, so the path table points at the node bodies
+        # already written instead of serialising subtrees again.
+        self.container_refs: Dict[int, Tuple[int, bytes]] = {}
+
+    def intern(self, value: str) -> int:
+        string_id = self.string_ids.get(value)
+        if string_id is None:
+            string_id = self.string_ids[value] = len(self.string_ids)
+        return string_id
+
+    def encode(self, value: Any) -> Tuple[int, bytes]:
+        if value is None:
+            return _NULL, _ZERO
+        if value is True:
+            return _TRUE, _ZERO
+        if value is False:
+            return _FALSE, _ZERO
+        if isinstance(value, str):
+            return _STR, _OFFSET.pack(self.intern(value))
+        if isinstance(value, int):
+            if -(2**63) <= value < 2**63:
+                return _INT_TAG, _INT.pack(value)
+            return _JSON, _OFFSET.pack(self.intern(json.dumps(value)))
+        if isinstance(value, float):
+            return _FLOAT_TAG, _FLOAT.pack(value)
+        cached = self.container_refs.get(id(value))
+        if cached is not None:
+            return cached
+        if isinstance(value, Mapping):
+            items = [(self.intern(key), *self.encode(item)) for key, item in value.items()]
+            offset = self._append(_COUNT.pack(len(items)))
+            for key_id, tag, payload in items:
+                self.body += _MAP_ITEM.pack(key_id, tag, payload)
+            ref = self.container_refs[id(value)] = (_MAP, _OFFSET.pack(offset))
+            return ref
+        if isinstance(value, (list, tuple)):
+            refs = [self.encode(item) for item in value]
+            offset = self._append(_COUNT.pack(len(refs)))
+            for tag, payload in refs:
+                self.body += _REF.pack(tag, payload)
+            ref = self.container_refs[id(value)] = (_LIST, _OFFSET.pack(offset))
+            return ref
+        raise TypeError(f"Unsupported KB value type: {type(value).__name__}")
+
+    def _append(self, chunk: bytes) -> int:
+        offset = _HEADER.size + len(self.body)
+        self.body += chunk
+        return offset
+
+
+def compile_kb(source: Union[str, Path], artifact: Union[str, Path]) -> Path:
+    """Compile a JSON KB into a binary artifact (written atomically)."""
+    source, artifact = Path(source), Path(artifact)
+    raw = source.read_bytes()
+    stat = source.stat()
+    kb_data = json.loads(raw.decode("utf-8"))
+
+    writer = _Writer()
+    root_tag, root_payload = writer.encode(kb_data)
+
+    index: Dict[str, Any] = {}
+    _index_subtree(index, "", kb_data)
+    path_refs = [(path.encode("utf-8"), path, value) for path, value in index.items()]
+    path_refs.sort(key=lambda item: item[0])
+    path_items = [(writer.intern(path), *writer.encode(value)) for _, path, value in path_refs]
+
+    strings: List[bytes] = [value.encode("utf-8") for value in writer.string_ids]
+    strings_offset = _HEADER.size + len(writer.body)
+    table = bytearray(_COUNT.pack(len(strings)))
+    position = 0
+    for encoded in strings:
+        table += _SPAN.pack(position, len(encoded))
+        position += len(encoded)
+    table += b"".join(strings)
+
+    paths_offset = strings_offset + len(table)
+    paths = bytearray(_COUNT.pack(len(path_items)))
+    for path_id, tag, payload in path_items:
+        paths += _MAP_ITEM.pack(path_id, tag, payload)
+
+    header = _HEADER.pack(
+        MAGIC,
+        hashlib.sha256(raw).digest(),
+        stat.st_mtime_ns,
+        stat.st_size,
+        strings_offset,
+        paths_offset,
+        root_tag,
+        root_payload,
+    )
+
+    artifact.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=artifact.parent, prefix=artifact.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(header)
+            handle.write(writer.body)
+            handle.write(table)
+            handle.write(paths)
+        os.replace(tmp_name, artifact)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return artifact
+
+
+def artifact_path_for(source: Union[str, Path]) -> Path:
+    source = Path(source)
+    return source.parent / COMPILED_DIRNAME / f"{source.name}.skb"
+
+
+def open_compiled_kb(
+    source: Union[str, Path], artifact: Optional[Union[str, Path]] = None
+) -> CompiledKB:
+    """
+    Open the compiled artifact for ``source``, (re)compiling it when stale.
+    Freshness is checked via mtime/size first and confirmed by SHA-256.
+    """
+    source = Path(source)
+    artifact = Path(artifact) if artifact else artifact_path_for(source)
+    stat = source.stat()
+
+    if artifact.exists():
+        try:
+            compiled = CompiledKB(artifact)
+        except (ValueError, struct.error, OSError):
+            compiled = None
+        if compiled is not None:
+            if (compiled.source_mtime_ns, compiled.source_size) == (stat.st_mtime_ns, stat.st_size):
+                return compiled
+            unchanged = compiled.source_sha256 == hashlib.sha256(source.read_bytes()).digest()
+            compiled.close()
+            if unchanged:
+                _touch_header(artifact, stat)
+                return CompiledKB(artifact)
+
+    compile_kb(source, artifact)
+    return CompiledKB(artifact)
+
+
+def _touch_header(artifact: Path, stat: os.stat_result) -> None:
+    """
+    Record a new source mtime/size for an artifact whose content still matches.
+
+    Other processes may have the artifact mapped, so it is never patched in
+    place: the updated copy replaces it atomically (their mapping keeps the
+    old inode).
+    """
+    data = bytearray(artifact.read_bytes())
+    struct.pack_into("<qq", data, 4 + 32, stat.st_mtime_ns, stat.st_size)
+    fd, tmp_name = tempfile.mkstemp(dir=artifact.parent, prefix=artifact.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp_name, artifact)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
@@ -1,10 +1,15 @@
 """Phase 1 (reasoning) compiler for the CHROMA Synthetica pipeline."""
 
+import logging
 from typing import Any, Dict, List, Optional
 
 from synthetica.core.knowledge_broker import KnowledgeBroker
 from synthetica.core.models import AbstractCreativeObject, IntermediateTechnicalIntent
 from synthetica.engines.operators import OperatorsEngine
+from synthetica.engines.planner import PipelinePlanner
+from synthetica.tracing import span
+
+LOGGER = logging.getLogger(__name__)
 
 
 class NexusCompiler:
@@ -13,7 +18,8 @@ class NexusCompiler:
     def __init__(self, broker: KnowledgeBroker):
         self.broker = broker
         self.operators_engine = OperatorsEngine(broker)
-        print("[NexusCompiler] Phase 1 (Reasoning) initialised.")
+        self.planner = PipelinePlanner(self.operators_engine)
+        LOGGER.debug("[NexusCompiler] Phase 1 (Reasoning) initialised.")
 
     def compile_to_iti(
         self,
@@ -21,24 +27,30 @@ class NexusCompiler:
         operator_pipeline: Optional[List[Dict[str, Any]]] = None,
     ) -> IntermediateTechnicalIntent:
         """Run the operator pipeline and project the ACO into an ITI."""
-        print("[NexusCompiler] Phase 1: compiling AbstractCreativeObject.")
+        with span("compile_to_iti", "phase1"):
+            return self._compile(aco, operator_pipeline)
+
+    def _compile(
+        self,
+        aco: AbstractCreativeObject,
+        operator_pipeline: Optional[List[Dict[str, Any]]],
+    ) -> IntermediateTechnicalIntent:
+        LOGGER.debug("[NexusCompiler] Phase 1: compiling AbstractCreativeObject.")
         iti = IntermediateTechnicalIntent(source_aco_id=aco.aco_id)
 
         pipeline = operator_pipeline or []
         if pipeline:
+            # Validated, bound and deduplicated once per pipeline (cached).
+            plan = self.planner.plan(pipeline)
             iti.reasoning_chain.append("Operator pipeline started.")
-            for operator_spec in pipeline:
-                op_name = operator_spec.get("name")
-                op_params = operator_spec.get("params", {})
-                if not op_name:
-                    continue
-                self.operators_engine.apply(op_name, aco, iti, op_params)
-
-        self._translate_elements(aco, iti)
-        self._translate_intent(aco, iti)
-        self._define_technical_queries(aco, iti)
-
-        print("[NexusCompiler] Phase 1 completed. ITI generated.")
+            plan.run(aco, iti)
+
+        with span("project_aco", "phase1"):
+            self._translate_elements(aco, iti)
+            self._translate_intent(aco, iti)
+            self._define_technical_queries(aco, iti)
+
+        LOGGER.debug("[NexusCompiler] Phase 1 completed. ITI generated.")
         return iti
 
     def _translate_intent(
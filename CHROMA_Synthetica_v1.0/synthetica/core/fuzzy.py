@@ -0,0 +1,84 @@
+"""Indexed fuzzy matching that reproduces ``difflib.get_close_matches(n=1)``."""
+
+from __future__ import annotations
+
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+class FuzzyIndex:
+    """
+    Character inverted index over a fixed list of options.
+
+    ``difflib`` accepts a candidate only when ``ratio() >= cutoff`` and uses
+    ``quick_ratio()`` (shared character multiset) as a cheap upper bound. The
+    index computes that bound for every option sharing a character with the
+    query straight from posting lists, shortlists the options that can still
+    reach the cutoff and runs ``SequenceMatcher.ratio`` only on those, best
+    bound first, stopping as soon as no remaining bound can beat the current
+    best. Scores and tie-breaking are identical to ``difflib``.
+    """
+
+    def __init__(self, options: Iterable[str]) -> None:
+        self.options: List[str] = list(dict.fromkeys(options))
+        self._lengths: List[int] = [len(option) for option in self.options]
+        self._postings: Dict[str, List[Tuple[int, int]]] = {}
+        for position, option in enumerate(self.options):
+            for char, count in Counter(option).items():
+                self._postings.setdefault(char, []).append((position, count))
+
+    def __len__(self) -> int:
+        return len(self.options)
+
+    def best_match(self, query: str, cutoff: float = 0.6) -> Optional[str]:
+        if not 0.0 <= cutoff <= 1.0:
+            raise ValueError(f"cutoff must be in [0.0, 1.0]: {cutoff!r}")
+        if not self.options:
+            return None
+
+        shortlist = self._shortlist(query, cutoff)
+        matcher = SequenceMatcher()
+        matcher.set_seq2(query)
+        best: Optional[Tuple[float, str]] = None
+        for bound, position in shortlist:
+            if best is not None and bound < best[0]:
+                break
+            option = self.options[position]
+            matcher.set_seq1(option)
+            score = matcher.ratio()
+            if score >= cutoff and (best is None or (score, option) > best):
+                best = (score, option)
+        return best[1] if best else None
+
+    def best_matches(
+        self, queries: Sequence[str], cutoff: float = 0.6
+    ) -> List[Optional[str]]:
+        """Resolve many queries against the same index (duplicates run once)."""
+        resolved: Dict[str, Optional[str]] = {}
+        for query in queries:
+            if query not in resolved:
+                resolved[query] = self.best_match(query, cutoff)
+        return [resolved[query] for query in queries]
+
+    def _shortlist(self, query: str, cutoff: float) -> List[Tuple[float, int]]:
+        """Return ``(quick_ratio bound, position)`` pairs, best bound first."""
+        query_length = len(query)
+        shared: Dict[int, int] = {}
+        for char, wanted in Counter(query).items():
+            for position, available in self._postings.get(char, ()):
+                shared[position] = shared.get(position, 0) + min(wanted, available)
+
+        if cutoff <= 0.0 or query_length == 0:
+            positions: Iterable[int] = range(len(self.options))
+        else:
+            positions = shared
+
+        shortlist: List[Tuple[float, int]] = []
+        for position in positions:
+            total = query_length + self._lengths[position]
+            bound = 2.0 * shared.get(position, 0) / total if total else 1.0
+            if bound >= cutoff:
+                shortlist.append((bound, position))
+        shortlist.sort(key=lambda item: (item[0], self.options[item[1]]), reverse=True)
+        return shortlist
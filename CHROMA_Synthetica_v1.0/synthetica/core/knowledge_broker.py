@@ -1,15 +1,140 @@
-import difflib
-from typing import Any, Dict, List, Optional
+import logging
+import threading
+from collections.abc import Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple, Union
+
+from synthetica.core.cache import MISSING, CachePolicy, LRUCache
+from synthetica.core.fuzzy import FuzzyIndex
+from synthetica.core.snapshot import KBSnapshot, is_entity_lexicon
+
+_END = object()
+_READ_LOG: ContextVar[Optional[Set[str]]] = ContextVar("synthetica_kb_reads", default=None)
+_READ_COUNTERS: ContextVar[Optional["ReadCounters"]] = ContextVar(
+    "synthetica_kb_counters", default=None
+)
+
+LOGGER = logging.getLogger(__name__)
+
+
+@contextmanager
+def record_reads() -> Iterator[Set[str]]:
+    """Collect the paths read through any broker in this context (provenance)."""
+    paths: Set[str] = set()
+    token = _READ_LOG.set(paths)
+    try:
+        yield paths
+    finally:
+        _READ_LOG.reset(token)
+
+
+class ReadCounters:
+    """KB reads and memo hits/misses made in the contexts counting into it."""
+
+    __slots__ = ("_lock", "_lookups", "_hits", "_misses")
+
+    def __init__(self) -> None:
+        # Contexts copied into other threads (asyncio.to_thread) share it.
+        self._lock = threading.Lock()
+        self._lookups = self._hits = self._misses = 0
+
+    def add(self, lookups: int = 0, hits: int = 0, misses: int = 0) -> None:
+        with self._lock:
+            self._lookups += lookups
+            self._hits += hits
+            self._misses += misses
+
+    def read(self) -> Tuple[int, int, int]:
+        """(KB reads, memo hits, memo misses) so far."""
+        with self._lock:
+            return self._lookups, self._hits, self._misses
+
+
+@contextmanager
+def count_reads(counters: Optional[ReadCounters] = None) -> Iterator[ReadCounters]:
+    """Count the reads made through any broker in this context (tracing)."""
+    counters = counters if counters is not None else ReadCounters()
+    token = _READ_COUNTERS.set(counters)
+    try:
+        yield counters
+    finally:
+        _READ_COUNTERS.reset(token)
 
 
 class KnowledgeBroker:
-    def __init__(self, kb_data: Dict[str, Any]):
-        self._kb = kb_data
-        self._cache: Dict[str, List[Any]] = {}
-        print(
-            "[KnowledgeBroker] Initialised for KB ID: "
-            f"{kb_data.get('KB_ID', 'Unknown')}."
+    def __init__(
+        self,
+        kb_data: Union[Mapping, KBSnapshot],
+        cache_policy: Optional[CachePolicy] = None,
+        read_only: bool = False,
+    ):
+        # A prebuilt snapshot (e.g. a lazy one over a compiled artifact) is
+        # served as-is; plain mappings are frozen and indexed here.
+        if isinstance(kb_data, KBSnapshot):
+            self._snapshot = kb_data
+        else:
+            self._snapshot = KBSnapshot.build(kb_data)
+        # Serialises writers and the memo layer; KB reads never take it.
+        self._lock = threading.RLock()
+        self._local = threading.local()
+        self.read_only = read_only
+        self.cache_policy = cache_policy or CachePolicy()
+        self._cache = LRUCache(
+            max_entries=self.cache_policy.max_entries,
+            max_bytes=self.cache_policy.max_bytes,
+            ttl_seconds=self.cache_policy.ttl_seconds,
+        )
+        # Misses live apart so floods of unknown paths cannot evict hot entries.
+        self._missing = LRUCache(
+            max_entries=self.cache_policy.negative_max_entries,
+            ttl_seconds=self.cache_policy.ttl_seconds,
         )
+        # Structures derived from a flattened path (fuzzy indexes), keyed by
+        # (kind, path) and invalidated together with the flattened lists.
+        self._derived = LRUCache(max_entries=self.cache_policy.derived_max_entries)
+        self._cache_counters = {"hits": 0, "misses": 0}
+        LOGGER.info(
+            "[KnowledgeBroker] Initialised for KB ID: %s.",
+            self._snapshot.get("KB_ID", "Unknown"),
+        )
+
+    # ==========================================================================
+    # Snapshots
+    # ==========================================================================
+
+    @property
+    def version(self) -> int:
+        """Version number of the latest published snapshot."""
+        return self._snapshot.version
+
+    def snapshot(self) -> KBSnapshot:
+        """Snapshot pinned by the current thread, or the latest one."""
+        pinned = getattr(self._local, "snapshot", None)
+        return pinned if pinned is not None else self._snapshot
+
+    def fork(self, cache_policy: Optional[CachePolicy] = None) -> "KnowledgeBroker":
+        """
+        Writable broker starting from the current snapshot. Writes to the fork
+        never reach this broker; untouched KB nodes stay shared between both.
+        """
+        return KnowledgeBroker(self.snapshot(), cache_policy or self.cache_policy)
+
+    @contextmanager
+    def pinned(self) -> Iterator[KBSnapshot]:
+        """
+        Serve every read on this thread from one snapshot until exit.
+        Nested pins reuse the outer snapshot.
+        """
+        current = getattr(self._local, "snapshot", None)
+        if current is not None:
+            yield current
+            return
+        self._local.snapshot = self._snapshot
+        try:
+            yield self._local.snapshot
+        finally:
+            self._local.snapshot = None
 
     # ==========================================================================
     # Entry navigation helpers
@@ -19,136 +144,193 @@ class KnowledgeBroker:
         """
         Navigate the knowledge base using dotted paths.
         Handles keys that already contain dots (e.g. "11.0_Narrative...").
+        Lookups are served by the snapshot's path index.
         """
-        try:
-            parts = path.split(".")
-            current_level = self._kb
-
-            i = 0
-            while i < len(parts):
-                if not isinstance(current_level, dict):
-                    return default
-
-                current_key = parts[i]
-                if current_key in current_level:
-                    current_level = current_level[current_key]
-                    i += 1
-                    continue
-
-                compound_key = current_key
-                found_compound = False
-                for j in range(i + 1, len(parts)):
-                    compound_key += "." + parts[j]
-                    if compound_key in current_level:
-                        current_level = current_level[compound_key]
-                        i = j + 1
-                        found_compound = True
-                        break
-
-                if found_compound:
-                    continue
-
-                return default
-
-            return current_level
-        except Exception:
-            return default
+        reads = _READ_LOG.get()
+        if reads is not None:
+            reads.add(path)
+        counters = _READ_COUNTERS.get()
+        if counters is not None:
+            counters.add(lookups=1)
+        return self.snapshot().get(path, default)
 
     # ==========================================================================
     # Cache-aware utilities
     # ==========================================================================
 
+    def iter_flat(self, path: str) -> Iterator[Any]:
+        """Lazily yield the flattened leaves of ``path``."""
+        reads = _READ_LOG.get()
+        if reads is not None:
+            reads.add(path)
+        counters = _READ_COUNTERS.get()
+        if counters is not None:
+            counters.add(lookups=1)
+        snapshot = self.snapshot()
+        with self._lock:
+            cached = self._cache.get(path) if snapshot is self._snapshot else MISSING
+        if cached is not MISSING:
+            return iter(cached)
+        data = snapshot.get(path)
+        return self._iter_flatten(data) if data is not None else iter(())
+
     def get_flat_list(self, path: str) -> List[Any]:
-        if path in self._cache:
-            return self._cache[path]
-        data = self.get_entry(path)
+        # Index keys are canonical paths, so the cache key doubles as the
+        # KB subtree the flattened result was derived from. Only readers on
+        # the latest snapshot use the memo layer; pinned older readers compute
+        # straight from their own version.
+        reads = _READ_LOG.get()
+        if reads is not None:
+            reads.add(path)
+        counters = _READ_COUNTERS.get()
+        snapshot = self.snapshot()
+        with self._lock:
+            current = snapshot is self._snapshot
+            if current:
+                cached = self._cache.get(path)
+                if cached is MISSING and self._missing.get(path) is not MISSING:
+                    cached = []
+                if cached is not MISSING:
+                    self._cache_counters["hits"] += 1
+                    if counters is not None:
+                        counters.add(lookups=1, hits=1)
+                    return cached
+            self._cache_counters["misses"] += 1
+        if counters is not None:
+            counters.add(lookups=1, misses=1)
+
+        data = snapshot.get(path)
         result = self._flatten(data) if data is not None else []
-        self._cache[path] = result
+        with self._lock:
+            if snapshot is self._snapshot:
+                if data is None:
+                    self._missing.put(path, True)
+                else:
+                    self._cache.put(path, result)
         return result
 
+    def cache_stats(self) -> Dict[str, Any]:
+        """Report size, approximate bytes and hit ratio of the memo layer."""
+        with self._lock:
+            counters = dict(self._cache_counters)
+            positive = self._cache.stats()
+            negative = self._missing.stats()
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            **counters,
+            "hit_ratio": counters["hits"] / lookups if lookups else 0.0,
+            "size": positive["size"],
+            "bytes": positive["bytes"],
+            "evictions": positive["evictions"] + negative["evictions"],
+            "expirations": positive["expirations"] + negative["expirations"],
+            "negative": negative,
+        }
+
     def validate_entry(self, path: str, entry: Any) -> bool:
-        flat_list = self.get_flat_list(path)
-        if not flat_list and entry:
-            return False
-        return any(str(item).lower() == str(entry).lower() for item in flat_list)
+        """Case-, underscore- and spacing-insensitive membership check."""
+        return self._normalise_term(entry) in self._membership_set(path)
+
+    def validate_many(self, path: str, entries: List[Any]) -> List[bool]:
+        """Validate several entries against the same path in one pass."""
+        members = self._membership_set(path)
+        return [self._normalise_term(entry) in members for entry in entries]
 
     def find_closest_match(self, path: str, query: str, cutoff: float = 0.6) -> Optional[str]:
-        options = [str(opt) for opt in self.get_flat_list(path)]
-        if not options:
-            return None
-        matches = difflib.get_close_matches(query, options, n=1, cutoff=cutoff)
-        return matches[0] if matches else None
+        return self._fuzzy_index(path).best_match(query, cutoff)
 
-    def inject_entry(self, path: str, entry: Any) -> None:
-        """Inject or override an entry inside the KB using dotted paths."""
-        parts = path.split(".")
-        current_level: Dict[str, Any] = self._kb
-        i = 0
-
-        while i < len(parts):
-            if not isinstance(current_level, dict):
-                break
-
-            current_key = parts[i]
-            if current_key in current_level:
-                if i == len(parts) - 1:
-                    current_level[current_key] = entry
-                    self._cache.clear()
-                    return
-                current_level = current_level[current_key]
-                i += 1
-                continue
-
-            compound_key = current_key
-            found_compound = False
-            for j in range(i + 1, len(parts)):
-                compound_key += "." + parts[j]
-                if compound_key in current_level:
-                    if j == len(parts) - 1:
-                        current_level[compound_key] = entry
-                        self._cache.clear()
-                        return
-                    current_level = current_level[compound_key]
-                    i = j + 1
-                    found_compound = True
-                    break
-
-            if found_compound:
-                continue
-
-            remaining_key = ".".join(parts[i:])
-            current_level[remaining_key] = entry
-            self._cache.clear()
-            return
+    def find_closest_many(
+        self, path: str, queries: List[str], cutoff: float = 0.6
+    ) -> List[Optional[str]]:
+        """Batch form of ``find_closest_match`` sharing one index per path."""
+        return self._fuzzy_index(path).best_matches(queries, cutoff)
 
-        raise ValueError(f"Cannot inject entry at '{path}': parent is not a mapping.")
+    def inject_entry(self, path: str, entry: Any) -> None:
+        """
+        Inject or override an entry inside the KB using dotted paths.
+        Publishes a new snapshot; readers pinned to older ones are unaffected.
+        """
+        if self.read_only:
+            raise PermissionError(
+                f"Cannot inject entry at '{path}': broker is shared read-only; use fork()."
+            )
+        with self._lock:
+            self._snapshot = self._snapshot.with_entry(path, entry)
+            self._invalidate(path)
 
     # ==========================================================================
     # Internal helpers
     # ==========================================================================
 
+    def _invalidate(self, path: str) -> None:
+        """Evict cached results whose subtree overlaps the written path."""
+
+        def overlaps(key: Any) -> bool:
+            return (
+                key == path
+                or path.startswith(f"{key}.")
+                or key.startswith(f"{path}.")
+            )
+
+        self._cache.evict_where(overlaps)
+        self._missing.evict_where(overlaps)
+        self._derived.evict_where(lambda key: overlaps(key[1]))
+
+    @staticmethod
+    def _normalise_term(value: Any) -> str:
+        # Mirrors the lexicon key formatting done by _flatten ("_" -> " ").
+        return " ".join(str(value).casefold().replace("_", " ").split())
+
+    def _membership_set(self, path: str) -> FrozenSet[str]:
+        return self._derived_for(
+            "members",
+            path,
+            lambda: frozenset(
+                self._normalise_term(item) for item in self.get_flat_list(path)
+            ),
+        )
+
+    def _fuzzy_index(self, path: str) -> FuzzyIndex:
+        return self._derived_for(
+            "fuzzy",
+            path,
+            lambda: FuzzyIndex(str(opt) for opt in self.get_flat_list(path)),
+        )
+
+    def _derived_for(self, kind: str, path: str, build: Callable[[], Any]) -> Any:
+        snapshot = self.snapshot()
+        key = (kind, path)
+        with self._lock:
+            if snapshot is self._snapshot:
+                value = self._derived.get(key)
+                if value is not MISSING:
+                    return value
+        value = build()
+        with self._lock:
+            if snapshot is self._snapshot:
+                self._derived.put(key, value)
+        return value
+
     def _flatten(self, data: Any) -> List[Any]:
+        """Flatten nested KB structures into a simple list."""
+        return list(self._iter_flatten(data))
+
+    def _iter_flatten(self, data: Any) -> Iterator[Any]:
         """
-        Flatten nested KB structures into a simple list.
-        Handles lexicon dictionaries whose values are rich objects.
+        Stream the leaves of a KB structure without intermediate lists.
+        Entity lexicons (mappings of rich objects) yield their formatted keys.
         """
-        items: List[Any] = []
-        if isinstance(data, list):
-            for item in data:
-                items.extend(self._flatten(item))
-        elif isinstance(data, dict):
-            if data and isinstance(next(iter(data.values()), None), dict):
-                dict_count = sum(isinstance(v, dict) for v in data.values())
-                is_entity_lexicon = dict_count / len(data.values()) > 0.8
+        stack: List[Iterator[Any]] = [iter((data,))]
+        while stack:
+            item = next(stack[-1], _END)
+            if item is _END:
+                stack.pop()
+            elif isinstance(item, (list, tuple)):
+                stack.append(iter(item))
+            elif isinstance(item, Mapping):
+                if is_entity_lexicon(item):
+                    for key in item:
+                        yield key.replace("_", " ")
+                else:
+                    stack.append(iter(item.values()))
             else:
-                is_entity_lexicon = False
-
-            if is_entity_lexicon:
-                formatted_keys = [k.replace("_", " ") for k in data.keys()]
-                items.extend(formatted_keys)
-            else:
-                for value in data.values():
-                    items.extend(self._flatten(value))
-        else:
-            items.append(data)
-        return items
+                yield item
@@ -0,0 +1,136 @@
+"""
+Process-wide registry of shared, read-only KnowledgeBrokers.
+
+Orchestrators ask the registry for the broker of a KB file instead of parsing
+it themselves. Brokers are keyed by resolved path plus source content hash:
+repeated requests cost one ``stat`` call, and a file that changed on disk is
+reloaded on the next request (callers holding the previous broker keep a
+consistent view until they ask again). The memory map behind a replaced
+broker is closed as soon as the last of those callers lets it go.
+
+For pre-forking servers, call ``preload`` in the parent before forking so
+workers inherit the loaded KB; ``gc.freeze`` keeps the collector from
+touching (and thereby copying) those pages in the children.
+"""
+
+from __future__ import annotations
+
+import gc
+import hashlib
+import json
+import threading
+import weakref
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+from synthetica.core.cache import CachePolicy
+from synthetica.core.compiled_kb import CompiledKB, open_compiled_kb
+from synthetica.core.knowledge_broker import KnowledgeBroker
+
+
+@dataclass(frozen=True)
+class _Loaded:
+    signature: Tuple[int, int, int]
+    content_hash: str
+    broker: KnowledgeBroker
+    artifact: Optional[CompiledKB] = None
+
+
+class KBRegistry:
+    """Shares one read-only broker per (resolved KB path, content hash)."""
+
+    def __init__(self, cache_policy: Optional[CachePolicy] = None) -> None:
+        self.cache_policy = cache_policy
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Loaded] = {}
+        self.loads = 0
+
+    def broker_for(self, kb_path: Union[str, Path]) -> KnowledgeBroker:
+        """Shared broker for ``kb_path``, reloaded if the file changed on disk."""
+        path = Path(kb_path).resolve()
+        key = str(path)
+        signature = _signature(path)
+
+        entry = self._entries.get(key)
+        if entry is not None and entry.signature == signature:
+            return entry.broker
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.signature == signature:
+                return entry.broker
+            content_hash, kb_data, artifact = _load(path)
+            if entry is not None and entry.content_hash == content_hash:
+                # Touched but unchanged (e.g. re-saved): keep the broker.
+                if artifact is not None:
+                    artifact.close()
+                broker, artifact = entry.broker, entry.artifact
+            else:
+                broker = KnowledgeBroker(kb_data, self.cache_policy, read_only=True)
+                self.loads += 1
+                if entry is not None:
+                    _retire(entry)
+            self._entries[key] = _Loaded(signature, content_hash, broker, artifact)
+            return broker
+
+    def content_hash(self, kb_path: Union[str, Path]) -> Optional[str]:
+        entry = self._entries.get(str(Path(kb_path).resolve()))
+        return entry.content_hash if entry else None
+
+    def preload(self, kb_paths: Iterable[Union[str, Path]], warm: bool = True) -> None:
+        """
+        Load (and optionally fully decode) KBs, then freeze the GC generations.
+        Intended to run once in a parent process right before forking workers.
+        """
+        for kb_path in kb_paths:
+            broker = self.broker_for(kb_path)
+            if warm:
+                _materialise(broker.snapshot().root)
+        gc.freeze()
+
+    def clear(self) -> None:
+        with self._lock:
+            for entry in self._entries.values():
+                _retire(entry)
+            self._entries.clear()
+
+
+def _signature(path: Path) -> Tuple[int, int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
+def _load(path: Path) -> Tuple[str, object, Optional[CompiledKB]]:
+    try:
+        compiled = open_compiled_kb(path)
+        return compiled.content_hash, compiled.snapshot(), compiled
+    except OSError:
+        # Read-only checkouts cannot hold the compiled artifact.
+        raw = path.read_bytes()
+        return hashlib.sha256(raw).hexdigest(), json.loads(raw.decode("utf-8")), None
+
+
+def _retire(entry: _Loaded) -> None:
+    """Unmap a replaced broker's artifact once nothing references the broker."""
+    if entry.artifact is not None:
+        weakref.finalize(entry.broker, entry.artifact.close)
+
+
+def _materialise(root: Mapping) -> None:
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        children = node.values() if isinstance(node, Mapping) else node
+        stack.extend(
+            child for child in children if isinstance(child, (Mapping, list, tuple))
+        )
+
+
+_shared_registry = KBRegistry()
+
+
+def shared_registry() -> KBRegistry:
+    """Registry shared by every orchestrator in this process."""
+    return _shared_registry
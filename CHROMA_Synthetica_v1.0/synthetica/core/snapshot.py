@@ -0,0 +1,424 @@
+"""Immutable, structurally shared KB snapshots used by the KnowledgeBroker."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Mapping
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Tuple
+
+from synthetica.core.cache import MISSING
+
+_ABSENT = object()
+_DELETED = object()  # tombstone in a PathIndex level
+
+
+class FrozenList(tuple):
+    """Read-only KB sequence that still compares equal to plain lists."""
+
+    __slots__ = ()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, list):
+            other = tuple(other)
+        return tuple.__eq__(self, other)
+
+    def __ne__(self, other: object) -> bool:
+        return not self == other
+
+    __hash__ = tuple.__hash__
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class FrozenNode(Mapping):
+    """
+    Immutable KB mapping.
+
+    ``set`` returns a new node that shares every untouched child with the
+    original, so a write copies only the nodes on the written path. The
+    entity-lexicon classification used by the flattener is worked out once,
+    when the node is built.
+    """
+
+    __slots__ = ("_data", "is_entity_lexicon")
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self._data = data
+        self.is_entity_lexicon = _classify(data)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._data.get(key, default)
+
+    def keys(self):  # type: ignore[override]
+        return self._data.keys()
+
+    def values(self):  # type: ignore[override]
+        return self._data.values()
+
+    def items(self):  # type: ignore[override]
+        return self._data.items()
+
+    def set(self, key: str, value: Any) -> "FrozenNode":
+        data = dict(self._data)
+        data[key] = value
+        return FrozenNode(data)
+
+    def __repr__(self) -> str:
+        return f"FrozenNode({self._data!r})"
+
+
+def _classify(data: Mapping) -> bool:
+    """A mapping is an entity lexicon when >80% of its values are mappings."""
+    if not data or not isinstance(next(iter(data.values())), Mapping):
+        return False
+    dict_count = sum(isinstance(v, Mapping) for v in data.values())
+    return dict_count / len(data) > 0.8
+
+
+def is_entity_lexicon(node: Mapping) -> bool:
+    flag = getattr(node, "is_entity_lexicon", None)
+    return _classify(node) if flag is None else flag
+
+
+def freeze(value: Any) -> Any:
+    """Deep-convert dicts/lists into FrozenNode/FrozenList (frozen parts are reused)."""
+    if isinstance(value, (FrozenNode, FrozenList)):
+        return value
+    if isinstance(value, Mapping):
+        return FrozenNode({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return FrozenList(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Convert a frozen structure back into plain dicts and lists (e.g. for JSON)."""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+class PathIndex:
+    """
+    Persistent dotted-path -> node map shared between snapshot versions.
+
+    Levels are dicts, newest first, never mutated once published. A write adds
+    a level holding only its changes (deletions as tombstones) and merges it
+    into older levels while they are at most ``MERGE_RATIO`` times its size,
+    so every entry is copied O(log n) times over its life, versions share all
+    untouched levels, and a lookup probes O(log n) dicts (a handful in
+    practice, one right after a build).
+    """
+
+    MERGE_RATIO = 8
+
+    __slots__ = ("_levels",)
+
+    def __init__(self, levels: Tuple[Dict[str, Any], ...] = ()) -> None:
+        self._levels = levels
+
+    @classmethod
+    def of(cls, entries: Dict[str, Any]) -> "PathIndex":
+        return cls((entries,) if entries else ())
+
+    def get(self, path: str, default: Any = None) -> Any:
+        for level in self._levels:
+            value = level.get(path, _ABSENT)
+            if value is not _ABSENT:
+                return default if value is _DELETED else value
+        return default
+
+    def __contains__(self, path: object) -> bool:
+        return self.get(path, _ABSENT) is not _ABSENT  # type: ignore[arg-type]
+
+    def __iter__(self) -> Iterator[str]:
+        seen = set()
+        for level in self._levels:
+            for path, value in level.items():
+                if path not in seen:
+                    seen.add(path)
+                    if value is not _DELETED:
+                        yield path
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def updated(self, changes: Dict[str, Any]) -> "PathIndex":
+        """New index with ``changes`` applied (``_DELETED`` values remove paths)."""
+        if not changes:
+            return self
+        levels = list(self._levels)
+        merged = changes
+        while levels and len(levels[0]) <= self.MERGE_RATIO * len(merged):
+            older = dict(levels.pop(0))
+            older.update(merged)
+            merged = older
+        if not levels:  # nothing older left to hide: drop the tombstones
+            merged = {path: value for path, value in merged.items() if value is not _DELETED}
+        return PathIndex((merged, *levels))
+
+
+class _PendingIndex:
+    """Write buffer over a ``PathIndex``; collects the changes of one write."""
+
+    __slots__ = ("base", "changes")
+
+    def __init__(self, base: PathIndex) -> None:
+        self.base = base
+        self.changes: Dict[str, Any] = {}
+
+    def get(self, path: str, default: Any = None) -> Any:
+        value = self.changes.get(path, _ABSENT)
+        if value is _ABSENT:
+            return self.base.get(path, default)
+        return default if value is _DELETED else value
+
+    def setdefault(self, path: str, value: Any) -> Any:
+        current = self.get(path, _ABSENT)
+        if current is _ABSENT:
+            self.changes[path] = current = value
+        return current
+
+    def __setitem__(self, path: str, value: Any) -> None:
+        self.changes[path] = value
+
+    def __delitem__(self, path: str) -> None:
+        self.changes[path] = _DELETED
+
+
+class KBSnapshot:
+    """
+    One published version of the KB: a frozen root plus its path index.
+
+    Snapshots never change once built; ``with_entry`` returns the next version.
+    The index maps every reachable mapping child to its canonical dotted path
+    and is a ``PathIndex``, so a write only records the paths it changed and
+    shares the rest with the previous version.
+
+    Lazy snapshots (see ``synthetica.core.compiled_kb``) start with an empty
+    index and resolve misses through ``resolver`` (the artifact's path table).
+    Paths under a subtree written since load are resolved by walking the
+    in-memory nodes instead.
+
+    Resolved lookups are memoised in a per-snapshot cache kept apart from the
+    (shared, immutable) index; it is filled under a lock and only ever holds
+    values the snapshot would return anyway.
+    """
+
+    __slots__ = (
+        "version", "root", "index", "_flat", "_resolver", "_shadowed", "_memo", "_memo_lock"
+    )
+
+    def __init__(
+        self,
+        version: int,
+        root: FrozenNode,
+        index: PathIndex,
+        resolver: Optional[Callable[[str], Any]] = None,
+        shadowed: FrozenSet[str] = frozenset(),
+    ) -> None:
+        self.version = version
+        self.root = root
+        self.index = index
+        # Single-level index (fresh build, or compacted): get() probes it
+        # directly. Otherwise lookups go through the per-snapshot memo.
+        self._flat = index._levels[0] if len(index._levels) == 1 else None
+        self._resolver = resolver
+        self._shadowed = shadowed
+        self._memo: Dict[str, Any] = {}
+        self._memo_lock = threading.Lock()
+
+    @classmethod
+    def build(cls, kb_data: Mapping, version: int = 0) -> "KBSnapshot":
+        root = freeze(kb_data)
+        index: Dict[str, Any] = {}
+        _index_subtree(index, "", root)
+        return cls(version, root, PathIndex.of(index))
+
+    @classmethod
+    def lazy(cls, root: FrozenNode, resolver: Callable[[str], Any]) -> "KBSnapshot":
+        return cls(0, root, PathIndex(), resolver)
+
+    def get(self, path: str, default: Any = None) -> Any:
+        flat = self._flat
+        try:
+            value = (flat if flat is not None else self._memo).get(path, _ABSENT)
+        except TypeError:
+            return default
+        if value is _ABSENT:
+            return self._get_slow(path, default)
+        return value
+
+    def _get_slow(self, path: str, default: Any) -> Any:
+        if self._flat is None:
+            value = self.index.get(path, _ABSENT)
+            if value is not _ABSENT:
+                self._remember(path, value)
+                return value
+        if self._resolver is None or not isinstance(path, str):
+            return default
+        value = self._memo.get(path, _ABSENT)
+        if value is _ABSENT:
+            value = self._resolve(path)
+            if value is _ABSENT:
+                return default
+            self._remember(path, value)
+        return value
+
+    def _remember(self, path: str, value: Any) -> None:
+        with self._memo_lock:
+            self._memo.setdefault(path, value)
+
+    def with_entry(self, path: str, entry: Any) -> "KBSnapshot":
+        """Return the next snapshot with ``entry`` stored at ``path``."""
+        trail = self._locate(path)
+        if trail is None:
+            raise ValueError(f"Cannot inject entry at '{path}': parent is not a mapping.")
+
+        parent, key = trail[-1]
+        frozen_entry = freeze(entry)
+
+        index = _PendingIndex(self.index)
+        shadowed = self._shadowed
+        if self._resolver is None:
+            previous = parent.get(key)
+            if isinstance(previous, Mapping):
+                _unindex_subtree(index, path, previous)
+        else:
+            # Walking the old subtree would decode it; drop entries written
+            # below the path and stop consulting the artifact for it instead.
+            # (The lazy index only holds written paths, so this scan is small.)
+            prefix = f"{path}."
+            for stale in [known for known in self.index if known.startswith(prefix)]:
+                del index[stale]
+            shadowed = shadowed | {path}
+        index[path] = frozen_entry
+        if isinstance(frozen_entry, Mapping):
+            _index_subtree(index, path, frozen_entry)
+
+        # Path copying: rebuild the written node's ancestors bottom-up.
+        keys = [step_key for _, step_key in trail]
+        value = frozen_entry
+        for depth in range(len(trail) - 1, -1, -1):
+            node, step_key = trail[depth]
+            value = node.set(step_key, value)
+            if depth:
+                index[".".join(keys[:depth])] = value
+        return KBSnapshot(
+            self.version + 1, value, self.index.updated(index.changes), self._resolver, shadowed
+        )
+
+    def _resolve(self, path: str) -> Any:
+        if self._shadowed and self._is_shadowed(path):
+            trail = self._locate(path)
+            if trail is None:
+                return _ABSENT
+            node, key = trail[-1]
+            return node[key] if key in node else _ABSENT
+        value = self._resolver(path)
+        return _ABSENT if value is MISSING else value
+
+    def _is_shadowed(self, path: str) -> bool:
+        if path in self._shadowed:
+            return True
+        position = path.find(".")
+        while position != -1:
+            if path[:position] in self._shadowed:
+                return True
+            position = path.find(".", position + 1)
+        return False
+
+    def _locate(self, path: str) -> Optional[List[Tuple[FrozenNode, str]]]:
+        """Walk ``path`` and return the (node, key) pairs that lead to it."""
+        parts = path.split(".")
+        trail: List[Tuple[FrozenNode, str]] = []
+        current: Any = self.root
+        i = 0
+
+        while i < len(parts):
+            if not isinstance(current, FrozenNode):
+                return None
+
+            current_key = parts[i]
+            if current_key in current:
+                trail.append((current, current_key))
+                if i == len(parts) - 1:
+                    return trail
+                current = current[current_key]
+                i += 1
+                continue
+
+            compound_key = current_key
+            found_compound = False
+            for j in range(i + 1, len(parts)):
+                compound_key += "." + parts[j]
+                if compound_key in current:
+                    trail.append((current, compound_key))
+                    if j == len(parts) - 1:
+                        return trail
+                    current = current[compound_key]
+                    i = j + 1
+                    found_compound = True
+                    break
+
+            if found_compound:
+                continue
+
+            trail.append((current, ".".join(parts[i:])))
+            return trail
+
+        return None
+
+
+def _index_subtree(index: Any, prefix: str, node: Mapping) -> None:
+    """
+    Register every mapping child reachable from ``node`` under its dotted path.
+
+    The walk is depth-first with the fewest dotted segments first, so when two
+    key combinations spell the same path ("a" -> "b.c" vs "a.b" -> "c") the
+    index keeps the node a segment-by-segment walk would reach.
+    """
+    stack = [(prefix, _ordered_children(node))]
+    while stack:
+        base, children = stack[-1]
+        item = next(children, None)
+        if item is None:
+            stack.pop()
+            continue
+        key, value = item
+        child_path = f"{base}.{key}" if base else key
+        index.setdefault(child_path, value)
+        if isinstance(value, Mapping):
+            stack.append((child_path, _ordered_children(value)))
+
+
+def _ordered_children(node: Mapping) -> Iterator[Tuple[str, Any]]:
+    return iter(sorted(node.items(), key=lambda item: item[0].count(".")))
+
+
+def _unindex_subtree(index: _PendingIndex, prefix: str, node: Mapping) -> None:
+    """Drop the index entries that pointed into a replaced subtree."""
+    stack = [(prefix, node)]
+    while stack:
+        base, current = stack.pop()
+        for key, value in current.items():
+            child_path = f"{base}.{key}"
+            if index.get(child_path) is value:
+                del index[child_path]
+            if isinstance(value, Mapping):
+                stack.append((child_path, value))
@@ -1,120 +1,339 @@
 """Model Translation Layer policies for prompt generation."""
 
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from synthetica.core.cache import MISSING, LRUCache
 from synthetica.core.models import ProjectStateObject
 from synthetica.core.knowledge_broker import KnowledgeBroker
+from synthetica.engines.imtl_budget import (
+    BUILTIN_BUDGETS,
+    Budget,
+    BudgetReport,
+    PSOParts,
+    fit_to_budget,
+    make_counter,
+    parse_budget,
+    style_fragment,
+    technical_fragment,
+)
+from synthetica.engines.imtl_templates import (
+    BUILTIN_TEMPLATES,
+    DEFAULT_POLICY,
+    CompiledTemplate,
+    compile_template,
+    policy_key,
+)
+from synthetica.tracing import span
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_TRANSLATION_CACHE_SIZE = 1024
+PROFILES_PATH = "7.0_Model_Translation_Layer_Profiles.Model_Capability_Profiles"
+
+_BUILTIN_POLICIES: Dict[str, CompiledTemplate] = {
+    policy_key(name): compile_template(name, spec) for name, spec in BUILTIN_TEMPLATES.items()
+}
+_BUILTIN_BUDGETS: Dict[str, Budget] = {
+    policy_key(name): budget for name, budget in BUILTIN_BUDGETS.items()
+}
+
+
+@dataclass
+class Translation:
+    """A prompt plus its budget report (``None`` when the model has no budget)."""
+
+    prompt: str
+    report: Optional[BudgetReport] = None
+
+
+@dataclass(frozen=True)
+class _ModelPolicy:
+    template: CompiledTemplate
+    budget: Optional[Budget]
+    count: Optional[Callable[[str], int]]
+
+
+@dataclass(frozen=True)
+class PSOFingerprint:
+    """
+    Stable digest of the PSO fields the policies read, plus the template
+    slots every policy shares. Build it once per PSO with
+    ``IMTLPolicyEngine.fingerprint`` and pass it to each ``translate`` call.
+    """
+
+    digest: str
+    fields: Dict[str, str]
+    parts: PSOParts
+
+    @property
+    def style(self) -> str:
+        return self.fields["style"]
+
+    @property
+    def technical(self) -> str:
+        return self.fields["technical"]
 
 
 class IMTLPolicyEngine:
-    """Selects rhetoric policies per downstream model."""
+    """
+    Selects rhetoric policies per downstream model.
 
-    def __init__(self, broker: KnowledgeBroker):
+    Policies are templates (see ``imtl_templates``): the built-in set plus any
+    ``Prompt_Template`` found on the KB model profiles, compiled into a
+    dispatch table that is rebuilt when the profiles change in the broker.
+    Models with a length budget (built-in or ``Prompt_Budget`` on the
+    profile) have their prompts trimmed to fit, see ``imtl_budget``.
+    """
+
+    def __init__(
+        self,
+        broker: KnowledgeBroker,
+        cache_size: Optional[int] = DEFAULT_TRANSLATION_CACHE_SIZE,
+    ):
         self.broker = broker
+        # (fingerprint digest, policy, budget) -> Translation; cleared when the
+        # dispatch table changes. cache_size=0 disables the cache.
+        self._cache = LRUCache(max_entries=cache_size) if cache_size != 0 else None
+        self._lock = threading.Lock()
+        self._dispatch: Dict[str, CompiledTemplate] = dict(_BUILTIN_POLICIES)
+        self._budgets: Dict[str, Budget] = dict(_BUILTIN_BUDGETS)
+        self._by_model: Dict[str, _ModelPolicy] = {}
+        self._dispatch_version: Optional[int] = None
+        self._profiles: Any = None
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def fingerprint(self, pso: ProjectStateObject) -> PSOFingerprint:
+        camera = pso.camera_package.get("camera")
+        parts = PSOParts(
+            core_concept=pso.core_concept,
+            composition=pso.composition or "",
+            masters=tuple(pso.master_references),
+            keywords=tuple(pso.visual_style_keywords),
+            camera=str(camera) if camera else "",
+            artifacts=tuple(pso.process_artifacts),
+            # Ranks keywords when a prompt is trimmed, so it is part of the key.
+            reasoning_chain=tuple(pso.reasoning_chain),
+        )
+        raw = repr(parts).encode("utf-8")
+        return PSOFingerprint(
+            digest=hashlib.blake2b(raw, digest_size=16).hexdigest(),
+            fields=self._fields(parts),
+            parts=parts,
+        )
+
+    def translate(
+        self,
+        pso: ProjectStateObject,
+        target_model: str,
+        fingerprint: Optional[PSOFingerprint] = None,
+    ) -> str:
+        if fingerprint is None:
+            fingerprint = self.fingerprint(pso)
+        return self._render(target_model, self._resolve(target_model), fingerprint).prompt
 
-    def translate(self, pso: ProjectStateObject, target_model: str) -> str:
-        policy_method_name = f"_policy_{target_model.lower().replace('-', '_')}"
-        policy_method = getattr(self, policy_method_name, self._policy_default)
-        prompt = policy_method(pso)
+    def translate_detailed(
+        self,
+        pso: ProjectStateObject,
+        target_model: str,
+        fingerprint: Optional[PSOFingerprint] = None,
+    ) -> Translation:
+        """Like ``translate``, but also returns what budget trimming dropped."""
+        if fingerprint is None:
+            fingerprint = self.fingerprint(pso)
+        return self._render(target_model, self._resolve(target_model), fingerprint)
+
+    def translate_many(
+        self,
+        pso: ProjectStateObject,
+        target_models: Iterable[str],
+        fingerprint: Optional[PSOFingerprint] = None,
+    ) -> Dict[str, str]:
+        """``{model: prompt}`` for one PSO; fragments are built once for all models."""
+        translations = self.translate_many_detailed(pso, target_models, fingerprint)
+        return {model: translation.prompt for model, translation in translations.items()}
+
+    def translate_many_detailed(
+        self,
+        pso: ProjectStateObject,
+        target_models: Iterable[str],
+        fingerprint: Optional[PSOFingerprint] = None,
+    ) -> Dict[str, Translation]:
+        if fingerprint is None:
+            fingerprint = self.fingerprint(pso)
+        return {
+            model: self._render(model, self._resolve(model), fingerprint)
+            for model in target_models
+        }
+
+    def translate_batch(
+        self,
+        psos: Iterable[ProjectStateObject],
+        target_models: Sequence[str],
+    ) -> List[Dict[str, str]]:
+        """
+        ``translate_many`` over several PSOs: policies are resolved once for
+        the batch and PSOs with the same fingerprint are rendered once.
+        """
+        policies = [(model, self._resolve(model)) for model in target_models]
+        rendered: Dict[str, Dict[str, str]] = {}
+        results = []
+        for pso in psos:
+            fingerprint = self.fingerprint(pso)
+            prompts = rendered.get(fingerprint.digest)
+            if prompts is None:
+                prompts = {
+                    model: self._render(model, policy, fingerprint).prompt
+                    for model, policy in policies
+                }
+                rendered[fingerprint.digest] = prompts
+            results.append(dict(prompts))
+        return results
+
+    def policy_for(self, target_model: str) -> CompiledTemplate:
+        """Compiled template for ``target_model`` (the default policy if unknown)."""
+        return self._resolve(target_model).template
+
+    def budget_for(self, target_model: str) -> Optional[Budget]:
+        return self._resolve(target_model).budget
+
+    def cache_stats(self) -> Dict[str, int]:
+        stats = self._cache.stats() if self._cache is not None else {"size": 0}
+        return {**stats, "hits": self.cache_hits, "misses": self.cache_misses}
+
+    def clear_cache(self) -> None:
+        if self._cache is not None:
+            with self._lock:
+                self._cache.clear()
+
+    def _render(
+        self, target_model: str, policy: _ModelPolicy, fingerprint: PSOFingerprint
+    ) -> Translation:
+        template = policy.template
+        with span(f"translate:{target_model}", "phase3", policy=template.name) as current:
+            key = (fingerprint.digest, template.name, policy.budget)
+            if self._cache is not None:
+                with self._lock:
+                    cached = self._cache.get(key)
+                    if cached is not MISSING:
+                        self.cache_hits += 1
+                    else:
+                        self.cache_misses += 1
+                if cached is not MISSING:
+                    current.annotate(cached=True)
+                    return self._for_model(cached, target_model)
+
+            prompt = self._finish(template.render(fingerprint.fields))
+            translation = Translation(prompt)
+            budget, count = policy.budget, policy.count
+            if budget is not None and count is not None:
+                used = count(prompt)
+                if used <= budget.limit:
+                    translation.report = BudgetReport(target_model, budget, used)
+                else:
+
+                    def render(parts: PSOParts) -> str:
+                        return self._finish(template.render(self._fields(parts)))
+
+                    translation.prompt, translation.report = fit_to_budget(
+                        target_model, fingerprint.parts, budget, count, render
+                    )
+                    current.annotate(dropped=len(translation.report.dropped))
+
+            if self._cache is not None:
+                with self._lock:
+                    self._cache.put(key, translation)
+            return translation
+
+    @staticmethod
+    def _for_model(translation: Translation, target_model: str) -> Translation:
+        # Cached entries are shared by every model with the same policy and
+        # budget; hand out a copy labelled with the requested model.
+        report = translation.report
+        if report is not None:
+            report = BudgetReport(
+                model=target_model,
+                budget=report.budget,
+                used=report.used,
+                dropped=list(report.dropped),
+                truncated_core=report.truncated_core,
+                over_budget=report.over_budget,
+            )
+        return Translation(translation.prompt, report)
+
+    @staticmethod
+    def _finish(prompt: str) -> str:
         return prompt.strip().replace("_", " ")
 
-    # --------------------------------------------------------------------- #
-    # Helpers
-    # --------------------------------------------------------------------- #
-    def _get_style(self, pso: ProjectStateObject) -> str:
-        parts = []
-        if pso.master_references:
-            masters = ", ".join(pso.master_references)
-            parts.append(f"in the style of {masters}")
-        if pso.visual_style_keywords:
-            parts.append(", ".join(pso.visual_style_keywords))
-        return ", ".join(parts)
-
-    def _get_technical(self, pso: ProjectStateObject) -> str:
-        parts = []
-        camera = pso.camera_package.get("camera")
-        if camera:
-            parts.append(f"shot on {camera}")
-        if pso.process_artifacts:
-            parts.append(", ".join(pso.process_artifacts))
-        return ", ".join(parts)
+    @staticmethod
+    def _fields(parts: PSOParts) -> Dict[str, str]:
+        return {
+            "core_concept": parts.core_concept,
+            "composition": parts.composition,
+            "style": style_fragment(parts.masters, parts.keywords),
+            "technical": technical_fragment(parts.camera, parts.artifacts),
+        }
 
     # --------------------------------------------------------------------- #
-    # Policies
+    # Dispatch table
     # --------------------------------------------------------------------- #
-    def _policy_default(self, pso: ProjectStateObject) -> str:
-        segments = [pso.core_concept, self._get_style(pso), self._get_technical(pso)]
-        return ", ".join(seg for seg in segments if seg)
-
-    def _policy_dall_e_3(self, pso: ProjectStateObject) -> str:
-        narrative = f"A detailed visualization depicting: {pso.core_concept}. "
-        style = self._get_style(pso)
-        if style:
-            narrative += f"The aesthetic style, mood, and influences include: {style}. "
-        if pso.composition:
-            narrative += f"Composition guidelines: {pso.composition}. "
-        tech = self._get_technical(pso)
-        if tech:
-            narrative += f"Visual characteristics: {tech}. "
-        return narrative
-
-    def _policy_midjourney_v6(self, pso: ProjectStateObject) -> str:
-        style = self._get_style(pso)
-        tech = self._get_technical(pso)
-        segments = [
-            f"imagine {pso.core_concept}",
-            style and f"evoke {style}",
-            pso.composition and f"compose with {pso.composition}",
-            tech and f"render with {tech}",
-        ]
-        poetic_instruction = " -- ".join(seg for seg in segments if seg)
-        return poetic_instruction or pso.core_concept
-
-    def _policy_stable_diffusion_3(self, pso: ProjectStateObject) -> str:
-        steps = [f"Step 1: Concept - {pso.core_concept}"]
-        style = self._get_style(pso)
-        if style:
-            steps.append(f"Step 2: Aesthetic references - {style}")
-        if pso.composition:
-            steps.append(f"Step 3: Composition plan - {pso.composition}")
-        tech = self._get_technical(pso)
-        if tech:
-            steps.append(f"Step 4: Technical settings - {tech}")
-        steps.append("Step 5: Output - high fidelity render with balanced exposure.")
-        return "\n".join(steps)
-
-    def _policy_seedream_4_0(self, pso: ProjectStateObject) -> str:
-        style = self._get_style(pso)
-        tech = self._get_technical(pso)
-        modules = [
-            f"Module A - Scenario: {pso.core_concept}",
-            style and f"Module B - Visual Language: {style}",
-            pso.composition and f"Module C - Blocking: {pso.composition}",
-            tech and f"Module D - Capture Specs: {tech}",
-            "Module E - Delivery: seamless motion-ready frames.",
-        ]
-        return "\n".join(mod for mod in modules if mod)
-
-    def _policy_nano_banana(self, pso: ProjectStateObject) -> str:
-        style = self._get_style(pso)
-        tech = self._get_technical(pso)
-        lines = [f"core: {pso.core_concept}"]
-        if style:
-            lines.append(f"vibe: {style}")
-        if pso.composition:
-            lines.append(f"frame: {pso.composition}")
-        if tech:
-            lines.append(f"gear: {tech}")
-        lines.append("mood: bold, curious, joyful.")
-        return "\n".join(lines)
-
-    def _policy_flux_1(self, pso: ProjectStateObject) -> str:
-        style = self._get_style(pso)
-        tech = self._get_technical(pso)
-        brief = [f"Objective: {pso.core_concept}"]
-        if style:
-            brief.append(f"Key visuals: {style}")
-        if pso.composition:
-            brief.append(f"Composition cue: {pso.composition}")
-        if tech:
-            brief.append(f"Execution notes: {tech}")
-        brief.append("Delivery: cinematic, high-impact frames with crisp detailing.")
-        return "\n".join(brief)
+    def _resolve(self, target_model: str) -> _ModelPolicy:
+        self._refresh_dispatch()
+        # Under the lock, so a policy built from a table that a concurrent
+        # refresh just replaced is never stored in the new one.
+        with self._lock:
+            policy = self._by_model.get(target_model)
+            if policy is None:
+                key = policy_key(target_model)
+                template = self._dispatch.get(key) or self._dispatch[DEFAULT_POLICY]
+                budget = self._budgets.get(key)
+                count = make_counter(budget.unit) if budget is not None else None
+                policy = _ModelPolicy(template, budget, count)
+                self._by_model[target_model] = policy
+        return policy
+
+    def _refresh_dispatch(self) -> None:
+        # Version and profiles come from one snapshot, so a concurrent write
+        # cannot pair new profiles with an old version (or the reverse).
+        snapshot = self.broker.snapshot()
+        version = snapshot.version
+        if version == self._dispatch_version:
+            return
+        # Snapshots share untouched subtrees, so an injection elsewhere in
+        # the KB leaves the profiles node (and the table) as it was.
+        profiles = snapshot.get(PROFILES_PATH)
+        with self._lock:
+            if profiles is not self._profiles:
+                self._dispatch, self._budgets = self._compile_policies(profiles)
+                self._by_model = {}
+                self._profiles = profiles
+                if self._cache is not None:
+                    self._cache.clear()
+            self._dispatch_version = version
+
+    def _compile_policies(
+        self, profiles: Any
+    ) -> Tuple[Dict[str, CompiledTemplate], Dict[str, Budget]]:
+        dispatch = dict(_BUILTIN_POLICIES)
+        budgets = dict(_BUILTIN_BUDGETS)
+        if not isinstance(profiles, Mapping):
+            return dispatch, budgets
+        for model, profile in profiles.items():
+            if not isinstance(profile, Mapping):
+                continue
+            key = policy_key(model)
+            try:
+                if profile.get("Prompt_Template") is not None:
+                    dispatch[key] = compile_template(model, profile["Prompt_Template"])
+                if profile.get("Prompt_Budget") is not None:
+                    budgets[key] = parse_budget(model, profile["Prompt_Budget"])
+            except ValueError as exc:
+                LOGGER.warning("[IMTL] Ignoring profile settings of %s: %s", model, exc)
+        return dispatch, budgets
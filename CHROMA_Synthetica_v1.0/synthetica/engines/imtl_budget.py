@@ -0,0 +1,188 @@
+"""
+Per-model prompt length budgets for the IMTL.
+
+A budget is a limit in ``chars``, ``words`` or approximate ``tokens``. KB
+profiles may set one with ``"Prompt_Budget": {"limit": 77, "unit": "tokens"}``;
+the built-in budgets below cover the providers' hard limits.
+
+When a prompt is over budget, items are dropped from the lowest priority up:
+process artifacts, camera, composition, style keywords (least referenced in
+the reasoning chain first), then masters. The core concept is kept and only
+cut at a word boundary when everything else is already gone. The number of
+items to drop is found by binary search, so a trim costs O(log n) renders.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+UNITS = ("chars", "words", "tokens")
+
+
+@dataclass(frozen=True)
+class Budget:
+    limit: int
+    unit: str = "tokens"
+
+
+BUILTIN_BUDGETS: Dict[str, Budget] = {
+    "DALL-E_3": Budget(4000, "chars"),
+    "Stable_Diffusion_3": Budget(256, "tokens"),
+    "Flux_1": Budget(512, "tokens"),
+}
+
+
+class PSOParts(NamedTuple):
+    """The PSO values a prompt is built from, in trimming terms."""
+
+    core_concept: str
+    composition: str
+    masters: Tuple[str, ...]
+    keywords: Tuple[str, ...]
+    camera: str
+    artifacts: Tuple[str, ...]
+    reasoning_chain: Tuple[str, ...]
+
+
+@dataclass
+class BudgetReport:
+    """What trimming did to one prompt; ``dropped`` holds (kind, value) pairs."""
+
+    model: str
+    budget: Budget
+    used: int
+    dropped: List[Tuple[str, str]] = field(default_factory=list)
+    truncated_core: bool = False
+    over_budget: bool = False
+
+    @property
+    def trimmed(self) -> bool:
+        return bool(self.dropped) or self.truncated_core
+
+
+def parse_budget(name: str, spec: Any) -> Budget:
+    if not isinstance(spec, Mapping):
+        raise ValueError(f"Budget of {name!r} must be a mapping: {spec!r}")
+    limit, unit = spec.get("limit"), spec.get("unit", "tokens")
+    if not isinstance(limit, int) or isinstance(limit, bool) or limit <= 0:
+        raise ValueError(f"Budget of {name!r} needs a positive integer limit: {limit!r}")
+    if unit not in UNITS:
+        raise ValueError(f"Budget of {name!r} has unknown unit {unit!r}; use one of {UNITS}.")
+    return Budget(limit, unit)
+
+
+def approximate_tokens(text: str) -> int:
+    """
+    BPE-style estimate: about four characters per token, and never fewer
+    tokens than words. Deliberately regex-free; it runs on every render.
+    """
+    return max(len(text.split()), (len(text) + 3) // 4)
+
+
+def _count_words(text: str) -> int:
+    return len(text.split())
+
+
+_COUNTERS: Dict[str, Callable[[str], int]] = {
+    "chars": len,
+    "words": _count_words,
+    "tokens": approximate_tokens,
+}
+
+
+def make_counter(unit: str, cache_size: int = 1024) -> Callable[[str], int]:
+    """A memoised length function for ``unit`` (one per model in the engine)."""
+    return lru_cache(maxsize=cache_size)(_COUNTERS[unit])
+
+
+def ranked_items(parts: PSOParts) -> List[Tuple[str, str]]:
+    """Droppable items, highest priority first."""
+    chain = parts.reasoning_chain
+    weights = {
+        keyword: sum(1 for step in chain if keyword in step) for keyword in parts.keywords
+    }
+    keywords = sorted(
+        range(len(parts.keywords)), key=lambda index: (-weights[parts.keywords[index]], index)
+    )
+    items = [("master", master) for master in parts.masters]
+    items += [("keyword", parts.keywords[index]) for index in keywords]
+    if parts.composition:
+        items.append(("composition", parts.composition))
+    if parts.camera:
+        items.append(("camera", parts.camera))
+    items += [("artifact", artifact) for artifact in parts.artifacts]
+    return items
+
+
+def fit_to_budget(
+    model: str,
+    parts: PSOParts,
+    budget: Budget,
+    count: Callable[[str], int],
+    render: Callable[[PSOParts], str],
+) -> Tuple[str, BudgetReport]:
+    """Trim ``parts`` until ``render`` fits ``budget``; called for over-budget prompts."""
+    report = BudgetReport(model=model, budget=budget, used=0)
+    items = ranked_items(parts)
+
+    def keep(kept: int, core: Optional[str] = None) -> PSOParts:
+        selected = items[:kept]
+        return PSOParts(
+            core_concept=parts.core_concept if core is None else core,
+            composition=next((v for k, v in selected if k == "composition"), ""),
+            masters=tuple(v for k, v in selected if k == "master"),
+            keywords=tuple(v for k, v in selected if k == "keyword"),
+            camera=next((v for k, v in selected if k == "camera"), ""),
+            artifacts=tuple(v for k, v in selected if k == "artifact"),
+            reasoning_chain=parts.reasoning_chain,
+        )
+
+    # Largest number of kept items whose render fits (0 may still not fit).
+    kept = _largest_fitting(len(items), lambda n: count(render(keep(n))) <= budget.limit)
+    report.dropped = items[kept:]
+    candidate = render(keep(kept))
+
+    if count(candidate) > budget.limit:
+        words = parts.core_concept.split()
+
+        def core_fits(n_words: int) -> bool:
+            return count(render(keep(0, " ".join(words[:n_words])))) <= budget.limit
+
+        candidate = render(keep(0, " ".join(words[: _largest_fitting(len(words), core_fits)])))
+        report.truncated_core = True
+    report.used = count(candidate)
+    report.over_budget = report.used > budget.limit
+    return candidate, report
+
+
+def _largest_fitting(upper: int, fits: Callable[[int], bool]) -> int:
+    """Largest ``n`` in ``[0, upper]`` with ``fits(n)``, assuming it is monotone; 0 if none."""
+    low, high = 0, upper
+    while low < high:
+        middle = (low + high + 1) // 2
+        if fits(middle):
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def style_fragment(masters: Sequence[str], keywords: Sequence[str]) -> str:
+    parts = []
+    if masters:
+        parts.append(f"in the style of {', '.join(masters)}")
+    if keywords:
+        parts.append(", ".join(keywords))
+    return ", ".join(parts)
+
+
+def technical_fragment(camera: str, artifacts: Sequence[str]) -> str:
+    parts = []
+    if camera:
+        parts.append(f"shot on {camera}")
+    if artifacts:
+        parts.append(", ".join(artifacts))
+    return ", ".join(parts)
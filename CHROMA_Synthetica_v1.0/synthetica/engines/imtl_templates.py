@@ -0,0 +1,198 @@
+"""
+Declarative IMTL policy templates.
+
+A template is a mapping with a ``joiner`` and a list of ``segments``. Each
+segment is either a format string or ``{"text": ..., "when": [...]}``; a
+segment with ``when`` is only rendered when every listed slot is non-empty.
+Available slots: ``core_concept``, ``composition``, ``style``, ``technical``.
+
+KB profiles under ``7.0_Model_Translation_Layer_Profiles.Model_Capability_Profiles``
+may carry a ``Prompt_Template`` in this format; it overrides the built-in
+template of the same model or adds a new model.
+"""
+
+from __future__ import annotations
+
+import string
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Tuple
+
+SLOTS = frozenset({"core_concept", "composition", "style", "technical"})
+DEFAULT_POLICY = "default"
+_CONVERSIONS = {"s": "str", "r": "repr", "a": "ascii"}
+
+BUILTIN_TEMPLATES: Dict[str, Dict[str, Any]] = {
+    DEFAULT_POLICY: {
+        "joiner": ", ",
+        "segments": [
+            {"text": "{core_concept}", "when": ["core_concept"]},
+            {"text": "{style}", "when": ["style"]},
+            {"text": "{technical}", "when": ["technical"]},
+        ],
+    },
+    "DALL-E_3": {
+        "joiner": "",
+        "segments": [
+            "A detailed visualization depicting: {core_concept}. ",
+            {
+                "text": "The aesthetic style, mood, and influences include: {style}. ",
+                "when": ["style"],
+            },
+            {"text": "Composition guidelines: {composition}. ", "when": ["composition"]},
+            {"text": "Visual characteristics: {technical}. ", "when": ["technical"]},
+        ],
+    },
+    "Midjourney_V6": {
+        "joiner": " -- ",
+        "segments": [
+            "imagine {core_concept}",
+            {"text": "evoke {style}", "when": ["style"]},
+            {"text": "compose with {composition}", "when": ["composition"]},
+            {"text": "render with {technical}", "when": ["technical"]},
+        ],
+    },
+    "Stable_Diffusion_3": {
+        "joiner": "\n",
+        "segments": [
+            "Step 1: Concept - {core_concept}",
+            {"text": "Step 2: Aesthetic references - {style}", "when": ["style"]},
+            {"text": "Step 3: Composition plan - {composition}", "when": ["composition"]},
+            {"text": "Step 4: Technical settings - {technical}", "when": ["technical"]},
+            "Step 5: Output - high fidelity render with balanced exposure.",
+        ],
+    },
+    "Seedream_4_0": {
+        "joiner": "\n",
+        "segments": [
+            "Module A - Scenario: {core_concept}",
+            {"text": "Module B - Visual Language: {style}", "when": ["style"]},
+            {"text": "Module C - Blocking: {composition}", "when": ["composition"]},
+            {"text": "Module D - Capture Specs: {technical}", "when": ["technical"]},
+            "Module E - Delivery: seamless motion-ready frames.",
+        ],
+    },
+    "Nano_Banana": {
+        "joiner": "\n",
+        "segments": [
+            "core: {core_concept}",
+            {"text": "vibe: {style}", "when": ["style"]},
+            {"text": "frame: {composition}", "when": ["composition"]},
+            {"text": "gear: {technical}", "when": ["technical"]},
+            "mood: bold, curious, joyful.",
+        ],
+    },
+    "Flux_1": {
+        "joiner": "\n",
+        "segments": [
+            "Objective: {core_concept}",
+            {"text": "Key visuals: {style}", "when": ["style"]},
+            {"text": "Composition cue: {composition}", "when": ["composition"]},
+            {"text": "Execution notes: {technical}", "when": ["technical"]},
+            "Delivery: cinematic, high-impact frames with crisp detailing.",
+        ],
+    },
+}
+
+
+def policy_key(model: str) -> str:
+    """Dispatch key for a model name (``DALL-E_3`` -> ``dall_e_3``)."""
+    return model.lower().replace("-", "_")
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    """
+    A template parsed once into (format string, required slots) pairs and
+    generated into a plain Python function, so rendering costs a few string
+    concatenations instead of a ``format_map`` per segment.
+    """
+
+    name: str
+    joiner: str
+    segments: Tuple[Tuple[str, Tuple[str, ...]], ...]
+    renderer: Callable[[Mapping], str] = field(repr=False, compare=False)
+
+    def render(self, fields: Mapping) -> str:
+        return self.renderer(fields)
+
+
+def compile_template(name: str, spec: Any) -> CompiledTemplate:
+    """Validate ``spec`` and compile it; raises ``ValueError`` on bad templates."""
+    if not isinstance(spec, Mapping):
+        raise ValueError(f"Template {name!r} must be a mapping: {spec!r}")
+    raw_segments = spec.get("segments")
+    if isinstance(raw_segments, (str, bytes)) or not isinstance(raw_segments, Sequence):
+        raise ValueError(f"Template {name!r} needs a list of segments.")
+
+    segments = []
+    for raw in raw_segments:
+        if isinstance(raw, str):
+            text, when = raw, ()
+        elif isinstance(raw, Mapping) and isinstance(raw.get("text"), str):
+            text = raw["text"]
+            condition = raw.get("when", ())
+            when = (condition,) if isinstance(condition, str) else tuple(condition)
+        else:
+            raise ValueError(f"Template {name!r} has an invalid segment: {raw!r}")
+        unknown = set(when) - SLOTS
+        if unknown:
+            raise ValueError(f"Template {name!r} uses unknown slots: {sorted(unknown)}")
+        segments.append((text, when))
+
+    joiner = str(spec.get("joiner", ""))
+    return CompiledTemplate(
+        name=name,
+        joiner=joiner,
+        segments=tuple(segments),
+        renderer=_generate_renderer(name, joiner, segments),
+    )
+
+
+def _generate_renderer(
+    name: str, joiner: str, segments: Sequence[Tuple[str, Tuple[str, ...]]]
+) -> Callable[[Mapping], str]:
+    # Only validated slot names and generated constant names reach the
+    # source; template text is passed in as constants, never inlined.
+    constants: Dict[str, Any] = {"JOINER": joiner}
+
+    def constant(value: str) -> str:
+        key = f"C{len(constants)}"
+        constants[key] = value
+        return key
+
+    lines = ["def render(fields):"]
+    lines += [f"    {slot} = fields[{slot!r}]" for slot in sorted(SLOTS)]
+    lines.append("    out = []")
+    for text, when in segments:
+        terms = []
+        try:
+            parsed = list(string.Formatter().parse(text))
+        except ValueError as exc:
+            raise ValueError(f"Template {name!r} has a malformed segment {text!r}: {exc}") from exc
+        for literal, slot, format_spec, conversion in parsed:
+            if literal:
+                terms.append(constant(literal))
+            if slot is None:
+                continue
+            if slot not in SLOTS:
+                raise ValueError(f"Template {name!r} uses unknown slot {slot!r}.")
+            if "{" in (format_spec or ""):
+                raise ValueError(f"Template {name!r} uses a nested format spec: {text!r}")
+            if conversion and conversion not in _CONVERSIONS:
+                raise ValueError(f"Template {name!r} uses conversion !{conversion}: {text!r}")
+            expression = f"{_CONVERSIONS[conversion]}({slot})" if conversion else slot
+            if format_spec:
+                expression = f"format({expression}, {constant(format_spec)})"
+            terms.append(expression)
+        append = f"out.append({' + '.join(terms) or repr('')})"
+        if when:
+            lines.append(f"    if {' and '.join(when)}:")
+            lines.append(f"        {append}")
+        else:
+            lines.append(f"    {append}")
+    lines.append("    return JOINER.join(out)")
+
+    exec(compile("\n".join(lines), f"<imtl template {name}>", "exec"), constants)
+    return constants["render"]
+
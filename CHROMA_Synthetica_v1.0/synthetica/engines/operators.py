@@ -1,6 +1,8 @@
 """Operators applied during the reasoning phase of the Synthetica pipeline."""
 
-from typing import Any, Dict, Optional
+import logging
+from functools import partial
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from synthetica.core.knowledge_broker import KnowledgeBroker
 from synthetica.core.models import (
@@ -10,6 +12,30 @@ from synthetica.core.models import (
     CulturalCannibalizeDirective,
     IntermediateTechnicalIntent,
 )
+from synthetica.tracing import span
+
+LOGGER = logging.getLogger(__name__)
+
+# Params naming what an operator overwrites: a later operator with the same
+# name and the same values for these params fully replaces an earlier one.
+OPERATOR_TARGETS: Dict[str, Tuple[str, ...]] = {
+    "Operator_ImposeSymmetry": (),
+    "Operator_DefineHybridism": ("subject_id",),
+    "Operator_CulturalCannibalize": (),
+    "Operator_SetArchetypalDynamics": (),
+}
+
+OPERATOR_PREFIX = "Operator_"
+# Operators whose KB checks can run ahead of time: name -> (check, body).
+_CHECKED_OPERATORS = {
+    "Operator_CulturalCannibalize": ("_check_cultural_cannibalize", "_cultural_cannibalize"),
+    "Operator_SetArchetypalDynamics": (
+        "_check_archetypal_dynamics",
+        "_set_archetypal_dynamics",
+    ),
+}
+
+BoundOperator = Callable[[AbstractCreativeObject, IntermediateTechnicalIntent], bool]
 
 
 class OperatorsEngine:
@@ -26,16 +52,52 @@ class OperatorsEngine:
         params: Optional[Dict[str, Any]] = None,
     ) -> None:
         """Dispatch requested operator if it exists."""
-        params = params or {}
-        if hasattr(self, operator_name):
-            print(f"[Operators] Running operator {operator_name}.")
-            success = getattr(self, operator_name)(aco, iti, **params)
-            if success:
-                aco.applied_operators.append(operator_name)
-        else:
+        self.invoke(operator_name, self.bind(operator_name, params or {}), aco, iti)
+
+    def invoke(
+        self,
+        operator_name: str,
+        operator: Optional[BoundOperator],
+        aco: AbstractCreativeObject,
+        iti: IntermediateTechnicalIntent,
+    ) -> None:
+        """Run an operator from ``bind``; ``None`` records it as not found."""
+        if operator is None:
             iti.reasoning_chain.append(
                 f"Operator '{operator_name}' not found. Skipped."
             )
+            return
+        LOGGER.debug("[Operators] Running operator %s.", operator_name)
+        with span(operator_name, "operator"):
+            success = operator(aco, iti)
+        if success:
+            aco.applied_operators.append(operator_name)
+
+    def operator(self, operator_name: str) -> Optional[Callable[..., bool]]:
+        """The operator method called ``operator_name``, or None."""
+        if not operator_name.startswith(OPERATOR_PREFIX):
+            return None
+        return getattr(self, operator_name, None)
+
+    def bind(
+        self, operator_name: str, params: Dict[str, Any], checked: bool = False
+    ) -> Optional[BoundOperator]:
+        """
+        Bind an operator to ``params``. With ``checked`` the caller already
+        ran ``check`` successfully and the operator skips its KB checks.
+        """
+        method = self.operator(operator_name)
+        if method is None:
+            return None
+        if checked and operator_name in _CHECKED_OPERATORS:
+            method = getattr(self, _CHECKED_OPERATORS[operator_name][1])
+        return partial(method, **params)
+
+    def check(self, operator_name: str, params: Dict[str, Any]) -> Optional[str]:
+        """The reasoning-chain error the operator's KB checks would record, or None."""
+        if operator_name not in _CHECKED_OPERATORS:
+            return None
+        return getattr(self, _CHECKED_OPERATORS[operator_name][0])(**params)
 
     # --- Cognitive operators ---
 
@@ -98,20 +160,38 @@ class OperatorsEngine:
         **_: Any,
     ) -> bool:
         """Capture the cultural cannibalism directive for phase 2."""
+        error = self._check_cultural_cannibalize(devouring_culture, devoured_element)
+        if error:
+            iti.reasoning_chain.append(error)
+            return False
+        return self._cultural_cannibalize(
+            aco, iti, devouring_culture, devoured_element, synthesis_mode
+        )
+
+    def _check_cultural_cannibalize(
+        self, devouring_culture: str, devoured_element: str, **_: Any
+    ) -> Optional[str]:
         if not self.broker.get_entry(devouring_culture):
-            iti.reasoning_chain.append(
+            return (
                 "Conceptual (Anthropophagy) error: "
                 f"culture '{devouring_culture}' not found."
             )
-            return False
-
         if not self.broker.get_entry(devoured_element):
-            iti.reasoning_chain.append(
+            return (
                 "Conceptual (Anthropophagy) error: "
                 f"element '{devoured_element}' not found."
             )
-            return False
+        return None
 
+    def _cultural_cannibalize(
+        self,
+        aco: AbstractCreativeObject,
+        iti: IntermediateTechnicalIntent,
+        devouring_culture: str,
+        devoured_element: str,
+        synthesis_mode: str = "Aesthetic",
+        **_: Any,
+    ) -> bool:
         directive = CulturalCannibalizeDirective(
             devouring_culture=devouring_culture,
             devoured_element=devoured_element,
@@ -135,6 +215,13 @@ class OperatorsEngine:
         **_: Any,
     ) -> bool:
         """Set archetypal dynamics on the ACO and surface it to the ITI."""
+        error = self._check_archetypal_dynamics(shadow_state)
+        if error:
+            iti.reasoning_chain.append(error)
+            return False
+        return self._set_archetypal_dynamics(aco, iti, shadow_state, manifestation, trickster)
+
+    def _check_archetypal_dynamics(self, shadow_state: str, **_: Any) -> Optional[str]:
         valid_states_path = (
             "2.0_Semiotics_and_Psychology_Database."
             "2.8_Archetypal_Dynamics_Framework (Jungian)."
@@ -143,12 +230,21 @@ class OperatorsEngine:
         valid_states = self.broker.get_entry(valid_states_path, default=[])
 
         if shadow_state not in valid_states:
-            iti.reasoning_chain.append(
+            return (
                 "Conceptual (Archetypal Dynamics) error: "
                 f"invalid state '{shadow_state}'. Allowed: {valid_states}."
             )
-            return False
+        return None
 
+    def _set_archetypal_dynamics(
+        self,
+        aco: AbstractCreativeObject,
+        iti: IntermediateTechnicalIntent,
+        shadow_state: str,
+        manifestation: Optional[str] = None,
+        trickster: Optional[str] = None,
+        **_: Any,
+    ) -> bool:
         dynamics = ACOArchetypalDynamics(
             shadow_integration_state=shadow_state,
             shadow_manifestation=manifestation,
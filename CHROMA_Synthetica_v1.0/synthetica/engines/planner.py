@@ -0,0 +1,243 @@
+"""
+Operator pipeline planning.
+
+``PipelinePlanner.plan`` turns an ``operator_pipeline`` into an
+``OperatorPlan`` once:
+
+* specs are validated against the operator signatures and the catalog at
+  ``4.0_Creative_Operators_and_Engines.4.4_Conceptual_Operators``;
+* KB checks (paths, allowed shadow states) run at plan time and operators
+  are bound to their params, so running a plan does no name resolution;
+* operators fully overwritten by a later one (see ``OPERATOR_TARGETS``) are
+  dropped, e.g. the first of two ``Operator_SetArchetypalDynamics``.
+
+Plans are cached per pipeline and KB snapshot version; repeated runs of the
+same pipeline reuse the plan.
+"""
+
+from __future__ import annotations
+
+import inspect
+import logging
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Hashable, List, Optional, Sequence, Tuple
+
+from synthetica.core.cache import MISSING, LRUCache
+from synthetica.core.knowledge_broker import record_reads
+from synthetica.core.models import AbstractCreativeObject, IntermediateTechnicalIntent
+from synthetica.engines.operators import OPERATOR_TARGETS, BoundOperator, OperatorsEngine
+
+LOGGER = logging.getLogger(__name__)
+
+CATALOG_PATH = "4.0_Creative_Operators_and_Engines.4.4_Conceptual_Operators"
+DEFAULT_PLAN_CACHE_SIZE = 256
+
+
+class PipelineError(ValueError):
+    """Raised for pipelines that cannot run (bad spec shape, missing params)."""
+
+
+@dataclass(frozen=True)
+class PlannedOperator:
+    index: int  # position in the original pipeline
+    name: str
+    params: Mapping[str, Any]
+    call: Optional[BoundOperator]  # None: unknown operator, recorded as skipped
+    check_error: Optional[str] = None
+    kb_reads: Tuple[str, ...] = ()  # broker paths read by the plan-time check
+
+
+@dataclass
+class OperatorPlan:
+    """A validated, bound and deduplicated operator pipeline."""
+
+    steps: Tuple[PlannedOperator, ...]
+    engine: OperatorsEngine = field(repr=False)
+    removed: Tuple[Tuple[int, str], ...] = ()  # (pipeline index, reason)
+    warnings: Tuple[str, ...] = ()
+
+    def run(self, aco: AbstractCreativeObject, iti: IntermediateTechnicalIntent) -> None:
+        for step in self.steps:
+            self.engine.invoke(step.name, step.call, aco, iti)
+
+
+class PipelinePlanner:
+    """Compiles operator pipelines into cached ``OperatorPlan`` objects."""
+
+    def __init__(
+        self, engine: OperatorsEngine, cache_size: Optional[int] = DEFAULT_PLAN_CACHE_SIZE
+    ):
+        self.engine = engine
+        self.broker = engine.broker
+        self._cache = LRUCache(max_entries=cache_size) if cache_size != 0 else None
+        self._lock = threading.Lock()
+        self._signatures: Dict[str, Tuple[FrozenSet[str], FrozenSet[str], bool]] = {}
+        # Most callers rerun one pipeline; it is checked before the LRU.
+        self._last: Optional[Tuple[Hashable, OperatorPlan]] = None
+
+    def plan(self, pipeline: Sequence[Mapping[str, Any]]) -> OperatorPlan:
+        """Validate and compile ``pipeline``; raises ``PipelineError`` if it cannot run."""
+        key = _pipeline_key(pipeline)
+        if key is not None and self._cache is not None:
+            key = (self.broker.snapshot().version, key)
+            last = self._last
+            if last is not None and last[0] == key:
+                return last[1]
+            with self._lock:
+                cached = self._cache.get(key)
+            if cached is not MISSING:
+                self._last = (key, cached)
+                return cached
+
+        plan = self._compile(pipeline)
+        for warning in plan.warnings:
+            LOGGER.warning("[Planner] %s", warning)
+        if key is not None and self._cache is not None:
+            with self._lock:
+                self._cache.put(key, plan)
+            self._last = (key, plan)
+        return plan
+
+    def clear_cache(self) -> None:
+        self._last = None
+        if self._cache is not None:
+            with self._lock:
+                self._cache.clear()
+
+    def _compile(self, pipeline: Sequence[Mapping[str, Any]]) -> OperatorPlan:
+        catalog = self.broker.get_entry(CATALOG_PATH)
+        catalog = catalog if isinstance(catalog, Mapping) else {}
+        errors: List[str] = []
+        warnings: List[str] = []
+        steps: List[PlannedOperator] = []
+
+        for index, spec in enumerate(pipeline):
+            label = f"pipeline[{index}]"
+            if not isinstance(spec, Mapping):
+                errors.append(f"{label}: spec must be a mapping, got {spec!r}.")
+                continue
+            name = spec.get("name")
+            if not name:
+                warnings.append(f"{label}: spec without a name skipped.")
+                continue
+            params = spec.get("params") or {}
+            if not isinstance(params, Mapping):
+                errors.append(f"{label} {name}: params must be a mapping, got {params!r}.")
+                continue
+            params = dict(params)
+
+            signature = self._signature(name)
+            if signature is None:
+                status = "not implemented" if name in catalog else "unknown"
+                warnings.append(f"{label}: operator '{name}' is {status}; it will be skipped.")
+                steps.append(PlannedOperator(index, name, params, None))
+                continue
+            required, accepted, takes_any = signature
+            missing = sorted(required - params.keys())
+            if missing:
+                errors.append(f"{label} {name}: missing parameter(s) {missing}.")
+                continue
+            declared = accepted | _catalog_params(catalog.get(name))
+            ignored = sorted(set(params) - declared)
+            if ignored and takes_any:
+                warnings.append(f"{label} {name}: ignoring unknown parameter(s) {ignored}.")
+            elif ignored:
+                errors.append(f"{label} {name}: unknown parameter(s) {ignored}.")
+                continue
+
+            with record_reads() as paths:
+                error = self.engine.check(name, params)
+            call = self.engine.bind(name, params, checked=True) if error is None else _failed(error)
+            steps.append(PlannedOperator(index, name, params, call, error, tuple(sorted(paths))))
+
+        if errors:
+            raise PipelineError("Invalid operator pipeline: " + " ".join(errors))
+        kept, removed = _drop_overwritten(steps)
+        return OperatorPlan(tuple(kept), self.engine, tuple(removed), tuple(warnings))
+
+    def _signature(self, name: str) -> Optional[Tuple[FrozenSet[str], FrozenSet[str], bool]]:
+        """(required params, accepted params, takes **kwargs) of an operator, or None."""
+        if name in self._signatures:
+            return self._signatures[name]
+        method = self.engine.operator(name)
+        if method is None:
+            return None
+        parameters = list(inspect.signature(method).parameters.values())[2:]  # aco, iti
+        named = [p for p in parameters if p.kind in (p.POSITIONAL_OR_KEYWORD, p.KEYWORD_ONLY)]
+        signature = (
+            frozenset(p.name for p in named if p.default is p.empty),
+            frozenset(p.name for p in named),
+            any(p.kind is p.VAR_KEYWORD for p in parameters),
+        )
+        self._signatures[name] = signature
+        return signature
+
+
+def _failed(message: str) -> BoundOperator:
+    """Bound operator for a spec whose KB check failed: only records the error."""
+
+    def call(aco: AbstractCreativeObject, iti: IntermediateTechnicalIntent) -> bool:
+        iti.reasoning_chain.append(message)
+        return False
+
+    return call
+
+
+def _catalog_params(entry: Any) -> FrozenSet[str]:
+    if not isinstance(entry, Mapping):
+        return frozenset()
+    names = set(entry.get("Inputs") or ())
+    if isinstance(entry.get("Parameters"), Mapping):
+        names.update(entry["Parameters"])
+    return frozenset(name for name in names if isinstance(name, str))
+
+
+def _drop_overwritten(
+    steps: List[PlannedOperator],
+) -> Tuple[List[PlannedOperator], List[Tuple[int, str]]]:
+    """
+    Walk backwards keeping the last operator per target; earlier ones are
+    dropped when that later operator passed its KB checks (a failing one
+    changes nothing, so it cannot overwrite).
+    """
+    kept: List[PlannedOperator] = []
+    removed: List[Tuple[int, str]] = []
+    overwritten_by: Dict[Hashable, int] = {}
+    for step in reversed(steps):
+        target = _target(step)
+        if target is not None and target in overwritten_by:
+            reason = f"{step.name} overwritten by pipeline[{overwritten_by[target]}]"
+            removed.append((step.index, reason))
+            continue
+        if target is not None and step.check_error is None:
+            overwritten_by[target] = step.index
+        kept.append(step)
+    kept.reverse()
+    removed.reverse()
+    return kept, removed
+
+
+def _target(step: PlannedOperator) -> Optional[Hashable]:
+    if step.call is None or step.name not in OPERATOR_TARGETS:
+        return None
+    try:
+        values = tuple(step.params.get(param) for param in OPERATOR_TARGETS[step.name])
+        hash(values)
+    except TypeError:
+        return None
+    return (step.name, values)
+
+
+def _pipeline_key(pipeline: Sequence[Mapping[str, Any]]) -> Optional[Hashable]:
+    """Hashable form of ``pipeline``; None when it holds unhashable values."""
+    try:
+        key = tuple(
+            (spec.get("name"), tuple((spec.get("params") or {}).items()))
+            for spec in pipeline
+        )
+        hash(key)
+    except (AttributeError, TypeError):
+        return None
+    return key
@@ -0,0 +1,135 @@
+"""
+Logging setup for the Synthetica pipeline.
+
+Every module logs through ``logging.getLogger(__name__)`` under the
+``synthetica`` namespace, with %-style arguments so messages (including the
+ITI/PSO renders) are only formatted when a handler will emit them. Until an
+application calls ``configure_logging`` only warnings reach the console.
+
+Verbosity levels: 0 = warnings only, 1 = progress (INFO), 2 = full pipeline
+trace including intermediate objects (DEBUG).
+
+``configure_logging``/``set_verbosity`` own the process-wide level. Code that
+wants less output for one object (e.g. a quiet orchestrator) wraps its work
+in ``log_level``; the handlers installed here drop records below that level
+for the current thread/task only.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Iterator, Optional, Union
+
+ROOT_LOGGER = "synthetica"
+
+_LEVELS = {0: logging.WARNING, 1: logging.INFO, 2: logging.DEBUG}
+_HANDLER_TAG = "_synthetica_handler"
+_SCOPED_LEVEL: ContextVar[Optional[int]] = ContextVar("synthetica_log_level", default=None)
+
+
+def level_for(verbosity: int, quiet: bool = False) -> int:
+    if quiet:
+        return logging.WARNING
+    return _LEVELS[max(0, min(verbosity, 2))]
+
+
+def set_verbosity(verbosity: int = 1, quiet: bool = False) -> None:
+    """Change the package log level without touching handlers."""
+    logging.getLogger(ROOT_LOGGER).setLevel(level_for(verbosity, quiet))
+
+
+@contextmanager
+def log_level(level: Optional[int]) -> Iterator[None]:
+    """Drop records below ``level`` in this context while the block runs."""
+    if level is None:
+        yield
+        return
+    token = _SCOPED_LEVEL.set(level)
+    try:
+        yield
+    finally:
+        _SCOPED_LEVEL.reset(token)
+
+
+class ScopedLevelFilter(logging.Filter):
+    """Handler filter applying the level set by ``log_level``."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        level = _SCOPED_LEVEL.get()
+        return level is None or record.levelno >= level
+
+
+def configure_logging(
+    verbosity: int = 1,
+    quiet: bool = False,
+    json_path: Optional[Union[str, Path]] = None,
+    console: bool = True,
+) -> logging.Logger:
+    """
+    Attach console and/or JSON-lines handlers to the ``synthetica`` logger.
+    Calling it again replaces the handlers it installed previously.
+    """
+    logger = logging.getLogger(ROOT_LOGGER)
+    for handler in list(logger.handlers):
+        if getattr(handler, _HANDLER_TAG, False):
+            logger.removeHandler(handler)
+            handler.close()
+
+    if console:
+        console_handler = _StdoutHandler()
+        console_handler.setFormatter(logging.Formatter("%(message)s"))
+        _install(logger, console_handler)
+    if json_path is not None:
+        json_handler = logging.FileHandler(json_path, encoding="utf-8")
+        json_handler.setFormatter(JsonLinesFormatter())
+        _install(logger, json_handler)
+
+    logger.setLevel(level_for(verbosity, quiet))
+    logger.propagate = False
+    return logger
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One JSON object per record; ``extra=`` fields are included as-is."""
+
+    _RESERVED = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in self._RESERVED:
+                payload[key] = value
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class _StdoutHandler(logging.StreamHandler):
+    """Writes to whatever ``sys.stdout`` is at emit time (redirect-friendly)."""
+
+    def __init__(self) -> None:
+        super().__init__(sys.stdout)
+
+    @property  # type: ignore[override]
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value) -> None:
+        pass
+
+
+def _install(logger: logging.Logger, handler: logging.Handler) -> None:
+    setattr(handler, _HANDLER_TAG, True)
+    handler.addFilter(ScopedLevelFilter())
+    logger.addHandler(handler)
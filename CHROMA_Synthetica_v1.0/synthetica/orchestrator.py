@@ -1,40 +1,120 @@
-import json
+import logging
 import os
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-from synthetica.core.knowledge_broker import KnowledgeBroker
-from synthetica.core.models import AbstractCreativeObject
+from synthetica.core.registry import KBRegistry, shared_registry
+from synthetica.core.models import AbstractCreativeObject, ProjectStateObject
 from synthetica.core.compiler import NexusCompiler
 from synthetica.services.enrichment import EnrichmentService
 from synthetica.engines.imtl import IMTLPolicyEngine
+from synthetica.engines.imtl_budget import BudgetReport
+from synthetica.logging_config import level_for, log_level
+from synthetica.tracing import Trace, Tracer, span
+
+LOGGER = logging.getLogger(__name__)
+
+PHASES = ("compile", "enrich", "translate")
+# ACOs per translate_batch call (and per job sent to a batch worker).
+BATCH_CHUNK_SIZE = 16
+
+
+@dataclass
+class BatchReport:
+    """Throughput and per-phase wall time for one ``run_batch`` call."""
+
+    acos: int = 0
+    prompts: int = 0
+    workers: int = 1
+    elapsed_seconds: float = 0.0
+    phase_seconds: Dict[str, float] = field(default_factory=lambda: dict.fromkeys(PHASES, 0.0))
+
+    @property
+    def acos_per_second(self) -> float:
+        return self.acos / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def summary(self) -> str:
+        phases = ", ".join(f"{name} {seconds:.3f}s" for name, seconds in self.phase_seconds.items())
+        return (
+            f"[Orchestrator] Batch: {self.acos} ACOs / {self.prompts} prompts in "
+            f"{self.elapsed_seconds:.3f}s ({self.acos_per_second:.1f} ACOs/sec, "
+            f"{self.workers} worker(s)). Phases: {phases}."
+        )
+
+
+class WorkflowResult(dict):
+    """
+    ``{model: prompt}`` mapping; ``trace`` holds the spans when tracing ran
+    and ``budget_reports`` what was dropped from prompts trimmed to a budget.
+    """
+
+    def __init__(
+        self,
+        results: Dict[str, str],
+        trace: Optional[Trace] = None,
+        budget_reports: Optional[Dict[str, BudgetReport]] = None,
+    ) -> None:
+        super().__init__(results)
+        self.trace = trace
+        self.budget_reports = budget_reports or {}
+
+
+@dataclass
+class BatchResult:
+    """Per-ACO ``{model: prompt}`` results in input order, plus the report."""
+
+    results: List[Dict[str, str]]
+    report: BatchReport
 
 
 class ChromaSyntheticaOrchestrator:
     """Core orchestrator for CHROMA Synthetica v1.1 (unified broker)."""
 
-    def __init__(self, kb_path: str = "kb/synthetica_kb_v1.1.json"):
-        print(
+    def __init__(
+        self,
+        kb_path: str = "kb/synthetica_kb_v1.1.json",
+        registry: Optional[KBRegistry] = None,
+        verbosity: Optional[int] = None,
+        quiet: bool = False,
+        trace: bool = False,
+    ):
+        # verbosity/quiet (0 warnings, 1 progress, 2 full trace) only narrow
+        # what this instance logs; the process-wide level stays with
+        # configure_logging. None follows it.
+        self.log_level: Optional[int] = None
+        if verbosity is not None or quiet:
+            self.log_level = level_for(1 if verbosity is None else verbosity, quiet)
+
+        self.trace = trace
+        with log_level(self.log_level):
+            self._boot(kb_path, registry)
+
+    def _boot(self, kb_path: str, registry: Optional[KBRegistry]) -> None:
+        LOGGER.info(
             "[Orchestrator] Initialising CHROMA Synthetica v1.1 "
             "(Active Generative Philosophy)."
         )
 
-        kb_data = self._load_kb(kb_path)
+        resolved_kb = self._resolve_kb_path(kb_path)
+        self.kb_path = resolved_kb
 
-        print("\nBooting Knowledge Broker:")
-        self.broker = KnowledgeBroker(kb_data)
+        LOGGER.info("\nBooting Knowledge Broker:")
+        # Shared and read-only; use self.broker.fork() for a writable copy.
+        self.broker = (registry or shared_registry()).broker_for(resolved_kb)
 
-        print("\nBooting Services:")
+        LOGGER.info("\nBooting Services:")
         self.compiler = NexusCompiler(self.broker)
         self.enrichment_service = EnrichmentService(self.broker)
         self.imtl = IMTLPolicyEngine(self.broker)
 
-        print(
-            f"\n[Orchestrator] System online. "
-            f"KB version: {self.broker.get_entry('KB_Version')}"
+        LOGGER.info(
+            "\n[Orchestrator] System online. KB version: %s",
+            self.broker.get_entry("KB_Version"),
         )
 
-    def _load_kb(self, kb_path: str) -> Dict[str, Any]:
+    def _resolve_kb_path(self, kb_path: str) -> Path:
         def expand_candidates(raw_path: str) -> List[Path]:
             if not raw_path:
                 return []
@@ -64,8 +144,7 @@ class ChromaSyntheticaOrchestrator:
 
         for candidate in search_paths:
             if candidate.exists():
-                with candidate.open("r", encoding="utf-8") as handle:
-                    return json.load(handle)
+                return candidate
 
         search_list = "\n  - ".join(str(path) for path in search_paths)
         raise FileNotFoundError(
@@ -81,39 +160,213 @@ class ChromaSyntheticaOrchestrator:
         aco: AbstractCreativeObject,
         target_models: List[str],
         operator_pipeline: Optional[List[Dict[str, Any]]] = None,
-    ) -> Dict[str, str]:
+        trace: Optional[bool] = None,
+    ) -> WorkflowResult:
         """
         Execute the hybrid mind workflow.
+        With tracing (``trace`` or the orchestrator default) the result's
+        ``trace`` holds the spans of every phase, operator and model.
         """
-        print("\n" + "=" * 70)
-        print("      STARTING CHROMA SYNTHETICA v1.1 WORKFLOW      ")
-        print("=" * 70)
+        with log_level(self.log_level):
+            if not (self.trace if trace is None else trace):
+                return self._run_workflow(aco, target_models, operator_pipeline)
+
+            tracer = Tracer()
+            with tracer.activate():
+                result = self._run_workflow(aco, target_models, operator_pipeline)
+        result.trace = tracer.trace
+        return result
+
+    def _run_workflow(
+        self,
+        aco: AbstractCreativeObject,
+        target_models: List[str],
+        operator_pipeline: Optional[List[Dict[str, Any]]],
+    ) -> WorkflowResult:
+        LOGGER.info(
+            "\n%s\n      STARTING CHROMA SYNTHETICA v1.1 WORKFLOW      \n%s",
+            "=" * 70,
+            "=" * 70,
+        )
 
         operator_pipeline = operator_pipeline or []
 
-        print("\n--- PHASE 1: ABSTRACT REASONING (Compiler + Operators) ---")
-        iti = self.compiler.compile_to_iti(aco, operator_pipeline)
+        # Pin one KB snapshot so concurrent writers cannot change data mid-run.
+        with self.broker.pinned(), span("run_workflow", "workflow", aco_id=aco.aco_id):
+            LOGGER.info("\n--- PHASE 1: ABSTRACT REASONING (Compiler + Operators) ---")
+            iti = self.compiler.compile_to_iti(aco, operator_pipeline)
 
-        print("\n--- INTERMEDIATE STATE (ITI) ---")
-        print(iti)
+            # The renders are only built when DEBUG output is enabled.
+            LOGGER.debug("\n--- INTERMEDIATE STATE (ITI) ---\n%s", iti)
 
-        print("\n--- PHASE 2: TECHNICAL ENRICHMENT (EnrichmentService) ---")
-        pso = self.enrichment_service.enrich_to_pso(iti)
+            LOGGER.info("\n--- PHASE 2: TECHNICAL ENRICHMENT (EnrichmentService) ---")
+            pso = self.enrichment_service.enrich_to_pso(iti)
 
-        print("\n--- FINAL STATE (PSO) ---")
-        print(pso)
+            LOGGER.debug("\n--- FINAL STATE (PSO) ---\n%s", pso)
 
-        print("\n--- PHASE 3: TRANSLATION (IMTL) ---")
-        results: Dict[str, str] = {}
-        for model in target_models:
-            final_prompt = self.imtl.translate(pso, model)
-            results[model] = final_prompt
-            self._generate_report(model, final_prompt)
+            LOGGER.info("\n--- PHASE 3: TRANSLATION (IMTL) ---")
+            return self._translate(pso, target_models)
 
-        return results
+    def _translate(self, pso: ProjectStateObject, target_models: List[str]) -> WorkflowResult:
+        with span("translate_models", "phase3", models=len(target_models)):
+            translations = self.imtl.translate_many_detailed(pso, target_models)
+        budget_reports = {}
+        for model, translation in translations.items():
+            self._generate_report(model, translation.prompt)
+            if translation.report is not None and translation.report.trimmed:
+                budget_reports[model] = translation.report
+                LOGGER.info(
+                    "[IMTL] %s prompt trimmed to %d/%d %s; dropped: %s",
+                    model,
+                    translation.report.used,
+                    translation.report.budget.limit,
+                    translation.report.budget.unit,
+                    translation.report.dropped,
+                )
+        prompts = {model: translation.prompt for model, translation in translations.items()}
+        return WorkflowResult(prompts, budget_reports=budget_reports)
+
+    def run_batch(
+        self,
+        acos: Sequence[AbstractCreativeObject],
+        target_models: List[str],
+        operator_pipeline: Optional[List[Dict[str, Any]]] = None,
+        workers: int = 1,
+        verbose: bool = False,
+    ) -> BatchResult:
+        """
+        Run many ACOs through the workflow and return results in input order.
+        Per-item messages are DEBUG only; the throughput report is logged at
+        INFO when ``verbose`` (DEBUG otherwise).
+        """
+        report = BatchReport(workers=max(1, workers))
+        results: List[Optional[Dict[str, str]]] = [None] * len(acos)
+        started = time.perf_counter()
+        for index, item_results, timings in self._iter_batch(
+            acos, target_models, operator_pipeline, workers
+        ):
+            results[index] = item_results
+            report.acos += 1
+            report.prompts += len(item_results)
+            for phase, seconds in timings.items():
+                report.phase_seconds[phase] += seconds
+        report.elapsed_seconds = time.perf_counter() - started
+        with log_level(self.log_level):
+            LOGGER.log(logging.INFO if verbose else logging.DEBUG, "%s", report.summary())
+        return BatchResult(results, report)  # type: ignore[arg-type]
+
+    def iter_batch(
+        self,
+        acos: Iterable[AbstractCreativeObject],
+        target_models: List[str],
+        operator_pipeline: Optional[List[Dict[str, Any]]] = None,
+        workers: int = 1,
+    ) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """
+        Yield ``(input index, results)`` pairs as soon as they complete; ACOs
+        are processed in chunks of ``BATCH_CHUNK_SIZE``.
+        """
+        for index, item_results, _ in self._iter_batch(
+            acos, target_models, operator_pipeline, workers
+        ):
+            yield index, item_results
+
+    def _iter_batch(
+        self,
+        acos: Iterable[AbstractCreativeObject],
+        target_models: List[str],
+        operator_pipeline: Optional[List[Dict[str, Any]]],
+        workers: int,
+    ) -> Iterator[Tuple[int, Dict[str, str], Dict[str, float]]]:
+        operator_pipeline = operator_pipeline or []
+        chunks = _chunked(enumerate(acos), BATCH_CHUNK_SIZE)
+        if workers <= 1:
+            # Pin one snapshot per chunk so lookups stay cached across its
+            # items; the pin (and log level) is released before results reach
+            # the consumer.
+            for chunk in chunks:
+                with log_level(self.log_level), self.broker.pinned():
+                    finished = self._run_phases(chunk, target_models, operator_pipeline)
+                yield from finished
+            return
+
+        import multiprocessing  # only batch fan-out needs it
+
+        # Workers inherit the registry (and its loaded KB) when forked.
+        context = multiprocessing.get_context(
+            "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+        )
+        jobs = ((chunk, target_models, operator_pipeline) for chunk in chunks)
+        init_args = (str(self.kb_path), self.log_level)
+        with context.Pool(workers, _init_batch_worker, init_args) as pool:
+            for finished in pool.imap_unordered(_run_batch_chunk, jobs):
+                yield from finished
+
+    def _run_phases(
+        self,
+        chunk: List[Tuple[int, AbstractCreativeObject]],
+        target_models: List[str],
+        operator_pipeline: List[Dict[str, Any]],
+    ) -> List[Tuple[int, Dict[str, str], Dict[str, float]]]:
+        """
+        Compile and enrich each ACO of ``chunk``, then translate the whole
+        chunk in one ``translate_batch`` call. Translation time is split
+        evenly across the chunk's items.
+        """
+        clock = time.perf_counter
+        psos = []
+        timings = []
+        for _, aco in chunk:
+            started = clock()
+            iti = self.compiler.compile_to_iti(aco, operator_pipeline)
+            compiled = clock()
+            psos.append(self.enrichment_service.enrich_to_pso(iti))
+            timings.append({"compile": compiled - started, "enrich": clock() - compiled})
+        started = clock()
+        results = self.imtl.translate_batch(psos, target_models)
+        translate_share = (clock() - started) / max(1, len(chunk))
+        for item_timings in timings:
+            item_timings["translate"] = translate_share
+        return [
+            (index, item_results, item_timings)
+            for (index, _), item_results, item_timings in zip(chunk, results, timings)
+        ]
 
     def _generate_report(self, model: str, prompt: str) -> None:
-        print("\n" + "-" * 70)
-        print(f" Optimised Prompt (IMTL -> {model}):\n")
-        print(prompt)
-        print("-" * 70)
+        LOGGER.info(
+            "\n%s\n Optimised Prompt (IMTL -> %s):\n\n%s\n%s",
+            "-" * 70,
+            model,
+            prompt,
+            "-" * 70,
+        )
+
+
+_batch_worker: Optional[ChromaSyntheticaOrchestrator] = None
+
+
+def _init_batch_worker(kb_path: str, level: Optional[int]) -> None:
+    global _batch_worker
+    with log_level(level):
+        _batch_worker = ChromaSyntheticaOrchestrator(kb_path=kb_path)
+    _batch_worker.log_level = level
+
+
+def _run_batch_chunk(
+    job: Tuple[List[Tuple[int, AbstractCreativeObject]], List[str], List[Dict[str, Any]]]
+) -> List[Tuple[int, Dict[str, str], Dict[str, float]]]:
+    chunk, target_models, operator_pipeline = job
+    assert _batch_worker is not None
+    with log_level(_batch_worker.log_level), _batch_worker.broker.pinned():
+        return _batch_worker._run_phases(chunk, target_models, operator_pipeline)
+
+
+def _chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    chunk: List[Any] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
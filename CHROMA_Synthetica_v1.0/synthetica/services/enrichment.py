@@ -1,6 +1,8 @@
 """Phase 2 (technical enrichment) for the CHROMA Synthetica pipeline."""
 
-from typing import List, Optional
+import logging
+from itertools import islice
+from typing import Iterable, List, Optional
 
 from synthetica.core.knowledge_broker import KnowledgeBroker
 from synthetica.core.models import (
@@ -9,6 +11,9 @@ from synthetica.core.models import (
     IntermediateTechnicalIntent,
     ProjectStateObject,
 )
+from synthetica.tracing import span
+
+LOGGER = logging.getLogger(__name__)
 
 
 class EnrichmentService:
@@ -16,11 +21,11 @@ class EnrichmentService:
 
     def __init__(self, broker: KnowledgeBroker):
         self.broker = broker
-        print("[EnrichmentService] Phase 2 (Enrichment) initialised.")
+        LOGGER.debug("[EnrichmentService] Phase 2 (Enrichment) initialised.")
 
     def enrich_to_pso(self, iti: IntermediateTechnicalIntent) -> ProjectStateObject:
         """Build a PSO from the data surfaced during phase 1."""
-        print("[EnrichmentService] Phase 2: enriching IntermediateTechnicalIntent.")
+        LOGGER.debug("[EnrichmentService] Phase 2: enriching IntermediateTechnicalIntent.")
 
         pso = ProjectStateObject(source_aco_id=iti.source_aco_id)
         pso.core_concept = iti.core_concept
@@ -29,12 +34,17 @@ class EnrichmentService:
         pso.reasoning_chain.append("Enrichment phase started.")
 
         directives = iti.abstract_directives
-        self._resolve_anthropophagy(directives.antropofagia_directive, pso)
-        self._resolve_archetypal_dynamics(directives.psychological_state, pso)
-        self._resolve_hybridism_links(iti, pso)
-        self._resolve_technical_package(directives, pso)
-
-        print("[EnrichmentService] Phase 2 complete. PSO generated.")
+        with span("enrich_to_pso", "phase2"):
+            with span("_resolve_anthropophagy", "phase2"):
+                self._resolve_anthropophagy(directives.antropofagia_directive, pso)
+            with span("_resolve_archetypal_dynamics", "phase2"):
+                self._resolve_archetypal_dynamics(directives.psychological_state, pso)
+            with span("_resolve_hybridism_links", "phase2"):
+                self._resolve_hybridism_links(iti, pso)
+            with span("_resolve_technical_package", "phase2"):
+                self._resolve_technical_package(directives, pso)
+
+        LOGGER.debug("[EnrichmentService] Phase 2 complete. PSO generated.")
         return pso
 
     def _resolve_anthropophagy(
@@ -106,8 +116,9 @@ class EnrichmentService:
         pso.camera_package = {"camera": "High-fidelity digital render"}
 
     @staticmethod
-    def _string_list(values: List[object]) -> List[str]:
-        return [str(value) for value in values if isinstance(value, (str, bytes))]
+    def _string_list(values: Iterable[object], limit: Optional[int] = None) -> List[str]:
+        strings = (str(value) for value in values if isinstance(value, (str, bytes)))
+        return list(islice(strings, limit))
 
     @staticmethod
     def _normalise_label(raw: str) -> str:
@@ -136,10 +147,10 @@ class EnrichmentService:
         )
 
         devouring_keywords = self._string_list(
-            self.broker.get_flat_list(directive.devouring_culture)
+            self.broker.iter_flat(directive.devouring_culture), limit=3
         )
         devoured_keywords = self._string_list(
-            self.broker.get_flat_list(directive.devoured_element)
+            self.broker.iter_flat(directive.devoured_element), limit=2
         )
 
         if not devouring_keywords:
@@ -151,8 +162,8 @@ class EnrichmentService:
             f"{devouring_label} converges with {devoured_label} "
             f"({directive.synthesis_mode.lower()} synthesis)"
         ]
-        synthesis.extend(devouring_keywords[:3])
-        synthesis.extend(devoured_keywords[:2])
+        synthesis.extend(devouring_keywords)
+        synthesis.extend(devoured_keywords)
 
         if directive.synthesis_mode == "Narrative":
             synthesis.append(f"Narrative throughline led by {devouring_label}")
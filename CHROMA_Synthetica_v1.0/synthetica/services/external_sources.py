@@ -6,7 +6,6 @@ import logging
 from dataclasses import dataclass
 from typing import Dict, Optional
 import os
-import requests
 
 LOGGER = logging.getLogger(__name__)
 
@@ -22,6 +21,13 @@ class ExternalResult:
 DEFAULT_TIMEOUT = float(os.getenv("SYNTHETICA_HTTP_TIMEOUT", "5"))
 
 
+def _http():
+    """Import ``requests`` on first fetch; it is only needed for gap filling."""
+    import requests
+
+    return requests
+
+
 class WikipediaConnector:
     """Fetches summaries from Wikipedia REST API."""
 
@@ -33,7 +39,7 @@ class WikipediaConnector:
     def fetch(self, topic: str) -> Optional[ExternalResult]:
         slug = topic.replace(" ", "_")
         try:
-            resp = requests.get(self.API_URL.format(title=slug), timeout=self._timeout)
+            resp = _http().get(self.API_URL.format(title=slug), timeout=self._timeout)
             if resp.status_code != 200:
                 return None
             data = resp.json()
@@ -60,6 +66,7 @@ class WikidataConnector:
 
     def fetch(self, topic: str) -> Optional[ExternalResult]:
         try:
+            requests = _http()
             search_resp = requests.get(
                 self.SEARCH_URL,
                 params={
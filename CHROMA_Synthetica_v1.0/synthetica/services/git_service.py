@@ -1,6 +1,9 @@
 """Simulated Git integration layer."""
 
 import datetime
+import logging
+
+LOGGER = logging.getLogger(__name__)
 
 
 class GitService:
@@ -11,20 +14,22 @@ class GitService:
 
     def __init__(self, repo_name: str = "chroma/synthetica-kb") -> None:
         self.repo_name = repo_name
-        print("[GitService] Inicializado em modo de simulacao.")
+        LOGGER.info("[GitService] Inicializado em modo de simulacao.")
 
     def create_feature_branch(self, base_branch: str = "main") -> str:
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         branch_name = f"feature/autonomous_update_{timestamp}"
-        print(f"[GitService] Criando branch a partir de {base_branch}: {branch_name}")
+        LOGGER.info("[GitService] Criando branch a partir de %s: %s", base_branch, branch_name)
         return branch_name
 
     def commit_changes(
         self, file_path: str, commit_message: str, branch_name: str
     ) -> None:
-        print(
-            "[GitService] Commitando mudancas em "
-            f"{branch_name}: \"{commit_message}\" (arquivo: {file_path})"
+        LOGGER.info(
+            '[GitService] Commitando mudancas em %s: "%s" (arquivo: %s)',
+            branch_name,
+            commit_message,
+            file_path,
         )
 
     def create_pull_request(
@@ -35,13 +40,15 @@ class GitService:
         base_branch: str = "main",
     ) -> str:
         pr_url = f"https://github.com/{self.repo_name}/pull/123"
-        print("\n" + "=" * 50)
-        print("[GitService] Gerando pull request simulado:")
-        print(f"  Base: {base_branch}")
-        print(f"  Head: {head_branch}")
-        print(f"  Titulo: {title}")
         preview = body[:500] + ("..." if len(body) > 500 else "")
-        print(f"  Corpo (preview):\n{preview}")
-        print(f"[GitService] Pull request criado: {pr_url}")
-        print("=" * 50 + "\n")
+        LOGGER.info(
+            "\n%s\n[GitService] Gerando pull request simulado:\n"
+            "  Base: %s\n  Head: %s\n  Titulo: %s\n  Corpo (preview):\n%s",
+            "=" * 50,
+            base_branch,
+            head_branch,
+            title,
+            preview,
+        )
+        LOGGER.info("[GitService] Pull request criado: %s\n%s\n", pr_url, "=" * 50)
         return pr_url
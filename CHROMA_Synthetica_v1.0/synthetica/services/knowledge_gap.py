@@ -34,8 +34,15 @@ class KnowledgeGapResolver:
             / "auto_generated_entries.json"
         )
 
-    def ensure_paths(self, items: Iterable[Dict[str, Any]]) -> None:
-        """Check each item with 'path' and optional 'hint'."""
+    def ensure_paths(
+        self,
+        items: Iterable[Dict[str, Any]],
+        reasoning_chain: Optional[List[str]] = None,
+    ) -> None:
+        """Check each item with 'path' and optional 'hint'.
+
+        Paths that could not be filled are reported in ``reasoning_chain``.
+        """
         for item in items:
             path = item.get("path")
             if not path:
@@ -44,8 +51,7 @@ class KnowledgeGapResolver:
                 continue
             topic = item.get("hint") or self._topic_from_path(path)
             suggestion = self._create_suggestion(path, topic)
-            if suggestion:
-                self._inject(path, suggestion)
+            if suggestion and self._inject(path, suggestion, reasoning_chain):
                 self.generated_entries.append(suggestion)
                 self._log_suggestion(suggestion)
 
@@ -69,7 +75,12 @@ class KnowledgeGapResolver:
         }
         return GapSuggestion(path=path, topic=topic, sources=source_payload)
 
-    def _inject(self, path: str, suggestion: GapSuggestion) -> None:
+    def _inject(
+        self,
+        path: str,
+        suggestion: GapSuggestion,
+        reasoning_chain: Optional[List[str]] = None,
+    ) -> bool:
         entry = {
             "auto_generated": True,
             "topic": suggestion.topic,
@@ -77,10 +88,14 @@ class KnowledgeGapResolver:
         }
         try:
             self.broker.inject_entry(path, entry)
-        except ValueError as exc:
+        except (ValueError, PermissionError) as exc:
+            # Shared brokers are read-only (PermissionError); fork() to patch them.
             LOGGER.warning("Failed to inject KB entry for %s: %s", path, exc)
-            return
+            if reasoning_chain is not None:
+                reasoning_chain.append(f"Knowledge gap '{path}' left unfilled: {exc}")
+            return False
         self._persist_suggestion(suggestion)
+        return True
 
     def _log_suggestion(self, suggestion: GapSuggestion) -> None:
         LOGGER.info(
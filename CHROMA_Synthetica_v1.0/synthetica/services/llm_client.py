@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
 from abc import ABC, abstractmethod
@@ -18,6 +19,15 @@ class BaseLLMClient(ABC):
     def generate_json(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
         """Retorna uma resposta estruturada em JSON."""
 
+    async def agenerate_json(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+        """
+        Versão assíncrona de ``generate_json``.
+
+        Por padrão executa ``generate_json`` numa thread, para não bloquear o
+        event loop; clientes com API assíncrona nativa devem sobrescrever.
+        """
+        return await asyncio.to_thread(self.generate_json, system_prompt, user_prompt)
+
 
 class StubLLMClient(BaseLLMClient):
     """
@@ -27,8 +37,10 @@ class StubLLMClient(BaseLLMClient):
     Evita dependências externas ou chaves de API.
     """
 
-    def __init__(self, *, default_theme: str = "cinematic") -> None:
+    def __init__(self, *, default_theme: str = "cinematic", model_name: Optional[str] = None) -> None:
+        # model_name is accepted (and ignored) so callers can swap providers freely.
         self._default_theme = default_theme
+        self.model_name = model_name
 
     def generate_json(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
         # Extrai o briefing (último bloco não vazio).
@@ -78,6 +90,10 @@ class StubLLMClient(BaseLLMClient):
             ],
         }
 
+    async def agenerate_json(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+        # Pure CPU and instantaneous: no thread hop needed.
+        return self.generate_json(system_prompt, user_prompt)
+
 
 def _load_key_from_config() -> Optional[str]:
     config_path = Path(__file__).resolve().parent.parent / "config" / "gemini_api_key.txt"
@@ -118,15 +134,28 @@ class GeminiClient(BaseLLMClient):
 
     def generate_json(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
         """Request JSON output from the model and parse it safely."""
-        model = self._genai.GenerativeModel(
-            self._model_name,
-            system_instruction=system_prompt,
+        response = self._model(system_prompt).generate_content(
+            user_prompt,
+            safety_settings=self._safety_settings,
         )
-        response = model.generate_content(
+        return self._decode(response)
+
+    async def agenerate_json(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+        """Same as ``generate_json`` over the SDK's native async transport."""
+        response = await self._model(system_prompt).generate_content_async(
             user_prompt,
             safety_settings=self._safety_settings,
         )
+        return self._decode(response)
+
+    def _model(self, system_prompt: str) -> Any:
+        return self._genai.GenerativeModel(
+            self._model_name,
+            system_instruction=system_prompt,
+        )
 
+    @staticmethod
+    def _decode(response: Any) -> Dict[str, Any]:
         if not getattr(response, "candidates", None):
             raise RuntimeError("Empty response from Gemini.")
 
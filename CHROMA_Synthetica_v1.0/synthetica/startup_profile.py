@@ -0,0 +1,106 @@
+"""
+Startup profiling for the CLIs and the playground app.
+
+    python -m synthetica.startup_profile interactive_chat playground_backend.main
+    python -m synthetica.startup_profile interactive_chat --first-prompt
+
+Each module is imported in a fresh interpreter with ``-X importtime`` and the
+slowest imports (cumulative, i.e. including their own dependencies) are
+listed. ``--first-prompt`` also times a cold process from start to the first
+generated prompt, using the stub LLM so no network is involved.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+FIRST_PROMPT_SNIPPET = (
+    "from playground_backend.generator import generate_prompt_session\n"
+    "generate_prompt_session('Startup probe brief.', 'stub', 'cinematografico')\n"
+)
+
+
+@dataclass
+class ImportTiming:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def import_profile(module: str) -> List[ImportTiming]:
+    """Import ``module`` in a fresh interpreter and parse ``-X importtime``."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT_DIR,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+
+    timings: List[ImportTiming] = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|", 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        timings.append(ImportTiming(name.strip(), int(self_us), int(cumulative_us), depth))
+    return timings
+
+
+def cold_start_ms(snippet: str, repeat: int = 3) -> float:
+    """Median wall time of a fresh interpreter running ``snippet``."""
+    env = {**os.environ, "SYNTHETICA_LLM_PROVIDER": "stub"}
+    rounds = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", snippet], cwd=ROOT_DIR, env=env, check=True)
+        rounds.append((time.perf_counter() - started) * 1e3)
+    return statistics.median(rounds)
+
+
+def format_profile(module: str, timings: List[ImportTiming], top: int = 15) -> str:
+    total = next((t.cumulative_us for t in reversed(timings) if t.module == module), 0)
+    lines = [f"== {module}: {total / 1000:.1f} ms total import time =="]
+    lines.append(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    for timing in sorted(timings, key=lambda t: t.cumulative_us, reverse=True)[:top]:
+        lines.append(
+            f"{timing.cumulative_us / 1000:>14.1f} {timing.self_us / 1000:>9.1f}  "
+            f"{'  ' * timing.depth}{timing.module}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Import-time breakdown for Synthetica entry points.")
+    parser.add_argument("modules", nargs="*", default=["interactive_chat", "playground_backend.main"])
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument(
+        "--first-prompt",
+        action="store_true",
+        help="Also time a cold start up to the first generated prompt (stub LLM).",
+    )
+    args = parser.parse_args(argv)
+
+    for module in args.modules:
+        print(format_profile(module, import_profile(module), args.top))
+        print()
+    if args.first_prompt:
+        print(f"Cold start to first prompt: {cold_start_ms(FIRST_PROMPT_SNIPPET):.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+"""
+Lightweight tracing spans for the Synthetica pipeline.
+
+Pipeline code opens spans with ``tracing.span(name, category, **args)``. When
+no tracer is active in the current context the call returns a shared no-op
+span, so instrumented code costs one context-variable read per span.
+
+Spans nest, use ``time.perf_counter_ns`` and record how many broker lookups
+and memo-cache hits/misses happened while they were open (children
+included). Those counts come from the contexts the tracer is active in, so
+reads made by other threads on a shared broker do not leak into a trace.
+
+A finished ``Trace`` can be summarised in-process or exported in the Chrome
+trace-event format (chrome://tracing, Perfetto).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from synthetica.core.knowledge_broker import ReadCounters, count_reads
+
+_ACTIVE: ContextVar[Optional["Tracer"]] = ContextVar("synthetica_tracer", default=None)
+
+
+@dataclass
+class Span:
+    name: str
+    category: str
+    start_ns: int
+    depth: int
+    parent: Optional[int]
+    args: Dict[str, Any] = field(default_factory=dict)
+    end_ns: int = 0
+    lookups: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    thread_id: int = 0
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> bool:
+        return False
+
+    def annotate(self, **args: Any) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _OpenSpan:
+    __slots__ = ("_tracer", "_span", "_counters")
+
+    def __init__(self, tracer: "Tracer", span: Span) -> None:
+        self._tracer = tracer
+        self._span = span
+        self._counters: Tuple[int, int, int] = (0, 0, 0)
+
+    def __enter__(self) -> "_OpenSpan":
+        # Parent and depth are taken when the span opens, so a span that is
+        # created but never entered leaves the nesting untouched.
+        tracer, span = self._tracer, self._span
+        span.parent = tracer._stack[-1] if tracer._stack else None
+        span.depth = len(tracer._stack)
+        span.thread_id = threading.get_ident()
+        tracer._stack.append(len(tracer.trace.spans))
+        tracer.trace.spans.append(span)
+        self._counters = tracer.counters.read()
+        span.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> bool:
+        span = self._span
+        span.end_ns = time.perf_counter_ns()
+        lookups, hits, misses = self._tracer.counters.read()
+        span.lookups = lookups - self._counters[0]
+        span.cache_hits = hits - self._counters[1]
+        span.cache_misses = misses - self._counters[2]
+        self._tracer._stack.pop()
+        return False
+
+    def annotate(self, **args: Any) -> None:
+        self._span.args.update(args)
+
+
+class Tracer:
+    """Collects spans for one run, with the broker reads made while active."""
+
+    def __init__(self) -> None:
+        self._stack: List[int] = []
+        self.counters = ReadCounters()
+        self.trace = Trace()
+
+    def span(self, name: str, category: str = "pipeline", **args: Any) -> _OpenSpan:
+        span = Span(
+            name=name,
+            category=category,
+            start_ns=0,
+            depth=0,
+            parent=None,
+            args=args,
+        )
+        return _OpenSpan(self, span)
+
+    @contextmanager
+    def activate(self) -> Iterator["Tracer"]:
+        """Make this tracer the target of ``span()`` calls in this context."""
+        token = _ACTIVE.set(self)
+        try:
+            with count_reads(self.counters):
+                yield self
+        finally:
+            _ACTIVE.reset(token)
+
+
+@dataclass
+class Trace:
+    """Finished spans in start order (parents before their children)."""
+
+    spans: List[Span] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Aggregate count, wall time and broker activity per span name."""
+        totals: Dict[str, Dict[str, float]] = {}
+        for span in self.spans:
+            entry = totals.setdefault(
+                span.name,
+                {"count": 0, "total_ms": 0.0, "lookups": 0, "cache_hits": 0, "cache_misses": 0},
+            )
+            entry["count"] += 1
+            entry["total_ms"] += span.duration_ms
+            entry["lookups"] += span.lookups
+            entry["cache_hits"] += span.cache_hits
+            entry["cache_misses"] += span.cache_misses
+        return totals
+
+    def to_chrome_events(self) -> List[Dict[str, Any]]:
+        if not self.spans:
+            return []
+        origin = min(span.start_ns for span in self.spans)
+        pid = os.getpid()
+        return [
+            {
+                "name": span.name,
+                "cat": span.category,
+                "ph": "X",
+                "ts": (span.start_ns - origin) / 1000,
+                "dur": (span.end_ns - span.start_ns) / 1000,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": {
+                    **span.args,
+                    "lookups": span.lookups,
+                    "cache_hits": span.cache_hits,
+                    "cache_misses": span.cache_misses,
+                },
+            }
+            for span in self.spans
+        ]
+
+    def export_chrome(self, path: Union[str, Path]) -> Path:
+        """Write a Chrome trace-event JSON file."""
+        path = Path(path)
+        payload = {"traceEvents": self.to_chrome_events(), "displayTimeUnit": "ms"}
+        path.write_text(json.dumps(payload, default=str), encoding="utf-8")
+        return path
+
+
+def span(name: str, category: str = "pipeline", **args: Any) -> Union[_OpenSpan, _NullSpan]:
+    """Open a span on the active tracer; a no-op when tracing is disabled."""
+    tracer = _ACTIVE.get()
+    if tracer is None:
+        return _NULL_SPAN
+    return tracer.span(name, category, **args)
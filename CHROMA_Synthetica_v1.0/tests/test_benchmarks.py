@@ -0,0 +1,44 @@
+"""Testes para os geradores sinteticos e o gate de regressao dos benchmarks."""
+
+from __future__ import annotations
+
+from benchmarks.bench import compare_reports
+from benchmarks.synthetic import SYNTHETIC_TERMS_PATH, synthetic_acos, synthetic_kb
+from synthetica.core.knowledge_broker import KnowledgeBroker
+
+BASE = {
+    "KB_ID": "BENCH",
+    "Lexicon": {"Moods": ["Serene", "Tense"], "Masters": {"Roger_Deakins": {"Era": "Modern"}}},
+}
+
+
+def test_synthetic_kb_scales_sections_and_depth() -> None:
+    kb = synthetic_kb(3, depth=2, base=BASE)
+    broker = KnowledgeBroker(kb)
+
+    assert broker.get_entry("Lexicon.Moods") == ["Serene", "Tense"]
+    assert broker.get_entry("Lexicon_x2.Level_1.Level_2.Moods") == ["Serene 2", "Tense 2"]
+    assert "Lexicon_x3" not in kb
+    assert len(broker.get_flat_list(SYNTHETIC_TERMS_PATH)) == 600
+    assert len(synthetic_acos(5)) == 5
+
+
+def test_compare_reports_flags_regressions_past_threshold() -> None:
+    baseline = {
+        "metrics": {
+            "get_entry@x1": {"value": 1.0, "unit": "us/op"},
+            "run_workflow@x1": {"value": 100.0, "unit": "us/op"},
+        }
+    }
+    current = {
+        "metrics": {
+            "get_entry@x1": {"value": 1.1, "unit": "us/op"},
+            "run_workflow@x1": {"value": 150.0, "unit": "us/op"},
+            "kb_build@x1": {"value": 5.0, "unit": "ms"},
+        }
+    }
+
+    rows, regressions = compare_reports(baseline, current, threshold=0.2)
+
+    assert [row["metric"] for row in rows] == ["get_entry@x1", "run_workflow@x1"]
+    assert regressions == ["run_workflow@x1"]
@@ -2,8 +2,15 @@
 
 from __future__ import annotations
 
+import sys
+import threading
+
+import pytest
+
 from synthetica.core.models import ProjectStateObject
-from synthetica.engines.imtl import IMTLPolicyEngine
+from synthetica.engines import imtl
+from synthetica.engines.imtl import PROFILES_PATH, IMTLPolicyEngine
+from synthetica.engines.imtl_templates import compile_template
 
 
 def _build_pso() -> ProjectStateObject:
@@ -49,3 +56,215 @@ def test_default_policy_concatenates_segments(sample_kb) -> None:
     assert "Futuristic arcology skyline at dawn." in prompt
     assert "Golden hour glow" in prompt
     assert "shot on ARRI Alexa 35 cinema camera" in prompt
+
+
+def test_translation_cache_reuses_prompts_for_identical_pso(sample_kb) -> None:
+    engine = IMTLPolicyEngine(sample_kb)
+    uncached = IMTLPolicyEngine(sample_kb, cache_size=0)
+    models = ["DALL-E_3", "Midjourney_V6", "Flux_1"]
+
+    first = engine.fingerprint(_build_pso())
+    prompts = {model: engine.translate(_build_pso(), model, first) for model in models}
+    again = {model: engine.translate(_build_pso(), model) for model in models}
+
+    assert prompts == again == {model: uncached.translate(_build_pso(), model) for model in models}
+    assert engine.cache_stats()["hits"] == 3
+    assert engine.cache_stats()["misses"] == 3
+
+
+def test_fingerprint_tracks_fields_read_by_policies(sample_kb) -> None:
+    engine = IMTLPolicyEngine(sample_kb)
+    base = engine.fingerprint(_build_pso())
+    changed = _build_pso()
+    changed.process_artifacts.append("Halation bloom")
+    unrelated = _build_pso()
+    unrelated.source_aco_id = "aco-other"
+    unrelated.ontological_conflicts.append("Not read by any policy")
+
+    assert engine.fingerprint(changed).digest != base.digest
+    assert engine.fingerprint(unrelated).digest == base.digest
+    assert "Halation bloom" in engine.translate(changed, "Nano_Banana")
+
+
+def test_kb_prompt_template_adds_model_without_code(sample_kb) -> None:
+    engine = IMTLPolicyEngine(sample_kb)
+    pso = _build_pso()
+    assert engine.policy_for("Stable_Diffusion_4").name == "default"
+
+    sample_kb.inject_entry(
+        "7.0_Model_Translation_Layer_Profiles.Model_Capability_Profiles",
+        {
+            "Stable_Diffusion_4": {
+                "Rhetoric": "Direct Visual Instruction",
+                "Prompt_Template": {
+                    "joiner": " | ",
+                    "segments": [
+                        "Show {core_concept}",
+                        {"text": "Framing: {composition}", "when": ["composition"]},
+                        {"text": "Unused: {style}", "when": ["style", "technical"]},
+                    ],
+                },
+            },
+            "Flux_1": {"Prompt_Template": {"segments": ["{missing_slot}"]}},
+        },
+    )
+
+    prompt = engine.translate(pso, "Stable_Diffusion_4")
+    assert prompt.startswith(
+        "Show Futuristic arcology skyline at dawn. | Framing: Path: symmetrical balance"
+    )
+    assert "Unused: in the style of Roger Deakins" in prompt
+    # Template invalido no KB e ignorado: o built-in continua valendo.
+    assert engine.translate(pso, "Flux_1").startswith("Objective: Futuristic arcology")
+
+
+def test_compile_template_rejects_unknown_slots_and_renders_specs() -> None:
+    template = compile_template(
+        "Custom",
+        {"joiner": "/", "segments": ["{{raw}} {core_concept!r:>8}", {"text": "x", "when": "style"}]},
+    )
+    fields = {"core_concept": "ab", "composition": "", "style": "", "technical": ""}
+
+    assert template.render(fields) == "{raw}     'ab'"
+    assert template.render({**fields, "style": "noir"}) == "{raw}     'ab'/x"
+    for bad in (
+        {"segments": ["{core_concept.__class__}"]},
+        {"segments": ["{style!x}"]},
+        {"segments": "{style}"},
+        {"segments": [1]},
+    ):
+        with pytest.raises(ValueError):
+            compile_template("Bad", bad)
+
+
+def test_translate_many_and_batch_match_single_translations(sample_kb) -> None:
+    engine = IMTLPolicyEngine(sample_kb, cache_size=0)
+    models = ["DALL-E_3", "Seedream_4_0", "Unknown_Model"]
+    other = _build_pso()
+    other.core_concept = "Submerged observatory."
+    expected = {model: engine.translate(_build_pso(), model) for model in models}
+
+    assert engine.translate_many(_build_pso(), models) == expected
+    batch = engine.translate_batch([_build_pso(), other, _build_pso()], models)
+    assert batch[0] == batch[2] == expected
+    assert batch[1]["Seedream_4_0"].startswith("Module A - Scenario: Submerged observatory.")
+    assert batch[0] is not batch[2]
+
+
+def test_budget_trims_by_priority_and_reports_dropped_items(sample_kb) -> None:
+    engine = IMTLPolicyEngine(sample_kb)
+    pso = _build_pso()
+    pso.visual_style_keywords.append("Neon rain")
+    pso.reasoning_chain.append("Matrix resolved: Atmospheric haze, Neon rain.")
+    pso.reasoning_chain.append("Neon rain reinforced by the shadow state.")
+    sample_kb.inject_entry(
+        "7.0_Model_Translation_Layer_Profiles.Model_Capability_Profiles",
+        {"Nano_Banana": {"Prompt_Budget": {"limit": 20, "unit": "words"}}},
+    )
+
+    untrimmed = IMTLPolicyEngine(sample_kb, cache_size=0)
+    assert untrimmed.translate(pso, "Flux_1") == engine.translate(pso, "Flux_1")
+
+    result = engine.translate_detailed(pso, "Nano_Banana")
+    report = result.report
+
+    assert report is not None and report.trimmed and not report.over_budget
+    assert len(result.prompt.split()) == report.used <= 20
+    assert "Roger Deakins" in result.prompt and "Neon rain" in result.prompt
+    # Keywords citados com mais frequencia na cadeia de raciocinio ficam primeiro.
+    assert report.dropped[0] == ("keyword", "Atmospheric haze")
+    assert ("artifact", "Kodak Vision3 500T film stock") in report.dropped
+    assert "Golden hour glow" not in result.prompt
+
+
+def test_budget_truncates_core_concept_as_last_resort(sample_kb) -> None:
+    sample_kb.inject_entry(
+        "7.0_Model_Translation_Layer_Profiles.Model_Capability_Profiles",
+        {"Flux_1": {"Prompt_Budget": {"limit": 100, "unit": "chars"}}},
+    )
+    engine = IMTLPolicyEngine(sample_kb)
+
+    result = engine.translate_detailed(_build_pso(), "Flux_1")
+
+    assert result.report is not None and result.report.truncated_core
+    assert not result.report.over_budget and len(result.prompt) <= 100
+    assert result.prompt.startswith("Objective: Futuristic arcology")
+    assert "dawn" not in result.prompt and "Roger Deakins" not in result.prompt
+
+
+def _profiles(label: str) -> dict:
+    return {"Model_X": {"Prompt_Template": {"segments": [label + " {core_concept}"]}}}
+
+
+def test_dispatch_is_refreshed_from_the_reader_snapshot(sample_kb) -> None:
+    engine = IMTLPolicyEngine(sample_kb)
+    pso = _build_pso()
+    sample_kb.inject_entry(PROFILES_PATH, _profiles("Old"))
+
+    with sample_kb.pinned():
+        sample_kb.inject_entry(PROFILES_PATH, _profiles("New"))
+        # O leitor fixado ve o perfil antigo e a versao do seu snapshot.
+        assert engine.translate(pso, "Model_X").startswith("Old")
+    # Fora do pin, a versao nova dispara o refresh.
+    assert engine.translate(pso, "Model_X").startswith("New")
+
+
+def test_concurrent_translations_while_profiles_change(sample_kb) -> None:
+    engine = IMTLPolicyEngine(sample_kb)
+    pso = _build_pso()
+    sample_kb.inject_entry(PROFILES_PATH, _profiles("V0"))
+    threads, rounds = 4, 300
+    bad: list = []
+
+    def hammer() -> None:
+        for _ in range(rounds):
+            prompt = engine.translate(pso, "Model_X")
+            if not prompt.startswith("V"):
+                bad.append(prompt)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        workers = [threading.Thread(target=hammer) for _ in range(threads)]
+        for worker in workers:
+            worker.start()
+        for version in range(1, 40):
+            sample_kb.inject_entry(PROFILES_PATH, _profiles(f"V{version}"))
+        for worker in workers:
+            worker.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    stats = engine.cache_stats()
+    assert bad == []
+    assert stats["hits"] + stats["misses"] == threads * rounds
+    assert engine.translate(pso, "Model_X").startswith("V39")
+
+
+def test_policy_built_from_a_replaced_table_is_not_stored(sample_kb, monkeypatch) -> None:
+    engine = IMTLPolicyEngine(sample_kb)
+    engine.policy_for("Flux_1")
+    started, resume = threading.Event(), threading.Event()
+    build = imtl._ModelPolicy
+
+    def slow_policy(*args):
+        if not started.is_set():
+            started.set()
+            resume.wait(5)
+        return build(*args)
+
+    monkeypatch.setattr(imtl, "_ModelPolicy", slow_policy)
+    resolver = threading.Thread(target=engine.policy_for, args=("Model_X",))
+    resolver.start()
+    started.wait(5)
+    # Com o resolver parado entre ler a tabela e gravar a policy, um
+    # refresh troca a tabela.
+    sample_kb.inject_entry(PROFILES_PATH, _profiles("New"))
+    refresher = threading.Thread(target=engine.policy_for, args=("Flux_1",))
+    refresher.start()
+    refresher.join(0.2)
+    resume.set()
+    resolver.join()
+    refresher.join()
+
+    assert engine.policy_for("Model_X").name != "default"
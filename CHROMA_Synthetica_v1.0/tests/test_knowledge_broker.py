@@ -0,0 +1,262 @@
+"""Testes para a navegacao e o cache do KnowledgeBroker."""
+
+from __future__ import annotations
+
+import difflib
+import json
+import os
+
+import pytest
+
+from synthetica.core.cache import CachePolicy, LRUCache
+from synthetica.core.compiled_kb import artifact_path_for, open_compiled_kb
+from synthetica.core.fuzzy import FuzzyIndex
+from synthetica.core.knowledge_broker import KnowledgeBroker
+from synthetica.core.snapshot import KBSnapshot
+
+ARCHETYPAL_PATH = (
+    "2.0_Semiotics_and_Psychology_Database."
+    "2.8_Archetypal_Dynamics_Framework (Jungian)"
+)
+
+
+def test_get_entry_resolves_keys_containing_dots(sample_kb) -> None:
+    values = sample_kb.get_entry(
+        f"{ARCHETYPAL_PATH}.Parameters.Shadow_Integration_State.Values"
+    )
+
+    assert values == ["Assimilating", "Projected", "Integrated"]
+    assert sample_kb.get_entry(f"{ARCHETYPAL_PATH}.Missing", default="n/a") == "n/a"
+
+
+def test_get_entry_prefers_segment_walk_on_ambiguous_paths() -> None:
+    broker = KnowledgeBroker(
+        {"a": {"b": {"c": "walk"}, "b.c": "compound"}, "a.b": {"c": "root"}}
+    )
+
+    assert broker.get_entry("a.b.c") == "walk"
+
+
+def test_inject_entry_updates_path_index(sample_kb) -> None:
+    base = "11.0_Narrative_Structure_and_Storytelling.11.4_Speculative_Fiction_and_Futurism"
+    sample_kb.inject_entry(f"{base}.Solarpunk", {"Keywords": ["Living facades"]})
+
+    assert sample_kb.get_entry(f"{base}.Solarpunk.Keywords") == ["Living facades"]
+
+    sample_kb.inject_entry(f"{base}.Lunarpunk.Keywords", ["Bioluminescence"])
+    assert sample_kb.get_entry(f"{base}.Lunarpunk.Keywords") == ["Bioluminescence"]
+
+
+def test_inject_entry_only_evicts_overlapping_cache_entries(sample_kb) -> None:
+    solarpunk = (
+        "11.0_Narrative_Structure_and_Storytelling."
+        "11.4_Speculative_Fiction_and_Futurism.Solarpunk"
+    )
+    cinematographers = "5.0_Masters_Lexicon.5.3_Art_and_Design_References.Cinematographers"
+    sample_kb.get_flat_list(solarpunk)
+    sample_kb.get_flat_list(cinematographers)
+    sample_kb.get_flat_list("11.0_Narrative_Structure_and_Storytelling")
+
+    sample_kb.inject_entry(solarpunk, ["Community gardens"])
+
+    assert sample_kb.get_flat_list(cinematographers) == ["Roger_Deakins", "Bradford_Young"]
+    assert sample_kb.get_flat_list(solarpunk) == ["Community gardens"]
+    stats = sample_kb.cache_stats()
+    assert stats["evictions"] == 2
+    assert stats["hits"] == 1
+    assert stats["misses"] == 4
+
+
+def test_cache_policy_bounds_entries_and_isolates_misses() -> None:
+    kb = {"Lexicon": {f"Entry_{i}": [f"value {i}"] for i in range(6)}}
+    broker = KnowledgeBroker(
+        kb, cache_policy=CachePolicy(max_entries=3, negative_max_entries=2)
+    )
+
+    for i in range(6):
+        broker.get_flat_list(f"Lexicon.Entry_{i}")
+    for i in range(10):
+        broker.get_flat_list(f"Lexicon.Typo_{i}")
+    broker.get_flat_list("Lexicon.Entry_5")
+
+    stats = broker.cache_stats()
+    assert stats["size"] == 3
+    assert stats["bytes"] > 0
+    assert stats["negative"]["size"] == 2
+    assert stats["hits"] == 1
+    assert 0 < stats["hit_ratio"] < 1
+
+
+def test_lru_cache_expires_entries_after_ttl() -> None:
+    now = [0.0]
+    cache = LRUCache(max_entries=4, ttl_seconds=10, clock=lambda: now[0])
+    cache.put("path", ["value"])
+
+    now[0] = 5.0
+    assert cache.get("path") == ["value"]
+    now[0] = 16.0
+    assert "path" not in cache
+    assert cache.stats()["expirations"] == 1
+
+
+def test_fuzzy_index_matches_difflib() -> None:
+    options = [
+        "Roger Deakins",
+        "Bradford Young",
+        "Hoyte van Hoytema",
+        "Emmanuel Lubezki",
+        "ab-cd-ef",
+        "",
+    ]
+    index = FuzzyIndex(options)
+    queries = ["Roger Deakens", "bradford", "ab+cd+ef", "Lubezky", "zzz", ""]
+
+    for cutoff in (0.0, 0.4, 0.6, 0.9):
+        for query in queries:
+            expected = difflib.get_close_matches(query, options, n=1, cutoff=cutoff)
+            assert index.best_match(query, cutoff) == (expected[0] if expected else None)
+
+
+def test_find_closest_many_resolves_batch(sample_kb) -> None:
+    path = "5.0_Masters_Lexicon.5.3_Art_and_Design_References.Cinematographers"
+
+    matches = sample_kb.find_closest_many(path, ["Roger_Deakin", "Bradfrd_Young", "Nobody"])
+
+    assert matches == ["Roger_Deakins", "Bradford_Young", None]
+    assert sample_kb.find_closest_match(path, "Roger_Deakin") == "Roger_Deakins"
+
+    sample_kb.inject_entry(path, ["Rachel_Morrison"])
+    assert sample_kb.find_closest_match(path, "Rachel_Morison") == "Rachel_Morrison"
+
+
+def test_validate_entry_ignores_case_and_underscores(sample_kb) -> None:
+    path = "5.0_Masters_Lexicon.5.3_Art_and_Design_References.Cinematographers"
+
+    assert sample_kb.validate_entry(path, "roger deakins")
+    assert sample_kb.validate_entry(path, "BRADFORD_YOUNG")
+    assert not sample_kb.validate_entry(path, "Roger")
+    assert not sample_kb.validate_entry("Missing.Path", "Roger_Deakins")
+    assert sample_kb.validate_many(path, ["Roger_Deakins", "Nobody", "bradford  young"]) == [
+        True,
+        False,
+        True,
+    ]
+
+
+def test_iter_flat_streams_leaves_and_formats_entity_lexicons() -> None:
+    broker = KnowledgeBroker(
+        {
+            "Masters": {
+                "Roger_Deakins": {"Signature": "Naturalistic light"},
+                "Bradford_Young": {"Signature": "Underexposed warmth"},
+            },
+            "Moods": [["Serene", "Tense"], {"Extra": ["Playful"]}],
+        }
+    )
+
+    stream = broker.iter_flat("Moods")
+    assert next(stream) == "Serene"
+    assert list(stream) == ["Tense", "Playful"]
+    assert list(broker.iter_flat("Masters")) == ["Roger Deakins", "Bradford Young"]
+    assert broker.get_flat_list("Masters") == ["Roger Deakins", "Bradford Young"]
+    assert list(broker.iter_flat("Missing")) == []
+
+
+def test_pinned_readers_keep_their_snapshot_across_writes(sample_kb) -> None:
+    path = "5.0_Masters_Lexicon.5.3_Art_and_Design_References.Cinematographers"
+
+    with sample_kb.pinned() as snapshot:
+        sample_kb.inject_entry(path, ["Rachel_Morrison"])
+        assert sample_kb.get_flat_list(path) == ["Roger_Deakins", "Bradford_Young"]
+        assert sample_kb.version == snapshot.version + 1
+
+    assert sample_kb.get_flat_list(path) == ["Rachel_Morrison"]
+    assert snapshot.get(path) == ["Roger_Deakins", "Bradford_Young"]
+
+
+def test_entries_are_read_only_and_structurally_shared(sample_kb) -> None:
+    before = sample_kb.snapshot()
+    lexicon = sample_kb.get_entry("5.0_Masters_Lexicon")
+
+    sample_kb.inject_entry(
+        "11.0_Narrative_Structure_and_Storytelling.11.4_Speculative_Fiction_and_Futurism.Solarpunk",
+        ["Community gardens"],
+    )
+
+    assert sample_kb.get_entry("5.0_Masters_Lexicon") is lexicon
+    assert sample_kb.snapshot().root is not before.root
+    with pytest.raises(TypeError):
+        lexicon["5.3_Art_and_Design_References"] = {}
+
+
+def test_path_index_is_shared_between_versions() -> None:
+    snapshot = KBSnapshot.build({f"S{i}": {"k": {"v": [i]}} for i in range(64)})
+    versions = [snapshot]
+    for i in range(200):
+        versions.append(versions[-1].with_entry(f"S{i % 64}.new{i}", {"x": {"y": i}}))
+    versions.append(versions[-1].with_entry("S3", {"replaced": {}}))
+
+    latest = versions[-1]
+    # Cada escrita guarda so as proprias mudancas; os niveis antigos sao compartilhados.
+    assert len(latest.index._levels) < 8
+    assert latest.index._levels[-1] is versions[-2].index._levels[-1]
+    assert latest.get("S10.new10") == {"x": {"y": 10}}
+    assert latest.get("S10.new10.x") == {"y": 10}
+    assert latest.get("S3.k") is None and latest.get("S3.new3") is None
+    assert latest.get("S3.replaced") == {}
+    assert versions[-2].get("S3.new3.x") == {"y": 3}
+    assert versions[5].get("S10.new10") is None
+    assert set(latest.index) >= {"S0", "S0.k", "S3.replaced", "S7.new199"}
+
+
+def test_compiled_kb_serves_lazy_snapshot_and_recompiles_when_stale(tmp_path) -> None:
+    source = tmp_path / "kb.json"
+    source.write_text(
+        json.dumps({"KB_ID": "compiled", "Lexicon": {"Masters": ["Roger_Deakins"]}}),
+        encoding="utf-8",
+    )
+
+    compiled = open_compiled_kb(source)
+    assert compiled.path == artifact_path_for(source)
+    lazy = compiled.snapshot()
+    broker = KnowledgeBroker(lazy)
+    assert broker.get_entry("Lexicon.Masters") == ["Roger_Deakins"]
+    assert list(lazy.index) == []  # leituras nao alteram o indice compartilhado
+    assert broker.get_entry("Lexicon.Missing", default="n/a") == "n/a"
+
+    broker.inject_entry("Lexicon.Masters", {"Cinematographers": ["Bradford_Young"]})
+    assert broker.get_flat_list("Lexicon.Masters") == ["Bradford_Young"]
+    assert broker.get_entry("Lexicon.Masters.Cinematographers") == ["Bradford_Young"]
+
+    source.write_text(
+        json.dumps({"KB_ID": "compiled", "Lexicon": {"Masters": ["Hoyte_van_Hoytema"]}}),
+        encoding="utf-8",
+    )
+    with open_compiled_kb(source) as refreshed:
+        assert refreshed.content_hash != compiled.content_hash
+        assert refreshed.snapshot().get("Lexicon.Masters") == ["Hoyte_van_Hoytema"]
+    assert refreshed.closed and not compiled.closed
+
+
+def test_compiled_kb_header_is_replaced_when_only_the_mtime_changes(tmp_path) -> None:
+    source = tmp_path / "kb.json"
+    source.write_text(json.dumps({"A": {"b": [1]}}), encoding="utf-8")
+    compiled = open_compiled_kb(source)
+    old = compiled.snapshot()
+    inode = os.stat(compiled.path).st_ino
+
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    touched = open_compiled_kb(source)
+
+    # Conteudo igual: so o cabecalho muda, num arquivo novo (os.replace).
+    assert touched.content_hash == compiled.content_hash
+    assert touched.source_mtime_ns == source.stat().st_mtime_ns
+    assert os.stat(touched.path).st_ino != inode
+    assert list(tmp_path.glob("*.tmp")) == []
+    # O mapa antigo continua valido para quem ja tinha um snapshot.
+    assert old.get("A.b") == [1] and touched.snapshot().get("A.b") == [1]
+
+    inode = os.stat(touched.path).st_ino
+    assert open_compiled_kb(source).source_mtime_ns == touched.source_mtime_ns
+    assert os.stat(touched.path).st_ino == inode
@@ -0,0 +1,136 @@
+"""Testes para a execucao em lote do orquestrador."""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+
+import pytest
+
+from synthetica.core.models import AbstractCreativeObject, ACOElements, ACOIntent, ACOSubject
+from synthetica.logging_config import configure_logging
+from synthetica.orchestrator import ChromaSyntheticaOrchestrator
+from synthetica.tracing import Tracer, span
+
+MODELS = ["DALL-E_3", "Midjourney_V6", "Flux_1"]
+
+
+def _aco(index: int) -> AbstractCreativeObject:
+    aco = AbstractCreativeObject()
+    aco.intent = ACOIntent(narrative_moment=f"Scene {index} in a flooded cathedral.")
+    aco.elements = ACOElements(subjects=[ACOSubject(id=f"S{index}", description="Diver.")])
+    return aco
+
+
+@pytest.fixture(scope="module")
+def orchestrator() -> ChromaSyntheticaOrchestrator:
+    return ChromaSyntheticaOrchestrator()
+
+
+def test_run_batch_is_silent_and_matches_run_workflow(orchestrator, capsys) -> None:
+    capsys.readouterr()
+    batch = orchestrator.run_batch([_aco(i) for i in range(4)], MODELS)
+
+    assert capsys.readouterr().out == ""
+    assert batch.results[2] == orchestrator.run_workflow(_aco(2), MODELS)
+    assert batch.report.acos == 4
+    assert batch.report.prompts == 12
+    assert set(batch.report.phase_seconds) == {"compile", "enrich", "translate"}
+    assert batch.report.acos_per_second > 0
+
+
+def test_run_batch_with_workers_keeps_input_order(orchestrator) -> None:
+    acos = [_aco(i) for i in range(6)]
+
+    serial = orchestrator.run_batch(acos, MODELS)
+    parallel = orchestrator.run_batch(acos, MODELS, workers=2)
+
+    assert parallel.results == serial.results
+    assert parallel.report.workers == 2
+
+
+def test_iter_batch_releases_the_pin_between_chunks(orchestrator) -> None:
+    acos = [_aco(i) for i in range(3)]
+
+    for _ in orchestrator.iter_batch(acos, MODELS[:1]):
+        # O consumidor recebe o controle sem snapshot fixado na thread.
+        assert getattr(orchestrator.broker._local, "snapshot", None) is None
+
+
+def test_logging_levels_and_json_lines_sink(tmp_path, capsys) -> None:
+    sink = tmp_path / "run.jsonl"
+    configure_logging(verbosity=2, json_path=sink)
+    try:
+        orchestrator = ChromaSyntheticaOrchestrator()
+        orchestrator.run_workflow(_aco(1), MODELS[:1])
+        assert "--- INTERMEDIATE STATE (ITI) ---" in capsys.readouterr().out
+
+        quiet = ChromaSyntheticaOrchestrator(quiet=True)
+        quiet.run_workflow(_aco(1), MODELS[:1])
+        assert capsys.readouterr().out == ""
+
+        # O modo quiet vale so para a instancia: o nivel global nao muda.
+        assert logging.getLogger("synthetica").level == logging.DEBUG
+        orchestrator.run_workflow(_aco(1), MODELS[:1])
+        assert "--- INTERMEDIATE STATE (ITI) ---" in capsys.readouterr().out
+    finally:
+        configure_logging(verbosity=0, console=False)
+
+    records = [json.loads(line) for line in sink.read_text(encoding="utf-8").splitlines()]
+    assert {"ts", "level", "logger", "message"} <= set(records[0])
+    assert any(record["level"] == "DEBUG" for record in records)
+
+
+def test_run_workflow_trace_records_nested_spans(orchestrator, tmp_path) -> None:
+    pipeline = [{"name": "Operator_SetArchetypalDynamics", "params": {"shadow_state": "Projected"}}]
+
+    untraced = orchestrator.run_workflow(_aco(3), MODELS, pipeline)
+    traced = orchestrator.run_workflow(_aco(3), MODELS, pipeline, trace=True)
+
+    assert untraced.trace is None
+    assert dict(traced) == dict(untraced)
+    names = [span.name for span in traced.trace.spans]
+    assert names[0] == "run_workflow"
+    assert "Operator_SetArchetypalDynamics" in names
+    assert "_resolve_archetypal_dynamics" in names
+    assert {f"translate:{model}" for model in MODELS} <= set(names)
+    root = traced.trace.spans[0]
+    assert all(span.end_ns >= span.start_ns for span in traced.trace.spans)
+    assert root.lookups >= sum(s.lookups for s in traced.trace.spans if s.parent == 0)
+    assert traced.trace.summary()["run_workflow"]["count"] == 1
+
+    exported = json.loads(traced.trace.export_chrome(tmp_path / "trace.json").read_text())
+    assert len(exported["traceEvents"]) == len(names)
+    assert exported["traceEvents"][0]["ph"] == "X"
+
+
+def test_spans_nest_on_enter_and_count_only_their_own_context(orchestrator) -> None:
+    broker = orchestrator.broker
+    tracer = Tracer()
+    stop = threading.Event()
+
+    def other_reader() -> None:
+        while not stop.is_set():
+            broker.get_entry("KB_Version")
+
+    thread = threading.Thread(target=other_reader)
+    thread.start()
+    try:
+        with tracer.activate():
+            unused = span("never_entered")
+            with span("outer"):
+                for _ in range(50):
+                    broker.get_entry("KB_Version")
+                with span("inner"):
+                    broker.get_entry("KB_Version")
+    finally:
+        stop.set()
+        thread.join()
+
+    assert unused is not None
+    outer, inner = tracer.trace.spans
+    assert (outer.name, outer.parent, outer.depth) == ("outer", None, 0)
+    assert (inner.name, inner.parent, inner.depth) == ("inner", 0, 1)
+    # Leituras de outra thread no broker compartilhado nao entram no trace.
+    assert (outer.lookups, inner.lookups) == (51, 1)
@@ -0,0 +1,107 @@
+"""Testes para o planejador de pipelines de operadores."""
+
+from __future__ import annotations
+
+import pytest
+
+from synthetica.core.compiler import NexusCompiler
+from synthetica.core.models import ACOSubject, AbstractCreativeObject, IntermediateTechnicalIntent
+from synthetica.engines.operators import OperatorsEngine
+from synthetica.engines.planner import CATALOG_PATH, PipelineError, PipelinePlanner
+
+CANNIBALIZE = {
+    "name": "Operator_CulturalCannibalize",
+    "params": {
+        "devouring_culture": (
+            "11.0_Narrative_Structure_and_Storytelling."
+            "11.4_Speculative_Fiction_and_Futurism.Solarpunk"
+        ),
+        "devoured_element": "5.0_Masters_Lexicon.5.6_Fashion_and_Costume_Design.Iris van Herpen",
+    },
+}
+
+
+def _shadow(state: str) -> dict:
+    return {"name": "Operator_SetArchetypalDynamics", "params": {"shadow_state": state}}
+
+
+def test_plan_drops_overwritten_operators_and_matches_direct_apply(sample_kb) -> None:
+    planner = PipelinePlanner(OperatorsEngine(sample_kb))
+    pipeline = [
+        _shadow("Projected"),
+        CANNIBALIZE,
+        _shadow("Assimilating"),
+        _shadow("Unknown_State"),  # invalido: nao sobrescreve o anterior
+    ]
+
+    plan = planner.plan(pipeline)
+
+    assert [step.index for step in plan.steps] == [1, 2, 3]
+    assert plan.removed == ((0, "Operator_SetArchetypalDynamics overwritten by pipeline[2]"),)
+    aco = AbstractCreativeObject()
+    iti = IntermediateTechnicalIntent(source_aco_id=aco.aco_id)
+    plan.run(aco, iti)
+
+    reference_aco = AbstractCreativeObject()
+    reference_iti = IntermediateTechnicalIntent(source_aco_id=reference_aco.aco_id)
+    for spec in pipeline[1:]:
+        OperatorsEngine(sample_kb).apply(spec["name"], reference_aco, reference_iti, spec["params"])
+    assert iti.reasoning_chain == reference_iti.reasoning_chain
+    assert aco.intent == reference_aco.intent
+    assert aco.applied_operators == [
+        "Operator_CulturalCannibalize",
+        "Operator_SetArchetypalDynamics",
+    ]
+
+
+def test_plan_validates_whole_pipeline_before_running(sample_kb) -> None:
+    planner = PipelinePlanner(OperatorsEngine(sample_kb))
+
+    with pytest.raises(PipelineError) as excinfo:
+        planner.plan(
+            [
+                {"name": "Operator_DefineHybridism", "params": {"subject_id": "Hero"}},
+                {"name": "Operator_ImposeSymmetry", "params": ["wrong"]},
+            ]
+        )
+    assert "pipeline[0] Operator_DefineHybridism: missing parameter(s) ['ontology_ref']" in str(
+        excinfo.value
+    )
+    assert "pipeline[1] Operator_ImposeSymmetry: params must be a mapping" in str(excinfo.value)
+
+    sample_kb.inject_entry(CATALOG_PATH, {"Operator_Dream": {"Inputs": ["mood"]}})
+    plan = planner.plan([{"name": "Operator_Dream"}, {"name": "broker"}, {"params": {}}])
+    assert [step.call for step in plan.steps] == [None, None]
+    assert "operator 'Operator_Dream' is not implemented" in plan.warnings[0]
+    assert "operator 'broker' is unknown" in plan.warnings[1]
+
+    iti = IntermediateTechnicalIntent(source_aco_id="aco")
+    plan.run(AbstractCreativeObject(), iti)
+    assert iti.reasoning_chain == [
+        "Operator 'Operator_Dream' not found. Skipped.",
+        "Operator 'broker' not found. Skipped.",
+    ]
+
+
+def test_compiled_plans_are_cached_until_the_kb_changes(sample_kb, monkeypatch) -> None:
+    compiler = NexusCompiler(sample_kb)
+    checks = []
+    check = compiler.operators_engine.check
+    monkeypatch.setattr(
+        compiler.operators_engine, "check", lambda *args: checks.append(args) or check(*args)
+    )
+    pipeline = [CANNIBALIZE, _shadow("Assimilating")]
+
+    for _ in range(3):
+        aco = AbstractCreativeObject()
+        aco.elements.subjects.append(ACOSubject(id="Hero", description="Hero."))
+        iti = compiler.compile_to_iti(aco, [dict(spec) for spec in pipeline])
+        assert iti.abstract_directives.psychological_state == "Assimilating"
+    assert len(checks) == 2
+    assert compiler.planner.plan(pipeline) is compiler.planner.plan(pipeline)
+
+    sample_kb.inject_entry("5.0_Masters_Lexicon.5.6_Fashion_and_Costume_Design.Iris van Herpen", [])
+    iti = compiler.compile_to_iti(AbstractCreativeObject(), pipeline)
+    assert len(checks) == 4
+    assert iti.abstract_directives.antropofagia_directive is None
+    assert "Iris van Herpen' not found." in iti.reasoning_chain[1]
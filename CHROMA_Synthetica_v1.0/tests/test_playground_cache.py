@@ -0,0 +1,100 @@
+"""Testes para o cache de gerações do playground."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+import interactive_assistant
+from playground_backend import generator
+from playground_backend import main as backend
+from playground_backend import storage
+from playground_backend.cache import GenerationCache
+from playground_backend.models import GenerateRequest
+
+THEME = "cinematografico"
+
+
+@pytest.fixture()
+def cache(tmp_path, monkeypatch) -> GenerationCache:
+    monkeypatch.setenv("SYNTHETICA_LLM_PROVIDER", "stub")
+    return GenerationCache(tmp_path / "cache.sqlite3")
+
+
+def _generate(cache: GenerationCache, brief: str, **options) -> dict:
+    return generator.generate_prompt_session(brief, "stub", THEME, cache=cache, **options)
+
+
+def test_hit_bypass_and_playbook_invalidation(cache, tmp_path, monkeypatch) -> None:
+    source = Path(interactive_assistant.__file__).resolve().parent / "kb/synthetica_kb_v1.1.json"
+    kb_file = tmp_path / "kb.json"
+    kb = json.loads(source.read_text(encoding="utf-8"))
+    kb_file.write_text(json.dumps(kb), encoding="utf-8")
+    monkeypatch.setattr(interactive_assistant, "SEA_PLAYBOOK_PATH", kb_file)
+
+    first = _generate(cache, "Diver in a  flooded cathedral")
+    assert first["cache"]["hit"] is False
+
+    # Caixa e espaços do briefing não mudam a chave.
+    hit = _generate(cache, "diver in a flooded cathedral")
+    assert hit["cache"]["hit"] is True and hit["cache"]["key"] == first["cache"]["key"]
+    assert hit["prompts"] == first["prompts"]
+
+    bypassed = _generate(cache, "Diver in a flooded cathedral", bypass_cache=True)
+    assert bypassed["cache"] == {"hit": False, "key": first["cache"]["key"], "bypassed": True}
+    assert len(cache) == 1
+
+    # Editar o playbook no arquivo muda o hash e invalida as entradas antigas.
+    suite = kb[interactive_assistant.SEA_PLAYBOOK_KEY]
+    suite[interactive_assistant.SEA_PLAYBOOK_ENTRY]["themes"][THEME]["edited"] = True
+    kb_file.write_text(json.dumps(kb), encoding="utf-8")
+    fresh = _generate(cache, "Diver in a flooded cathedral")
+    assert fresh["cache"]["hit"] is False and fresh["cache"]["key"] != first["cache"]["key"]
+    assert len(cache) == 2
+
+
+def test_ttl_and_lru_bounds(tmp_path) -> None:
+    expired = GenerationCache(tmp_path / "ttl.sqlite3", ttl=-1)
+    assert not expired.enabled
+    expired.put("a", {"v": 1})
+    assert expired.get("a") is None
+
+    small = GenerationCache(tmp_path / "lru.sqlite3", max_entries=2)
+    small.put("a", {"v": 1})
+    small.put("b", {"v": 2})
+    assert small.get("a")[0] == {"v": 1}  # "a" passa a ser o mais recente
+    small.put("c", {"v": 3})
+    assert small.get("b") is None and small.get("a") is not None and len(small) == 2
+
+
+class _Connected:
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+class _Response:
+    status_code = 200
+
+
+def test_cache_hit_is_served_before_the_generation_pool(cache, tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(backend, "generation_cache", cache)
+    monkeypatch.setattr(storage, "_store", storage.SessionStore(tmp_path / "h.sqlite3", None))
+    entered = []
+
+    async def run(work):
+        entered.append(True)
+        return await work()
+
+    monkeypatch.setattr(backend.generation_pool, "run", run)
+    request = GenerateRequest(brief="Diver in a flooded cathedral", theme=THEME, model="stub")
+
+    def generate(**options):
+        body = request.model_copy(update=options)
+        return asyncio.run(backend.generate_prompt(body, _Connected(), _Response()))
+
+    assert generate().cache.hit is False and len(entered) == 1
+    assert generate().cache.hit is True and len(entered) == 1
+    assert generate(cache="bypass").cache.bypassed is True and len(entered) == 2
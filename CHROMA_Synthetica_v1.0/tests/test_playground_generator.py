@@ -0,0 +1,115 @@
+"""Testes para o gerador programático do playground."""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import json
+from typing import Any, Dict, List
+
+import pytest
+
+import interactive_assistant
+from interactive_assistant import _enforce_defaults, _normalize_payload, _request_payload
+from playground_backend import generator
+from synthetica.services.llm_client import BaseLLMClient
+
+
+class ScriptedClient(BaseLLMClient):
+    """Responde com os payloads dados, em ordem; traduções viram ``EN:<texto>``."""
+
+    def __init__(self, payloads: List[Dict[str, Any]] = ()) -> None:
+        self.payloads = list(payloads)
+        self.active = 0
+        self.peak = 0
+
+    def generate_json(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+        if system_prompt == generator.TRANSLATION_SYSTEM_PROMPT:
+            return {"translation": "EN:" + user_prompt.rsplit("\n", 1)[-1]}
+        return self.payloads.pop(0)
+
+    async def agenerate_json(self, system_prompt: str, user_prompt: str) -> Dict[str, Any]:
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0)
+        self.active -= 1
+        return self.generate_json(system_prompt, user_prompt)
+
+
+def test_sync_and_async_share_the_english_retry_policy() -> None:
+    payloads = [{"intent": "Cena à noite"}, {"intent": "Night scene"}]
+    events: List[Any] = []
+
+    assert _request_payload(ScriptedClient(payloads), "system", "user") == payloads[1]
+    assert asyncio.run(
+        generator._request_payload_async(
+            ScriptedClient(payloads), "system", "user", lambda *event: events.append(event)
+        )
+    ) == payloads[1]
+    assert events == [
+        ("payload_requested", {"attempt": 1}),
+        ("payload_retry", {"attempt": 1, "reason": "non-ASCII response"}),
+        ("payload_requested", {"attempt": 2}),
+    ]
+
+    with pytest.raises(RuntimeError):
+        _request_payload(ScriptedClient([payloads[0]] * 3), "system", "user")
+
+
+def test_async_translation_is_bounded_and_matches_sync_scope(monkeypatch) -> None:
+    monkeypatch.setattr(generator, "TRANSLATION_CONCURRENCY", 2)
+    payload = _normalize_payload(
+        {
+            "atmosphere": "Névoa",
+            "intent": "Intenção",
+            "image_content": {"subject": "Mergulhador", "environment": "Catedral alagada"},
+            "checklist_questions": ["Luz âmbar?", "ok"],
+            "notes": ["Não usar flash"],
+        }
+    )
+    theme = {"defaults": {"dp_aliases": ["Deakins"]}}
+    sync_payload = copy.deepcopy(payload)
+    _enforce_defaults(sync_payload, theme, ScriptedClient())
+    client = ScriptedClient()
+
+    generator._apply_theme_defaults(payload, theme)
+    asyncio.run(generator._ensure_ascii_async(payload, client, generator._no_progress))
+
+    assert client.peak == 2
+    # Itens de listas (checklist e notas) são traduzidos, como no fluxo síncrono.
+    assert payload == sync_payload
+    assert payload["checklist_questions"] == ["EN:Luz âmbar?", "ok"]
+    assert payload["notes"] == ["EN:Não usar flash"]
+
+
+def _write_playbook(path, themes: Dict[str, Any]) -> None:
+    path.write_text(
+        json.dumps(
+            {
+                "KB_ID": "PLAYBOOK",
+                interactive_assistant.SEA_PLAYBOOK_KEY: {
+                    interactive_assistant.SEA_PLAYBOOK_ENTRY: {"themes": themes}
+                },
+            }
+        ),
+        encoding="utf-8",
+    )
+
+
+@pytest.fixture()
+def playbook_file(tmp_path, monkeypatch):
+    path = tmp_path / "kb.json"
+    _write_playbook(path, {"noir": {"defaults": {}}})
+    monkeypatch.setattr(interactive_assistant, "SEA_PLAYBOOK_PATH", path)
+    monkeypatch.setattr(generator, "_playbook", (None, {}, ""))
+    return path
+
+
+def test_playbook_follows_the_registry_reload(playbook_file) -> None:
+    first = generator._get_playbook()
+    assert list(first["themes"]) == ["noir"]
+    assert generator._get_playbook() is first
+
+    # Editar o arquivo troca o broker no registro; o playbook e relido sem reiniciar.
+    _write_playbook(playbook_file, {"noir": {"defaults": {}}, "solar": {"defaults": {}}})
+    assert list(generator._get_playbook()["themes"]) == ["noir", "solar"]
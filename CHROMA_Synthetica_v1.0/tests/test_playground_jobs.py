@@ -0,0 +1,237 @@
+"""Testes para a fila de jobs em segundo plano do playground."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+
+from fastapi import HTTPException
+
+from playground_backend import jobs
+from playground_backend import main as backend
+from playground_backend.jobs import FAILED, QUEUED, RUNNING, SUCCEEDED, JobQueue, JobWorkers
+from playground_backend.storage import SessionStore
+
+REQUEST = {
+    "brief": "Diver in a flooded cathedral",
+    "model": "stub",
+    "theme": "cinematografico",
+    "tags": [],
+    "case_id": None,
+}
+
+
+def _queue(tmp_path) -> JobQueue:
+    return JobQueue(SessionStore(tmp_path / "history.sqlite3", legacy_path=None))
+
+
+def _stages(queue: JobQueue, job_id: str) -> list:
+    return [event["stage"] for event in queue.events(job_id)]
+
+
+def _age_heartbeat(queue: JobQueue, job_id: str) -> None:
+    with queue.store.transaction() as connection:
+        connection.execute(
+            "UPDATE jobs SET heartbeat = ? WHERE id = ?",
+            (time.time() - jobs.STALE_AFTER_SECONDS - 1, job_id),
+        )
+
+
+def test_claim_complete_fail_and_release(tmp_path) -> None:
+    queue = _queue(tmp_path)
+    first = queue.enqueue(REQUEST)
+    second = queue.enqueue(REQUEST)
+
+    claimed = queue.claim()
+    assert claimed["id"] == first["id"] and claimed["status"] == RUNNING
+    assert claimed["attempts"] == 1 and claimed["request"] == REQUEST
+
+    entry = queue.complete(first["id"], 1, {"brief": REQUEST["brief"], "tags": ["a"]})
+    done = queue.get(first["id"])
+    assert done["status"] == SUCCEEDED and done["session_id"] == entry["id"]
+    assert queue.store.get(entry["id"])["tags"] == ["a"]
+
+    # Release devolve o job à fila; o próximo claim o pega de novo.
+    assert queue.claim()["id"] == second["id"]
+    queue.release(second["id"], 1)
+    assert queue.get(second["id"])["status"] == QUEUED
+    again = queue.claim()
+    assert again["id"] == second["id"] and again["attempts"] == 2
+
+    assert queue.fail(second["id"], 2, {"message": "boom"})
+    failed = queue.get(second["id"])
+    assert failed["status"] == FAILED and failed["error"] == {"message": "boom"}
+    assert queue.claim() is None
+    assert _stages(queue, second["id"]) == [QUEUED, "started", QUEUED, "started", FAILED]
+
+
+def test_stale_jobs_are_requeued_until_max_attempts(tmp_path) -> None:
+    queue = _queue(tmp_path)
+    job_id = queue.enqueue(REQUEST)["id"]
+
+    for attempt in range(1, jobs.MAX_ATTEMPTS + 1):
+        claimed = queue.claim()
+        assert claimed["id"] == job_id and claimed["attempts"] == attempt
+        # Um heartbeat recente mantém o job com o worker atual.
+        queue.heartbeat(job_id)
+        assert queue.claim() is None
+        _age_heartbeat(queue, job_id)
+
+    # O worker "morreu" MAX_ATTEMPTS vezes: o próximo claim desiste do job.
+    assert queue.claim() is None
+    job = queue.get(job_id)
+    assert job["status"] == FAILED and "giving up" in job["error"]
+
+
+def test_worker_that_lost_its_claim_cannot_finish_the_job(tmp_path) -> None:
+    queue = _queue(tmp_path)
+    job_id = queue.enqueue(REQUEST)["id"]
+    assert queue.claim()["attempts"] == 1
+    # O primeiro worker travou: o job volta para a fila e outro worker o pega.
+    _age_heartbeat(queue, job_id)
+    assert queue.claim()["attempts"] == 2
+
+    # O worker antigo acorda: nada do que ele fizer vale mais.
+    assert queue.complete(job_id, 1, {"brief": "stale"}) is None
+    assert not queue.fail(job_id, 1, "stale")
+    queue.release(job_id, 1)
+    assert queue.get(job_id)["status"] == RUNNING
+    assert queue.store.list_history() == []
+
+    entry = queue.complete(job_id, 2, {"brief": REQUEST["brief"]})
+    done = queue.get(job_id)
+    assert done["status"] == SUCCEEDED and done["session_id"] == entry["id"]
+    assert _stages(queue, job_id) == [QUEUED, "started", QUEUED, "started", SUCCEEDED]
+
+
+def _run_workers(queue: JobQueue, generate, job_ids) -> None:
+    async def scenario() -> None:
+        workers = JobWorkers(
+            queue,
+            generate,
+            lambda request, generated: {"brief": request["brief"], **generated},
+            count=2,
+        )
+        workers.start()
+        try:
+            while any(queue.get(job)["status"] not in jobs.TERMINAL_STATUSES for job in job_ids):
+                await asyncio.sleep(0.01)
+        finally:
+            await workers.stop()
+
+    asyncio.run(asyncio.wait_for(scenario(), 5))
+
+
+def test_workers_run_jobs_and_record_progress(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(jobs, "POLL_SECONDS", 0.01)
+    queue = _queue(tmp_path)
+    good = queue.enqueue(REQUEST)["id"]
+    bad = queue.enqueue({**REQUEST, "brief": "bad"})["id"]
+
+    async def generate(request, progress):
+        if request["brief"] == "bad":
+            raise HTTPException(status_code=422, detail={"message": "missing fields"})
+        for step in range(3):
+            progress("step", {"n": step})
+            await asyncio.sleep(0)
+        return {"theme": "noir"}
+
+    _run_workers(queue, generate, [good, bad])
+
+    done = queue.get(good)
+    assert done["status"] == SUCCEEDED
+    assert queue.store.get(done["session_id"])["theme"] == "noir"
+    events = queue.events(good)
+    assert [event["stage"] for event in events] == [QUEUED, "started"] + ["step"] * 3 + [SUCCEEDED]
+    assert [event["detail"]["n"] for event in events[2:5]] == [0, 1, 2]
+    failed = queue.get(bad)
+    assert failed["status"] == FAILED and failed["error"] == {"message": "missing fields"}
+
+
+def test_workers_survive_claim_errors_and_heartbeat_while_idle(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr(jobs, "POLL_SECONDS", 0.01)
+    monkeypatch.setattr(jobs, "HEARTBEAT_SECONDS", 0.01)
+    queue = _queue(tmp_path)
+    job_id = queue.enqueue(REQUEST)["id"]
+    claim, heartbeat = queue.claim, queue.heartbeat
+    calls = {"claim": 0, "heartbeat": 0}
+
+    def flaky_claim():
+        calls["claim"] += 1
+        if calls["claim"] == 1:
+            raise OSError("database is locked")
+        return claim()
+
+    def counted_heartbeat(job):
+        calls["heartbeat"] += 1
+        heartbeat(job)
+
+    monkeypatch.setattr(queue, "claim", flaky_claim)
+    monkeypatch.setattr(queue, "heartbeat", counted_heartbeat)
+
+    async def generate(request, progress):
+        for step in range(5):
+            progress("step", {"n": step})
+            await asyncio.sleep(0)
+        # Sem eventos de progresso, o heartbeat segue pelo timer.
+        await asyncio.sleep(0.1)
+        return {"theme": "noir"}
+
+    async def scenario() -> None:
+        workers = JobWorkers(
+            queue,
+            generate,
+            lambda request, generated: {"brief": request["brief"], **generated},
+            count=1,
+        )
+        workers.start()
+        try:
+            while queue.get(job_id)["status"] != SUCCEEDED:
+                await asyncio.sleep(0.01)
+        finally:
+            await workers.stop()
+
+    asyncio.run(asyncio.wait_for(scenario(), 5))
+
+    assert calls["claim"] >= 2 and calls["heartbeat"] >= 2
+    events = queue.events(job_id)
+    assert [event["stage"] for event in events] == [QUEUED, "started"] + ["step"] * 5 + [SUCCEEDED]
+    assert [event["detail"]["n"] for event in events[2:7]] == list(range(5))
+
+
+class _Client:
+    async def is_disconnected(self) -> bool:
+        return False
+
+
+def _sse(job_id: str, last_event_id=None) -> list:
+    async def collect() -> list:
+        response = await backend.stream_job_events(job_id, _Client(), last_event_id)
+        return [chunk async for chunk in response.body_iterator]
+
+    return asyncio.run(asyncio.wait_for(collect(), 5))
+
+
+def test_events_stream_resumes_and_ends_with_the_job(tmp_path, monkeypatch) -> None:
+    queue = _queue(tmp_path)
+    monkeypatch.setattr(backend, "job_queue", queue)
+    monkeypatch.setattr(backend, "SSE_POLL_SECONDS", 0.01)
+    job_id = queue.enqueue(REQUEST)["id"]
+    queue.claim()
+    queue.record(job_id, "payload_requested", {"attempt": 1})
+    queue.complete(job_id, 1, {"brief": REQUEST["brief"]})
+
+    chunks = _sse(job_id)
+    assert [chunk.split("\n")[1] for chunk in chunks] == [
+        "event: queued",
+        "event: started",
+        "event: payload_requested",
+        "event: succeeded",
+    ]
+    first = json.loads(chunks[2].split("data: ", 1)[1])
+    assert first["detail"] == {"attempt": 1}
+
+    # Last-Event-ID retoma depois do último evento recebido.
+    resumed = _sse(job_id, chunks[1].split("\n")[0][len("id: "):])
+    assert resumed == chunks[2:]
@@ -0,0 +1,81 @@
+"""Testes para o pool de gerações do playground."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from playground_backend import pool
+from playground_backend.generator import generate_prompt_session, generate_prompt_session_async
+from playground_backend.pool import GenerationPool, run_until_disconnected
+
+
+async def _sleep(seconds: float, value: str = "done") -> str:
+    await asyncio.sleep(seconds)
+    return value
+
+
+def test_full_queue_is_rejected_with_retry_after() -> None:
+    async def scenario() -> None:
+        generation_pool = GenerationPool(max_concurrency=1, max_queue=1, timeout=None)
+        running = asyncio.ensure_future(generation_pool.run(lambda: _sleep(0.05)))
+        queued = asyncio.ensure_future(generation_pool.run(lambda: _sleep(0.05)))
+        await asyncio.sleep(0)
+        assert generation_pool.pending == 2
+
+        with pytest.raises(HTTPException) as excinfo:
+            await generation_pool.run(lambda: _sleep(0))
+        assert excinfo.value.status_code == 429
+        assert int(excinfo.value.headers["Retry-After"]) >= 1
+
+        assert await asyncio.gather(running, queued) == ["done", "done"]
+        assert generation_pool.pending == 0
+        # Com a fila livre, novas gerações voltam a ser aceitas.
+        assert await generation_pool.run(lambda: _sleep(0, "again")) == "again"
+
+    asyncio.run(scenario())
+
+
+def test_slow_generation_times_out_with_504() -> None:
+    generation_pool = GenerationPool(max_concurrency=1, max_queue=0, timeout=0.01)
+
+    with pytest.raises(HTTPException) as excinfo:
+        asyncio.run(generation_pool.run(lambda: _sleep(1)))
+
+    assert excinfo.value.status_code == 504
+    assert generation_pool.pending == 0
+
+
+class _Client:
+    def __init__(self, disconnected: bool) -> None:
+        self.disconnected = disconnected
+
+    async def is_disconnected(self) -> bool:
+        return self.disconnected
+
+
+def test_disconnected_client_cancels_the_generation(monkeypatch) -> None:
+    monkeypatch.setattr(pool, "DISCONNECT_POLL_SECONDS", 0.01)
+
+    async def scenario() -> None:
+        work = asyncio.ensure_future(_sleep(1))
+        with pytest.raises(HTTPException) as excinfo:
+            await run_until_disconnected(_Client(True), work)
+        assert excinfo.value.status_code == 499
+        await asyncio.sleep(0)
+        assert work.cancelled()
+
+        assert await run_until_disconnected(_Client(False), _sleep(0.02)) == "done"
+
+    asyncio.run(scenario())
+
+
+def test_async_generation_matches_the_sync_path(monkeypatch) -> None:
+    monkeypatch.setenv("SYNTHETICA_LLM_PROVIDER", "stub")
+    brief = "Diver in a flooded cathedral"
+
+    expected = generate_prompt_session(brief, "stub", "cinematografico")
+
+    assert asyncio.run(generate_prompt_session_async(brief, "stub", "cinematografico")) == expected
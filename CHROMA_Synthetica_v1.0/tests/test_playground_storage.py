@@ -0,0 +1,136 @@
+"""Testes para o armazenamento SQLite do playground."""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+
+import pytest
+from fastapi import HTTPException
+
+from playground_backend.storage import _MIGRATIONS, SCHEMA_VERSION, SessionStore
+
+
+def _store(tmp_path, legacy=None) -> SessionStore:
+    return SessionStore(tmp_path / "history.sqlite3", legacy_path=legacy)
+
+
+def _session(index: int, **extra) -> dict:
+    return {
+        "created_at": f"2026-01-01T00:00:{index:02d}",
+        "brief": f"Brief {index}",
+        "theme": "noir" if index % 2 else "solar",
+        "model_name": "seadream",
+        "tags": [],
+        "prompts": {"main": f"prompt {index}"},
+        **extra,
+    }
+
+
+def test_sessions_round_trip_newest_first(tmp_path) -> None:
+    store = _store(tmp_path)
+    first = store.add_session(_session(1))
+    # Mesmo created_at: a ordem de inserção desempata.
+    second = store.add_session(_session(1, brief="Tie"))
+    store.add_session(_session(0))
+
+    assert [entry["brief"] for entry in store.list_history()] == ["Tie", "Brief 1", "Brief 0"]
+    assert store.get(first["id"])["prompts"] == {"main": "prompt 1"}
+
+    store.set_like(second["id"], True)
+    assert [entry["id"] for entry in store.list_history(liked_only=True)] == [second["id"]]
+
+    connection = sqlite3.connect(tmp_path / "history.sqlite3")
+    assert connection.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_legacy_import_runs_once_and_is_idempotent(tmp_path) -> None:
+    legacy = tmp_path / "prompt_history.json"
+    entries = [_session(1, id="kept", liked=True), _session(2), _session(3)]
+    legacy.write_text(json.dumps(entries), encoding="utf-8")
+
+    store = _store(tmp_path, legacy)
+    assert len(store.list_history()) == 3
+    assert store.get("kept")["liked"] is True
+    assert not legacy.exists() and legacy.with_name(legacy.name + ".imported").exists()
+
+    # Ids já gravados são ignorados, inclusive por outra instância do store.
+    assert store.import_entries([entries[0]]) == 0
+    assert _store(tmp_path, legacy).import_entries([entries[0]]) == 0
+    assert len(store.list_history()) == 3
+
+
+def test_entries_without_id_are_imported_once(tmp_path) -> None:
+    store = _store(tmp_path)
+    entries = [_session(1), _session(2)]
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(store.import_entries(entries)))
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Sem id, a entrada recebe um id derivado do conteúdo: reimportar não duplica.
+    assert sorted(results) == [0, 0, 0, 2]
+    assert len(store.list_history()) == 2
+
+
+def test_v1_database_is_migrated_to_summary_columns(tmp_path) -> None:
+    path = tmp_path / "history.sqlite3"
+    connection = sqlite3.connect(path)
+    for statement in _MIGRATIONS[1]:
+        connection.execute(statement)
+    body = {"brief": "Old brief", "theme": "noir", "tags": ["a", "b"], "prompts": {"main": "x"}}
+    connection.execute(
+        "INSERT INTO sessions (id, created_at, liked, body) VALUES (?, ?, ?, ?)",
+        ("old", "2025-01-01T00:00:00", 1, json.dumps(body)),
+    )
+    connection.execute("PRAGMA user_version = 1")
+    connection.commit()
+    connection.close()
+
+    store = SessionStore(path, legacy_path=None)
+
+    summary = store.query(tags=["a"]).items
+    assert [entry["id"] for entry in summary] == ["old"]
+    assert summary[0]["brief"] == "Old brief" and summary[0]["liked"] is True
+    assert "prompts" not in summary[0]
+    assert store.get("old")["prompts"] == {"main": "x"}
+
+
+def test_keyset_pagination_and_filters(tmp_path) -> None:
+    store = _store(tmp_path)
+    for index in range(7):
+        tags = ["gold"] + (["night"] if index % 3 == 0 else [])
+        store.add_session(_session(index, tags=tags, case_id="c1" if index < 2 else None))
+    # Mesmo created_at que a sessão 6: a ordem de inserção desempata.
+    store.add_session(_session(6, brief="Tie"))
+
+    seen, cursor = [], None
+    while True:
+        page = store.query(limit=3, before=cursor)
+        seen.extend(entry["brief"] for entry in page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert seen == ["Tie"] + [f"Brief {index}" for index in range(6, -1, -1)]
+
+    assert [e["brief"] for e in store.query(tags=["gold", "night"]).items] == [
+        "Brief 6",
+        "Brief 3",
+        "Brief 0",
+    ]
+    assert [e["brief"] for e in store.query(theme="noir", tags=["night"]).items] == ["Brief 3"]
+    assert [e["brief"] for e in store.query(case_id="c1").items] == ["Brief 1", "Brief 0"]
+
+    store.set_like(store.query(limit=1).items[0]["id"], True)
+    assert [e["brief"] for e in store.query(liked=True).items] == ["Tie"]
+
+    with pytest.raises(HTTPException) as excinfo:
+        store.query(before="not-a-cursor")
+    assert excinfo.value.status_code == 400
@@ -0,0 +1,96 @@
+"""Testes para o registro compartilhado de KBs."""
+
+from __future__ import annotations
+
+import gc
+import json
+import os
+
+import pytest
+
+from synthetica.core.registry import KBRegistry
+from synthetica.orchestrator import ChromaSyntheticaOrchestrator
+
+
+def _write_kb(path, version: str) -> None:
+    path.write_text(
+        json.dumps({"KB_ID": "REGISTRY", "KB_Version": version, "Lexicon": {"Moods": ["Serene"]}}),
+        encoding="utf-8",
+    )
+
+
+def test_registry_shares_read_only_broker_and_reloads_changes(tmp_path) -> None:
+    kb_file = tmp_path / "kb.json"
+    _write_kb(kb_file, "1.0")
+    registry = KBRegistry()
+
+    broker = registry.broker_for(kb_file)
+    assert registry.broker_for(tmp_path / "." / "kb.json") is broker
+    with pytest.raises(PermissionError):
+        broker.inject_entry("Lexicon.Moods", ["Tense"])
+
+    fork = broker.fork()
+    fork.inject_entry("Lexicon.Moods", ["Tense"])
+    assert fork.get_entry("Lexicon.Moods") == ["Tense"]
+    assert broker.get_entry("Lexicon.Moods") == ["Serene"]
+
+    # Same content with a new mtime keeps the broker.
+    stat = kb_file.stat()
+    os.utime(kb_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert registry.broker_for(kb_file) is broker
+
+    _write_kb(kb_file, "2.0")
+    reloaded = registry.broker_for(kb_file)
+    assert reloaded is not broker
+    assert reloaded.get_entry("KB_Version") == "2.0"
+    assert registry.loads == 2
+
+
+def test_registry_closes_the_replaced_artifact_once_released(tmp_path) -> None:
+    kb_file = tmp_path / "kb.json"
+    _write_kb(kb_file, "1.0")
+    registry = KBRegistry()
+    broker = registry.broker_for(kb_file)
+    old = registry._entries[str(kb_file.resolve())].artifact
+
+    _write_kb(kb_file, "2.0")
+    registry.broker_for(kb_file)
+    # Quem ainda segura o broker antigo continua lendo do mapa antigo.
+    assert not old.closed and broker.get_entry("Lexicon.Moods") == ["Serene"]
+
+    del broker
+    gc.collect()
+    assert old.closed
+    assert not registry._entries[str(kb_file.resolve())].artifact.closed
+
+
+def test_orchestrators_reuse_registry_broker(tmp_path) -> None:
+    kb_file = tmp_path / "kb.json"
+    _write_kb(kb_file, "1.0")
+    registry = KBRegistry()
+
+    first = ChromaSyntheticaOrchestrator(kb_path=str(kb_file), registry=registry)
+    second = ChromaSyntheticaOrchestrator(kb_path=str(kb_file), registry=registry)
+
+    assert first.broker is second.broker
+    assert registry.loads == 1
+
+
+def test_gap_resolver_reports_read_only_broker(tmp_path, monkeypatch) -> None:
+    from synthetica.services.knowledge_gap import GapSuggestion, KnowledgeGapResolver
+
+    kb_file = tmp_path / "kb.json"
+    _write_kb(kb_file, "1.0")
+    resolver = KnowledgeGapResolver(KBRegistry().broker_for(kb_file))
+    monkeypatch.setattr(
+        resolver,
+        "_create_suggestion",
+        lambda path, topic: GapSuggestion(path=path, topic=topic, sources={}),
+    )
+    chain = []
+
+    resolver.ensure_paths([{"path": "Lexicon.Colors"}], reasoning_chain=chain)
+
+    # Broker compartilhado é somente leitura: nada é injetado, mas o motivo fica no chain.
+    assert resolver.generated_entries == []
+    assert len(chain) == 1 and "Lexicon.Colors" in chain[0] and "read-only" in chain[0]
@@ -0,0 +1,16 @@
+"""Testes para o perfil de startup e os imports adiados das CLIs."""
+
+from __future__ import annotations
+
+from synthetica.startup_profile import format_profile, import_profile
+
+
+def test_interactive_chat_defers_llm_and_kb_imports() -> None:
+    timings = import_profile("interactive_chat")
+    modules = {timing.module for timing in timings}
+
+    assert "interactive_chat" in modules
+    assert "synthetica.services.llm_client" not in modules
+    assert "synthetica.core.registry" not in modules
+    assert all(timing.cumulative_us >= timing.self_us for timing in timings)
+    assert format_profile("interactive_chat", timings, top=3).count("\n") == 4